@@ -7,7 +7,11 @@ Provides endpoints for querying frequency signatures, stellar anchors, and
 harmonic relationships.
 
 Usage:
-    python3 frequency_api.py [--port 8080] [--host localhost]
+    python3 frequency_api.py [--port 8080] [--host localhost] [--dataset FILE]
+
+Multi-worker deployments can build a memory-mapped dataset once with
+mmap_dataset.py and point every worker at it (--dataset or GNOSISLOOM_DATASET),
+so workers share the data pages instead of each parsing the JSON.
 
 API Endpoints:
     GET /frequencies - List all biological frequencies
@@ -18,31 +22,107 @@ API Endpoints:
     GET /search?q={query} - Search frequencies by keyword
     GET /golden-ratio - Find golden ratio relationships
     GET /health - API health check
+    GET /metrics - Prometheus metrics (request counts, latency/size histograms, cache ratios)
+
+Data endpoints send ETag/Last-Modified validators derived from the data
+generation, answer conditional requests with 304, serve pre-serialized bodies
+for the static endpoints, and compress responses with gzip or deflate when the
+client accepts it.
+
+/harmonics, /search and /golden-ratio can stream their results as NDJSON
+(Accept: application/x-ndjson or ?stream=1), one record per line in discovery
+order, so large result sets never have to fit in memory.
+
+Expensive queries are bounded: tolerance is capped, the estimated work of a
+query is checked before it runs, results are capped (keeping the closest
+matches), and long scans stop at a cooperative deadline with a 503, or with
+partial results when the client passes partial=1. Limits are configured through
+GNOSISLOOM_MAX_TOLERANCE, GNOSISLOOM_MAX_RESULTS, GNOSISLOOM_MAX_QUERY_COST and
+GNOSISLOOM_QUERY_DEADLINE.
+
+List endpoints accept ?fields= to build only the named record fields, and
+?format=compact to encode lists as {"columns": [...], "rows": [[...], ...]}.
 """
 
-from flask import Flask, jsonify, request, abort
+from flask import Flask, Response, jsonify, request, abort, g, stream_with_context
 from flask_cors import CORS
 import json
 import math
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+from bisect import bisect_left, bisect_right
 import argparse
 import logging
+import os
+
+import gzip
+import hashlib
+import heapq
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+import numpy as np
+
+from mmap_dataset import MappedDataset, SUMMARY_FIELDS, record_frequency, source_generation, source_mtime
+from request_metrics import RequestMetrics
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+GOLDEN_PHI = 1.618033988749
+GOLDEN_RATIO_TARGETS = {GOLDEN_PHI: 'golden_ratio', 1 / GOLDEN_PHI: 'inverse_golden_ratio'}
+HARMONIC_RATIOS = [0.5, 2.0, 3.0, 4.0, 1.5, 2.5, 1.618, 0.618]  # Include golden ratio
+
+# Record fields each list endpoint can project with ?fields=
+HARMONIC_FIELDS = ('frequency_name', 'frequency', 'ratio', 'expected', 'deviation', 'relationship_type')
+GOLDEN_RATIO_FIELDS = ('frequency1', 'frequency2', 'ratio', 'target_ratio', 'deviation', 'relationship_type')
+SEARCH_FIELDS = ('name', 'match_type', 'frequency', 'stellar_anchor', 'data')
+DEFAULT_SEARCH_FIELDS = ('name', 'data', 'match_type')
+
+
+class QueryDeadlineExceeded(Exception):
+    """Raised by a cooperative deadline check inside a long-running scan"""
+
+
+class Deadline:
+    """Cooperative per-request deadline, checked periodically by long scans"""
+    
+    def __init__(self, seconds: Optional[float]):
+        self.expires_at = time.monotonic() + seconds if seconds else None
+        
+    def check(self):
+        if self.expires_at is not None and time.monotonic() > self.expires_at:
+            raise QueryDeadlineExceeded()
+
+
 class GnosisLoomAPI:
-    def __init__(self, data_path: str = "../data"):
+    def __init__(self, data_path: str = "../data", dataset_path: Optional[str] = None):
         self.data_path = Path(data_path)
+        self.dataset_path = dataset_path
+        self.dataset = None
+        self.generation = None
+        self.last_modified = None
+        self.load_duration = 0.0
         self.frequencies = {}
         self.stellar_anchors = {}
         self.feedback_loops = {}
         self.load_data()
         
     def load_data(self):
-        """Load all data files into memory"""
+        """Load all data files into memory, or map a prebuilt dataset if configured"""
+        started = time.perf_counter()
+        if self.dataset_path:
+            self._load_mapped_dataset()
+        else:
+            self._load_json_files()
+        self.load_duration = time.perf_counter() - started
+        
+    def _load_json_files(self):
+        """Parse the JSON data files"""
         try:
             # Load biological frequencies
             freq_file = self.data_path / "comprehensive_frequencies.json"
@@ -68,36 +148,141 @@ class GnosisLoomAPI:
         except Exception as e:
             logger.error(f"Error loading data: {e}")
             raise
+        
+        self._build_frequency_index()
+        self._set_generation(source_generation(self.data_path), source_mtime(self.data_path))
+    
+    def _set_generation(self, generation: str, mtime: float):
+        """Record the data generation used for HTTP validators and response caching"""
+        self.generation = generation
+        self.last_modified = datetime.fromtimestamp(int(mtime or time.time()), tz=timezone.utc)
+    
+    def _load_mapped_dataset(self):
+        """Map a prebuilt read-only dataset shared by all worker processes"""
+        self.dataset = MappedDataset(self.dataset_path)
+        if self.dataset.is_stale(self.data_path):
+            logger.warning(f"Dataset {self.dataset_path} is older than the JSON files in {self.data_path}; "
+                           f"rebuild it with mmap_dataset.py")
+        
+        self.frequencies = self.dataset.frequencies
+        self.stellar_anchors = self.dataset.stellar_anchors
+        self.feedback_loops = self.dataset.feedback_loops
+        
+        # Precomputed columns live in the mapping; nothing is copied per worker
+        self._sorted_freqs = self.dataset.sorted_values
+        self._sorted_names = self.dataset.sorted_names
+        self._sorted_array = np.frombuffer(self._sorted_freqs, dtype=np.float64)
+        header = self.dataset.header
+        self._set_generation(header['source_generation'], header.get('source_mtime') or header['built_at'])
+        logger.info(f"Mapped dataset {self.dataset_path}: {self.dataset.header['counts']}")
+    
+    def _build_frequency_index(self):
+        """Precompute the numeric frequency column and a frequency-sorted index"""
+        self._frequency_column = [
+            (name, freq) for name, freq in
+            ((name, record_frequency(data)) for name, data in self.frequencies.items())
+            if freq is not None
+        ]
+        by_frequency = sorted(self._frequency_column, key=lambda pair: pair[1])
+        self._sorted_freqs = [freq for _, freq in by_frequency]
+        self._sorted_names = [name for name, _ in by_frequency]
+        # Same values as an array for vectorized cost estimates
+        self._sorted_array = np.array(self._sorted_freqs, dtype=np.float64)
+    
+    def iter_frequency_column(self) -> Iterator[Tuple[str, float]]:
+        """Yield (name, frequency) for every record with a usable frequency, in source order"""
+        if self.dataset is None:
+            yield from self._frequency_column
+            return
+        for i in range(len(self.frequencies)):
+            freq = self.dataset.frequency(i)
+            if freq is not None:
+                yield self.frequencies.name(i), freq
+    
+    def frequency_summaries(self, start: int, end: int,
+                            fields: Optional[List[str]] = None) -> Tuple[List[Dict], int]:
+        """Return listing summaries for records[start:end] and the total record count"""
+        if self.dataset is not None:
+            ids = self.dataset.listed_ids
+            return [self.dataset.frequency_summary(i, fields) for i in ids[start:end]], len(ids)
+        
+        listed = [(name, data) for name, data in self.frequencies.items() if isinstance(data, dict)]
+        freq_list = []
+        for name, data in listed[start:end]:
+            summary = {}
+            for field in fields or SUMMARY_FIELDS:
+                if field == 'name':
+                    summary[field] = name
+                elif field == 'frequency':
+                    summary[field] = data.get('normal_freq') or data.get('frequency')
+                elif field == 'stellar_anchor':
+                    summary[field] = data.get('stellar_anchor')
+                elif field == 'category':
+                    summary[field] = data.get('category', 'biological_system')
+            freq_list.append(summary)
+        return freq_list, len(listed)
     
     def find_harmonic_relationships(self, target_freq: float, tolerance: float = 0.1) -> List[Dict]:
         """Find harmonic relationships for a target frequency"""
-        relationships = []
+        relationships = self.iter_harmonic_relationships(target_freq, tolerance)
         
-        for name, data in self.frequencies.items():
-            if not isinstance(data, dict):
-                continue
-                
-            freq = data.get('normal_freq') or data.get('frequency')
-            if not freq or not isinstance(freq, (int, float)):
+        # Sort by deviation (closest matches first)
+        return sorted(relationships, key=lambda x: x['deviation'])
+    
+    def _harmonic_window(self, expected: float, tolerance: float) -> Tuple[int, int]:
+        """Index range of the sorted frequencies that can lie within tolerance of expected"""
+        # Slightly widened window; callers apply the exact deviation test
+        margin = expected * tolerance * (1 + 1e-9)
+        return (bisect_left(self._sorted_freqs, expected - margin),
+                bisect_right(self._sorted_freqs, expected + margin))
+    
+    def estimate_harmonic_cost(self, target_freq: float, tolerance: float) -> Dict[str, int]:
+        """Candidate comparisons for a harmonics query (an upper bound on its result count)"""
+        comparisons = 0
+        for ratio in HARMONIC_RATIOS:
+            expected = target_freq * ratio
+            if expected > 0:
+                lo, hi = self._harmonic_window(expected, tolerance)
+                comparisons += hi - lo
+        return {'comparisons': comparisons, 'estimated_results': comparisons}
+    
+    def iter_harmonic_relationships(self, target_freq: float, tolerance: float = 0.1,
+                                    deadline: Optional[Deadline] = None,
+                                    fields: Optional[List[str]] = None) -> Iterator[Dict]:
+        """
+        Yield harmonic relationships for a target frequency as they are found (unsorted).
+        
+        With fields, only those keys are built for each record.
+        """
+        # Check harmonic ratios against the frequency-sorted index
+        for ratio in HARMONIC_RATIOS:
+            expected = target_freq * ratio
+            if expected <= 0:
                 continue
             
-            # Check harmonic ratios
-            for ratio in [0.5, 2.0, 3.0, 4.0, 1.5, 2.5, 1.618, 0.618]:  # Include golden ratio
-                expected = target_freq * ratio
+            lo, hi = self._harmonic_window(expected, tolerance)
+            for k in range(lo, hi):
+                if deadline and k % 1024 == 0:
+                    deadline.check()
+                freq = self._sorted_freqs[k]
                 deviation = abs(freq - expected) / expected
                 
                 if deviation <= tolerance:
-                    relationships.append({
-                        'frequency_name': name,
-                        'frequency': freq,
-                        'ratio': ratio,
-                        'expected': expected,
-                        'deviation': deviation,
-                        'relationship_type': self._classify_relationship(ratio)
-                    })
-        
-        # Sort by deviation (closest matches first)
-        return sorted(relationships, key=lambda x: x['deviation'])
+                    record = {}
+                    for field in fields or HARMONIC_FIELDS:
+                        if field == 'frequency_name':
+                            record[field] = self._sorted_names[k]
+                        elif field == 'frequency':
+                            record[field] = freq
+                        elif field == 'ratio':
+                            record[field] = ratio
+                        elif field == 'expected':
+                            record[field] = expected
+                        elif field == 'deviation':
+                            record[field] = deviation
+                        elif field == 'relationship_type':
+                            record[field] = self._classify_relationship(ratio)
+                    yield record
     
     def _classify_relationship(self, ratio: float) -> str:
         """Classify the type of harmonic relationship"""
@@ -118,77 +303,493 @@ class GnosisLoomAPI:
     
     def find_golden_ratio_relationships(self, tolerance: float = 0.1) -> List[Dict]:
         """Find all golden ratio relationships in the database"""
-        golden_phi = 1.618033988749
-        relationships = []
+        relationships = self.iter_golden_ratio_relationships(tolerance)
+        return sorted(relationships, key=lambda x: x['deviation'])
+    
+    def _golden_window(self, numerator: float, target_ratio: float, tolerance: float) -> Tuple[int, int]:
+        """Index range of the sorted frequencies y that can give numerator / y within tolerance of target_ratio"""
+        if tolerance >= 1:
+            # Any positive denominator may qualify; callers apply the exact deviation test
+            return bisect_right(self._sorted_freqs, 0), len(self._sorted_freqs)
+        if numerator <= 0:
+            return 0, 0
+        # Slightly widened window, as in _harmonic_window
+        return (bisect_left(self._sorted_freqs, numerator / (target_ratio * (1 + tolerance)) * (1 - 1e-9)),
+                bisect_right(self._sorted_freqs, numerator / (target_ratio * (1 - tolerance)) * (1 + 1e-9)))
+    
+    def estimate_golden_ratio_cost(self, tolerance: float) -> Dict[str, int]:
+        """
+        Candidate comparisons for a golden ratio scan (an upper bound on its result count).
         
-        freq_list = []
-        for name, data in self.frequencies.items():
-            if isinstance(data, dict):
-                freq = data.get('normal_freq') or data.get('frequency')
-                if freq and isinstance(freq, (int, float)):
-                    freq_list.append({'name': name, 'frequency': freq})
+        Counts the same windows as _golden_window, with one vectorized searchsorted
+        per target ratio, so the estimate stays cheap before any deadline is running.
+        """
+        freqs = self._sorted_array
+        n = len(freqs)
+        if tolerance >= 1:
+            positive = n - int(np.searchsorted(freqs, 0, side='right'))
+            return {'comparisons': n * positive * len(GOLDEN_RATIO_TARGETS),
+                    'estimated_results': n * positive * len(GOLDEN_RATIO_TARGETS)}
         
-        # Compare all pairs
-        for i, freq1 in enumerate(freq_list):
-            for freq2 in freq_list[i+1:]:
-                if freq2['frequency'] > 0:
-                    ratio = freq1['frequency'] / freq2['frequency']
-                    
-                    # Check both directions for golden ratio
-                    for target_ratio, name in [(golden_phi, 'golden_ratio'), (1/golden_phi, 'inverse_golden_ratio')]:
-                        deviation = abs(ratio - target_ratio) / target_ratio
-                        if deviation <= tolerance:
-                            relationships.append({
-                                'frequency1': freq1,
-                                'frequency2': freq2,
-                                'ratio': ratio,
-                                'target_ratio': target_ratio,
-                                'deviation': deviation,
-                                'relationship_type': name
-                            })
+        numerators = freqs[freqs > 0]
+        comparisons = 0
+        for target_ratio in GOLDEN_RATIO_TARGETS:
+            lo = np.searchsorted(freqs, numerators / (target_ratio * (1 + tolerance)) * (1 - 1e-9), side='left')
+            hi = np.searchsorted(freqs, numerators / (target_ratio * (1 - tolerance)) * (1 + 1e-9), side='right')
+            comparisons += int((hi - lo).sum())
+        return {'comparisons': comparisons, 'estimated_results': comparisons}
+    
+    def iter_golden_ratio_relationships(self, tolerance: float = 0.1,
+                                        deadline: Optional[Deadline] = None,
+                                        fields: Optional[List[str]] = None) -> Iterator[Dict]:
+        """
+        Yield golden ratio relationships as the scan finds them (unsorted).
         
-        return sorted(relationships, key=lambda x: x['deviation'])
+        Each pair is checked once, as frequency1 / frequency2 with frequency1 earlier
+        in source order; only the frequency-sorted index window that can lie within
+        tolerance of phi or 1/phi is compared. With fields, only those keys are built
+        for each record.
+        """
+        earlier = set()
+        for i, (name1, freq1) in enumerate(self.iter_frequency_column()):
+            if deadline and i % 1024 == 0:
+                deadline.check()
+            earlier.add(name1)
+            
+            # Check both directions for golden ratio
+            for target_ratio, relationship in GOLDEN_RATIO_TARGETS.items():
+                lo, hi = self._golden_window(freq1, target_ratio, tolerance)
+                for k in range(lo, hi):
+                    name2 = self._sorted_names[k]
+                    if name2 in earlier:
+                        continue
+                    freq2 = self._sorted_freqs[k]
+                    ratio = freq1 / freq2
+                    deviation = abs(ratio - target_ratio) / target_ratio
+                    if deviation <= tolerance:
+                        values = {
+                            'frequency1': {'name': name1, 'frequency': freq1},
+                            'frequency2': {'name': name2, 'frequency': freq2},
+                            'ratio': ratio,
+                            'target_ratio': target_ratio,
+                            'deviation': deviation,
+                            'relationship_type': relationship
+                        }
+                        yield values if fields is None else {field: values[field] for field in fields}
     
     def search_frequencies(self, query: str) -> List[Dict]:
         """Search frequencies by keyword"""
+        return list(self.iter_search_results(query))
+    
+    def iter_search_results(self, query: str, deadline: Optional[Deadline] = None,
+                            fields: Optional[List[str]] = None) -> Iterator[Dict]:
+        """
+        Yield search matches in source order.
+        
+        With fields, only those keys are built; the nested 'data' record is embedded
+        only when requested.
+        """
+        fields = fields or DEFAULT_SEARCH_FIELDS
         query = query.lower()
-        results = []
         
-        for name, data in self.frequencies.items():
+        for position, (name, data) in enumerate(self.frequencies.items()):
+            if deadline and position % 256 == 0:
+                deadline.check()
             if isinstance(data, dict):
                 # Search in frequency name
                 if query in name.lower():
-                    result = {'name': name, 'data': data, 'match_type': 'name'}
-                    results.append(result)
+                    yield self._search_hit(name, data, 'name', fields)
                     continue
                 
                 # Search in stellar anchor
                 anchor = data.get('stellar_anchor', '')
                 if isinstance(anchor, str) and query in anchor.lower():
-                    result = {'name': name, 'data': data, 'match_type': 'stellar_anchor'}
-                    results.append(result)
+                    yield self._search_hit(name, data, 'stellar_anchor', fields)
                     continue
                 
                 # Search in tags or categories if they exist
                 for key, value in data.items():
                     if isinstance(value, str) and query in value.lower():
-                        result = {'name': name, 'data': data, 'match_type': key}
-                        results.append(result)
+                        yield self._search_hit(name, data, key, fields)
                         break
+    
+    def _search_hit(self, name: str, data: Dict, match_type: str, fields) -> Dict:
+        """Build a search result containing only the requested fields"""
+        hit = {}
+        for field in fields:
+            if field == 'name':
+                hit[field] = name
+            elif field == 'match_type':
+                hit[field] = match_type
+            elif field == 'frequency':
+                hit[field] = data.get('normal_freq') or data.get('frequency')
+            elif field == 'stellar_anchor':
+                hit[field] = data.get('stellar_anchor')
+            elif field == 'data':
+                hit[field] = data
+        return hit
+
+class CachedBody:
+    """A pre-serialized JSON body with lazily compressed variants"""
+    
+    def __init__(self, body: bytes, etag: str):
+        self.body = body
+        self.etag = etag
+        self._encoded = {'identity': body}
+        
+    def encoded(self, encoding: str) -> bytes:
+        if encoding not in self._encoded:
+            self._encoded[encoding] = compress_body(self.body, encoding)
+        return self._encoded[encoding]
+
+
+class ResponseCache:
+    """
+    Pre-serialized response bodies keyed by request path and query string.
+    
+    Entries are only valid for one data generation; the whole cache is dropped
+    when the generation changes. Least recently used entries are evicted beyond
+    max_entries.
+    """
+    
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self.generation = None
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        
+    def get(self, generation: str, key: str) -> Optional[CachedBody]:
+        with self._lock:
+            if generation != self.generation:
+                self._entries.clear()
+                self.generation = generation
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
         
-        return results
+    def put(self, generation: str, key: str, entry: CachedBody):
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Responses smaller than this are not worth compressing
+MIN_COMPRESS_SIZE = 1024
+
+
+def compress_body(body: bytes, encoding: str) -> bytes:
+    """Encode a response body for the given Content-Encoding"""
+    if encoding == 'gzip':
+        return gzip.compress(body, compresslevel=6, mtime=0)
+    if encoding == 'deflate':
+        return zlib.compress(body, 6)
+    return body
+
+
+def negotiate_encoding(size: int) -> str:
+    """Pick gzip/deflate from Accept-Encoding, or identity for small bodies"""
+    if size < MIN_COMPRESS_SIZE:
+        return 'identity'
+    return request.accept_encodings.best_match(['gzip', 'deflate'], default='identity') or 'identity'
+
+
+def request_etag(variant: str = 'json') -> str:
+    """ETag for the current URL and representation, derived from the data generation"""
+    digest = hashlib.sha1(f"{api.generation}:{variant}:{request.full_path}".encode()).hexdigest()[:20]
+    return f"{api.generation}-{digest}"
+
+
+def not_modified(etag: str) -> bool:
+    """Evaluate If-None-Match / If-Modified-Since against the current data generation"""
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since and api.last_modified:
+        return api.last_modified <= request.if_modified_since
+    return False
+
+
+def with_validators(response: Response, etag: str) -> Response:
+    # Weak: the gzip, deflate and identity encodings of a body share this tag
+    response.set_etag(etag, weak=True)
+    response.last_modified = api.last_modified
+    response.cache_control.public = True
+    response.cache_control.no_cache = True
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+def conditional_response(etag: str) -> Optional[Response]:
+    """Return a 304 response if the client's copy is still current"""
+    if not_modified(etag):
+        return with_validators(Response(status=304), etag)
+    return None
+
+
+def cached_json(builder) -> Response:
+    """
+    Serve a JSON body that only changes when the data files change.
+    
+    The body is serialized once per data generation and URL, and its gzip/deflate
+    variants are compressed once on first request.
+    """
+    etag = request_etag()
+    cached = conditional_response(etag)
+    if cached is not None:
+        return cached
+    
+    entry = response_cache.get(api.generation, request.full_path)
+    if entry is None:
+        entry = CachedBody(jsonify(builder()).get_data(), etag)
+        response_cache.put(api.generation, request.full_path, entry)
+    
+    encoding = negotiate_encoding(len(entry.body))
+    response = Response(entry.encoded(encoding), mimetype='application/json')
+    if encoding != 'identity':
+        response.content_encoding = encoding
+    return with_validators(response, etag)
+
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+
+def wants_ndjson() -> bool:
+    """True if the client asked for a streamed NDJSON response (Accept header or ?stream=1)"""
+    if request.args.get('stream', '').lower() in ('1', 'true', 'yes'):
+        return True
+    return request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+
+def ndjson_response(records: Iterator[Dict], columns: Optional[Tuple[str, ...]] = None) -> Response:
+    """
+    Stream records as newline-delimited JSON while the generator produces them.
+    
+    Records are emitted in discovery order rather than sorted, so the time to first
+    byte and the server's memory use do not depend on the size of the result.
+    If the result cap or the query deadline is hit, a final marker line
+    ({"truncated": true} or {"partial": true}) ends the stream. With format=compact
+    the first line is {"columns": [...]} and each record is a JSON array.
+    
+    Streams carry no validators: whether a stream ends complete or cut short by the
+    deadline is only known after the headers are sent, so it must not be revalidated.
+    """
+    compact = columns is not None and wants_compact()
+    max_results = app.config['MAX_RESULTS']
+    
+    def generate():
+        marker = None
+        try:
+            try:
+                if compact:
+                    yield (app.json.dumps({'columns': list(columns)}) + "\n").encode('utf-8')
+                for count, record in enumerate(records):
+                    if count >= max_results:
+                        marker = {'truncated': True, 'max_results': max_results}
+                        break
+                    if compact:
+                        record = [record.get(c) for c in columns]
+                    line = (app.json.dumps(record) + "\n").encode('utf-8')
+                    g.streamed_bytes = g.get('streamed_bytes', 0) + len(line)
+                    yield line
+            except QueryDeadlineExceeded:
+                marker = {'partial': True, 'reason': 'deadline_exceeded'}
+            if marker:
+                line = (app.json.dumps(marker) + "\n").encode('utf-8')
+                g.streamed_bytes = g.get('streamed_bytes', 0) + len(line)
+                yield line
+        except GeneratorExit:
+            # Client closed the connection mid-stream
+            g.response_status = 499
+            raise
+        except Exception:
+            g.response_status = 500
+            raise
+        finally:
+            g.stream_finished = True
+    
+    response = Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
+    response.vary.add('Accept')
+    # Metrics for this request are recorded once generate() has finished
+    g.ndjson_stream = True
+    return response
+
+
+def validated_json(builder) -> Response:
+    """Serve a per-query JSON body with validators; 304s skip the computation entirely"""
+    etag = request_etag()
+    cached = conditional_response(etag)
+    if cached is not None:
+        return cached
+    
+    payload = builder()
+    if payload.get('partial'):
+        # Deadline-dependent results must not be revalidated as if complete
+        return jsonify(payload)
+    return with_validators(jsonify(payload), etag)
+
+
+def requested_fields(allowed: Optional[Tuple[str, ...]] = None) -> Optional[List[str]]:
+    """Parse ?fields=a,b,c; unknown names are rejected when an allowed set is given"""
+    raw = request.args.get('fields', '')
+    fields = list(dict.fromkeys(f.strip() for f in raw.split(',') if f.strip()))
+    if not fields:
+        return None
+    if allowed is not None:
+        unknown = [f for f in fields if f not in allowed]
+        if unknown:
+            abort(400, description=f"Unknown fields {unknown}; available: {list(allowed)}")
+    return fields
+
+
+def wants_compact() -> bool:
+    return request.args.get('format', '').lower() == 'compact'
+
+
+def encode_records(records: List[Dict], columns: Tuple[str, ...]) -> Any:
+    """Return records as-is, or as {'columns': [...], 'rows': [[...], ...]} for format=compact"""
+    if not wants_compact():
+        return records
+    return {'columns': list(columns), 'rows': [[record.get(c) for c in columns] for record in records]}
+
+
+def request_deadline() -> Deadline:
+    return Deadline(app.config['QUERY_DEADLINE_SECONDS'])
+
+
+def check_tolerance(tolerance: float):
+    """Reject tolerances outside (0, MAX_TOLERANCE]"""
+    max_tolerance = app.config['MAX_TOLERANCE']
+    if not 0 < tolerance <= max_tolerance:
+        abort(400, description=f"tolerance must be in (0, {max_tolerance}]")
+
+
+def check_query_cost(cost: Dict[str, int]):
+    """Reject queries whose estimated work exceeds the configured budget before running them"""
+    if cost['comparisons'] > app.config['MAX_QUERY_COST']:
+        abort(400, description=(f"Query too expensive: {cost['comparisons']:,} comparisons "
+                                f"exceeds the limit of {app.config['MAX_QUERY_COST']:,}"))
+
+
+def collect_results(records: Iterator[Dict], deadline: Deadline, sort_key=None) -> Dict[str, Any]:
+    """
+    Gather at most MAX_RESULTS records from a lookup generator.
+    
+    With sort_key, the best MAX_RESULTS by that key are kept in a bounded heap (ties
+    keep discovery order); otherwise the scan stops at the first MAX_RESULTS. If the
+    deadline expires, responds 503 unless the client passed partial=1, in which case
+    the records found so far are returned with 'partial': true.
+    """
+    max_results = app.config['MAX_RESULTS']
+    truncated = partial = False
+    heap, results = [], []
+    
+    try:
+        for seq, record in enumerate(records):
+            if sort_key is None:
+                if len(results) >= max_results:
+                    truncated = True
+                    break
+                results.append(record)
+                continue
+            
+            item = (-sort_key(record), -seq, record)
+            if len(heap) < max_results:
+                heapq.heappush(heap, item)
+            else:
+                truncated = True
+                heapq.heappushpop(heap, item)
+    except QueryDeadlineExceeded:
+        if request.args.get('partial', '').lower() not in ('1', 'true', 'yes'):
+            abort(503, description="Query deadline exceeded; narrow the query or pass partial=1")
+        partial = True
+    
+    if sort_key is not None:
+        results = [record for _, _, record in sorted(heap, key=lambda item: (-item[0], -item[1]))]
+    
+    summary = {'results': results, 'truncated': truncated}
+    if partial:
+        summary['partial'] = True
+    return summary
+
 
 # Create Flask app
 app = Flask(__name__)
 CORS(app)  # Enable CORS for web applications
 
-# Initialize API
+# Query limits for the expensive endpoints (overridable through the environment)
+app.config.update(
+    MAX_TOLERANCE=float(os.environ.get('GNOSISLOOM_MAX_TOLERANCE', 0.5)),
+    MAX_RESULTS=int(os.environ.get('GNOSISLOOM_MAX_RESULTS', 10000)),
+    MAX_QUERY_COST=int(os.environ.get('GNOSISLOOM_MAX_QUERY_COST', 50_000_000)),
+    QUERY_DEADLINE_SECONDS=float(os.environ.get('GNOSISLOOM_QUERY_DEADLINE', 10.0)),
+)
+
+# Initialize API (set GNOSISLOOM_DATASET to map a prebuilt dataset file instead of parsing JSON)
 try:
-    api = GnosisLoomAPI()
+    api = GnosisLoomAPI(dataset_path=os.environ.get('GNOSISLOOM_DATASET'))
 except Exception as e:
     logger.error(f"Failed to initialize API: {e}")
     api = None
 
+response_cache = ResponseCache()
+metrics = RequestMetrics()
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    metrics.request_started()
+
+@app.after_request
+def capture_response_info(response):
+    """Remember status and size; the request is recorded at teardown so streamed bodies are timed fully"""
+    g.response_status = response.status_code
+    g.response_size = None if g.get('ndjson_stream') else response.content_length
+    return response
+
+@app.teardown_request
+def record_request_metrics(exc):
+    # NDJSON streams tear the context down twice; record only once the body is sent.
+    # Other responses (including abort() error pages) are recorded immediately.
+    if 'request_started' not in g or (g.get('ndjson_stream') and not g.get('stream_finished')):
+        return
+    size = g.get('response_size')
+    if size is None and g.get('ndjson_stream'):
+        size = g.get('streamed_bytes', 0)
+    metrics.request_finished(
+        route=request.url_rule.rule if request.url_rule else 'unmatched',
+        method=request.method,
+        # A stream sets its own status when it is cut off (499 disconnect, 500 error)
+        status=500 if exc is not None and not g.get('ndjson_stream') else g.get('response_status', 500),
+        duration=time.perf_counter() - g.request_started,
+        size=size
+    )
+
+@app.after_request
+def compress_response(response):
+    """Compress uncached JSON responses when the client accepts it"""
+    if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+            or response.content_encoding or response.mimetype != 'application/json'):
+        return response
+    
+    encoding = negotiate_encoding(response.content_length or 0)
+    if encoding != 'identity':
+        response.set_data(compress_body(response.get_data(), encoding))
+        response.content_encoding = encoding
+        response.vary.add('Accept-Encoding')
+    return response
+
 @app.route('/health')
 def health_check():
     """API health check"""
@@ -212,30 +813,23 @@ def get_frequencies():
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 50, type=int)
     
-    freq_list = []
-    for name, data in api.frequencies.items():
-        if isinstance(data, dict):
-            freq = data.get('normal_freq') or data.get('frequency')
-            summary = {
-                'name': name,
-                'frequency': freq,
-                'stellar_anchor': data.get('stellar_anchor'),
-                'category': data.get('category', 'biological_system')
-            }
-            freq_list.append(summary)
+    fields = requested_fields(SUMMARY_FIELDS)
     
-    # Simple pagination
-    start = (page - 1) * per_page
-    end = start + per_page
-    paginated = freq_list[start:end]
+    def build():
+        # Simple pagination
+        start = (page - 1) * per_page
+        end = start + per_page
+        paginated, total = api.frequency_summaries(start, end, fields)
+        
+        return {
+            'frequencies': encode_records(paginated, tuple(fields or SUMMARY_FIELDS)),
+            'total': total,
+            'page': page,
+            'per_page': per_page,
+            'pages': math.ceil(total / per_page)
+        }
     
-    return jsonify({
-        'frequencies': paginated,
-        'total': len(freq_list),
-        'page': page,
-        'per_page': per_page,
-        'pages': math.ceil(len(freq_list) / per_page)
-    })
+    return cached_json(build)
 
 @app.route('/frequencies/<name>')
 def get_frequency(name):
@@ -246,10 +840,16 @@ def get_frequency(name):
     if name not in api.frequencies:
         abort(404, description="Frequency not found")
     
-    return jsonify({
-        'name': name,
-        'data': api.frequencies[name]
-    })
+    # ?fields= selects keys of the record (e.g. fields=normal_freq,stellar_anchor)
+    fields = requested_fields()
+    
+    def build():
+        data = api.frequencies[name]
+        if fields is not None and isinstance(data, dict):
+            data = {key: data[key] for key in fields if key in data}
+        return {'name': name, 'data': data}
+    
+    return cached_json(build)
 
 @app.route('/stellar-anchors')
 def get_stellar_anchors():
@@ -257,8 +857,8 @@ def get_stellar_anchors():
     if not api:
         abort(500, description="API not initialized")
     
-    return jsonify({
-        'stellar_anchors': api.stellar_anchors,
+    return cached_json(lambda: {
+        'stellar_anchors': dict(api.stellar_anchors),
         'count': len(api.stellar_anchors)
     })
 
@@ -271,7 +871,7 @@ def get_stellar_anchor(name):
     if name not in api.stellar_anchors:
         abort(404, description="Stellar anchor not found")
     
-    return jsonify({
+    return cached_json(lambda: {
         'name': name,
         'data': api.stellar_anchors[name]
     })
@@ -283,14 +883,34 @@ def get_harmonics(frequency):
         abort(500, description="API not initialized")
     
     tolerance = request.args.get('tolerance', 0.1, type=float)
-    relationships = api.find_harmonic_relationships(frequency, tolerance)
+    check_tolerance(tolerance)
+    check_query_cost(api.estimate_harmonic_cost(frequency, tolerance))
     
-    return jsonify({
-        'target_frequency': frequency,
-        'tolerance': tolerance,
-        'relationships': relationships,
-        'count': len(relationships)
-    })
+    fields = requested_fields(HARMONIC_FIELDS)
+    columns = tuple(fields or HARMONIC_FIELDS)
+    
+    deadline = request_deadline()
+    if wants_ndjson():
+        return ndjson_response(api.iter_harmonic_relationships(frequency, tolerance, deadline, fields), columns)
+    
+    def build():
+        # Deviation is always computed for ranking, then dropped if it was not requested
+        scan_fields = fields if fields is None or 'deviation' in fields else fields + ['deviation']
+        collected = collect_results(api.iter_harmonic_relationships(frequency, tolerance, deadline, scan_fields),
+                                    deadline, sort_key=lambda x: x['deviation'])
+        relationships = collected.pop('results')
+        if scan_fields is not fields:
+            for record in relationships:
+                del record['deviation']
+        return {
+            'target_frequency': frequency,
+            'tolerance': tolerance,
+            'relationships': encode_records(relationships, columns),
+            'count': len(relationships),
+            **collected
+        }
+    
+    return validated_json(build)
 
 @app.route('/search')
 def search_frequencies():
@@ -302,13 +922,26 @@ def search_frequencies():
     if not query:
         abort(400, description="Query parameter 'q' is required")
     
-    results = api.search_frequencies(query)
+    check_query_cost({'comparisons': len(api.frequencies)})
     
-    return jsonify({
-        'query': query,
-        'results': results,
-        'count': len(results)
-    })
+    fields = requested_fields(SEARCH_FIELDS)
+    columns = tuple(fields or DEFAULT_SEARCH_FIELDS)
+    
+    deadline = request_deadline()
+    if wants_ndjson():
+        return ndjson_response(api.iter_search_results(query, deadline, fields), columns)
+    
+    def build():
+        collected = collect_results(api.iter_search_results(query, deadline, fields), deadline)
+        results = collected.pop('results')
+        return {
+            'query': query,
+            'results': encode_records(results, columns),
+            'count': len(results),
+            **collected
+        }
+    
+    return validated_json(build)
 
 @app.route('/golden-ratio')
 def get_golden_ratio():
@@ -317,14 +950,34 @@ def get_golden_ratio():
         abort(500, description="API not initialized")
     
     tolerance = request.args.get('tolerance', 0.1, type=float)
-    relationships = api.find_golden_ratio_relationships(tolerance)
+    check_tolerance(tolerance)
+    check_query_cost(api.estimate_golden_ratio_cost(tolerance))
     
-    return jsonify({
-        'golden_ratio': 1.618033988749,
-        'tolerance': tolerance,
-        'relationships': relationships,
-        'count': len(relationships)
-    })
+    fields = requested_fields(GOLDEN_RATIO_FIELDS)
+    columns = tuple(fields or GOLDEN_RATIO_FIELDS)
+    
+    deadline = request_deadline()
+    if wants_ndjson():
+        return ndjson_response(api.iter_golden_ratio_relationships(tolerance, deadline, fields), columns)
+    
+    def build():
+        # Deviation is always computed for ranking, then dropped if it was not requested
+        scan_fields = fields if fields is None or 'deviation' in fields else fields + ['deviation']
+        collected = collect_results(api.iter_golden_ratio_relationships(tolerance, deadline, scan_fields),
+                                    deadline, sort_key=lambda x: x['deviation'])
+        relationships = collected.pop('results')
+        if scan_fields is not fields:
+            for record in relationships:
+                del record['deviation']
+        return {
+            'golden_ratio': GOLDEN_PHI,
+            'tolerance': tolerance,
+            'relationships': encode_records(relationships, columns),
+            'count': len(relationships),
+            **collected
+        }
+    
+    return validated_json(build)
 
 @app.route('/feedback-loops')
 def get_feedback_loops():
@@ -332,11 +985,34 @@ def get_feedback_loops():
     if not api:
         abort(500, description="API not initialized")
     
-    return jsonify({
-        'feedback_loops': api.feedback_loops,
+    return cached_json(lambda: {
+        'feedback_loops': dict(api.feedback_loops),
         'count': len(api.feedback_loops)
     })
 
+@app.route('/metrics')
+def get_metrics():
+    """Prometheus text exposition of request, cache and data-load metrics"""
+    lookups = response_cache.hits + response_cache.misses
+    extra = [
+        ('response_cache_hits_total', 'counter', 'Pre-serialized response cache hits.', (), response_cache.hits),
+        ('response_cache_misses_total', 'counter', 'Pre-serialized response cache misses.', (), response_cache.misses),
+        ('response_cache_hit_ratio', 'gauge', 'Response cache hit ratio since startup.', (),
+         response_cache.hits / lookups if lookups else 0.0),
+        ('response_cache_entries', 'gauge', 'Bodies currently held in the response cache.', (), len(response_cache)),
+    ]
+    if api:
+        extra += [
+            ('data_load_duration_seconds', 'gauge', 'Duration of the last data load.', (), api.load_duration),
+            ('data_entities', 'gauge', 'Entities loaded, by table.', (('table', 'frequencies'),), len(api.frequencies)),
+            ('data_entities', 'gauge', 'Entities loaded, by table.', (('table', 'stellar_anchors'),), len(api.stellar_anchors)),
+            ('data_entities', 'gauge', 'Entities loaded, by table.', (('table', 'feedback_loops'),), len(api.feedback_loops)),
+            ('data_info', 'gauge', 'Current data generation and storage mode.',
+             (('generation', api.generation), ('mode', 'mmap' if api.dataset else 'json')), 1),
+        ]
+    
+    return Response(metrics.render(extra), mimetype='text/plain; version=0.0.4')
+
 @app.route('/')
 def api_info():
     """API information and documentation"""
@@ -353,7 +1029,8 @@ def api_info():
             'GET /search?q={query}': 'Search frequencies by keyword',
             'GET /golden-ratio': 'Find golden ratio relationships (tolerance param)',
             'GET /feedback-loops': 'List all feedback loops',
-            'GET /health': 'API health check'
+            'GET /health': 'API health check',
+            'GET /metrics': 'Prometheus metrics (text exposition format)'
         },
         'data_summary': {
             'frequencies': len(api.frequencies) if api else 0,
@@ -367,8 +1044,12 @@ if __name__ == '__main__':
     parser.add_argument('--host', default='localhost', help='Host to bind to')
     parser.add_argument('--port', type=int, default=8080, help='Port to bind to')
     parser.add_argument('--debug', action='store_true', help='Enable debug mode')
+    parser.add_argument('--dataset', help='Prebuilt memory-mapped dataset (see mmap_dataset.py)')
     args = parser.parse_args()
     
+    if args.dataset:
+        api = GnosisLoomAPI(dataset_path=args.dataset)
+    
     logger.info(f"Starting GnosisLoom API on {args.host}:{args.port}")
     logger.info("API Endpoints available:")
     logger.info("  GET / - API information")
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+GnosisLoom Frequency API Load Test
+
+Generates synthetic frequency, stellar anchor and feedback loop datasets in the
+real schema at configurable scales (10³–10⁶ entries), drives every API endpoint
+with configurable concurrency, and reports per-endpoint latency percentiles,
+throughput, status codes and memory (RSS change per endpoint, process peak RSS)
+as JSON.
+
+By default requests go through the Flask test client in-process, so the run
+needs no server and works in CI. With --base-url the same workload is sent to a
+running server instead (the synthetic data must then be served by that server,
+and RSS is not reported).
+
+Usage:
+    python3 load_test.py --scales 1000 10000 --requests 200 --concurrency 8
+    python3 load_test.py --scales 100000 --mmap --output bench.json
+    python3 load_test.py --base-url http://localhost:8080 --scales 1000
+"""
+
+import argparse
+import json
+import logging
+import math
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+STELLAR_ANCHORS = ['Sol', 'Arcturus', 'Sirius A', 'Vega', 'Betelgeuse', 'Canopus', 'Rigel']
+ELEMENTS = ['H', 'C', 'N', 'O', 'Fe', 'Mg', 'Ca', 'Zn', 'Cu', 'Se', None]
+DISEASES = ['CFS', 'fibromyalgia', 'depression', 'arrhythmia', 'diabetes', 'migraine']
+SYSTEMS = ['heart', 'liver', 'brain', 'blood', 'immune', 'circadian', 'metabolism']
+TERMS = ['neural', 'cardiac', 'mitochondria', 'membrane', 'hormone', 'vascular', 'cell', 'gut', 'bone']
+
+
+def generate_synthetic_dataset(output_dir: Path, n_frequencies: int, n_anchors: int,
+                               n_loops: int, seed: int = 42) -> Dict[str, int]:
+    """
+    Write comprehensive_frequencies.json, comprehensive_stellar_anchors.json and
+    feedback_loops.json with the same structure as the files in data/.
+
+    Frequencies are log-uniform between 0.001 Hz and 10 kHz so harmonic and golden
+    ratio lookups see realistic densities at every scale.
+    """
+    rng = random.Random(seed)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    frequencies = {}
+    for i in range(n_frequencies):
+        freq = round(10 ** rng.uniform(-3, 4), 4)
+        name = f"{rng.choice(TERMS)}_{i:07d}"
+        frequencies[name] = {
+            'normal_freq': freq,
+            'range': [round(freq * 0.8, 4), round(freq * 1.2, 4)],
+            'phase': round(rng.uniform(0, math.pi), 3),
+            'stellar_anchor': rng.choice(STELLAR_ANCHORS + [None]),
+            'element': rng.choice(ELEMENTS),
+            'harmonics': [round(freq * k, 4) for k in (0.5, 1, 2, 4)],
+            'disease_states': {d: round(freq * rng.uniform(0.2, 2.0), 4)
+                               for d in rng.sample(DISEASES, rng.randint(0, 3))}
+        }
+
+    anchors = {}
+    for i in range(n_anchors):
+        anchors[f"{rng.choice(STELLAR_ANCHORS)}-{i:05d}"] = {
+            'frequency': round(rng.uniform(5, 15), 2),
+            'element': rng.choice(ELEMENTS[:-1]),
+            'color': f"#{rng.randrange(0x1000000):06X}",
+            'systems': rng.sample(SYSTEMS, rng.randint(1, 3))
+        }
+
+    loops = {}
+    for i in range(n_loops):
+        loops[f"FL-{i:05d}"] = (f"{round(10 ** rng.uniform(-2, 2), 2)} Hz {rng.choice(TERMS)} "
+                                f"rhythm modulating {rng.choice(SYSTEMS)} cycles")
+
+    for filename, data in [('comprehensive_frequencies.json', frequencies),
+                           ('comprehensive_stellar_anchors.json', anchors),
+                           ('feedback_loops.json', loops)]:
+        with open(output_dir / filename, 'w') as f:
+            json.dump(data, f)
+
+    return {'frequencies': n_frequencies, 'stellar_anchors': n_anchors, 'feedback_loops': n_loops}
+
+
+def build_workload(data_dir: Path, rng: random.Random) -> List[Tuple[str, Callable[[], str], bool]]:
+    """
+    Endpoints to drive, each with a URL factory sampling names from the dataset and
+    a flag marking pair-scanning endpoints that get a smaller request budget.
+    """
+    with open(data_dir / 'comprehensive_frequencies.json') as f:
+        freq_names = list(json.load(f).keys())
+    with open(data_dir / 'comprehensive_stellar_anchors.json') as f:
+        anchor_names = list(json.load(f).keys())
+    pages = max(1, len(freq_names) // 50)
+
+    return [
+        ('/health', lambda: '/health', False),
+        ('/frequencies', lambda: f"/frequencies?page={rng.randint(1, pages)}", False),
+        ('/frequencies/<name>', lambda: f"/frequencies/{rng.choice(freq_names)}", False),
+        ('/stellar-anchors', lambda: '/stellar-anchors', False),
+        ('/stellar-anchors/<name>', lambda: f"/stellar-anchors/{rng.choice(anchor_names)}", False),
+        ('/feedback-loops', lambda: '/feedback-loops', False),
+        ('/harmonics/<frequency>', lambda: f"/harmonics/{round(10 ** rng.uniform(-1, 3), 2)}?tolerance=0.05", False),
+        ('/search', lambda: f"/search?q={rng.choice(TERMS)}_{rng.randint(0, 99):02d}&fields=name,frequency", False),
+        ('/golden-ratio', lambda: '/golden-ratio?tolerance=0.001&stream=1', True),
+        ('/metrics', lambda: '/metrics', False),
+    ]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (a high-water mark over the whole run)"""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+
+
+def current_rss_mb() -> Optional[float]:
+    """Current resident set size of this process in MB, or None where /proc is unavailable"""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return pages * resource.getpagesize() / (1024 * 1024)
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * q
+    lo, hi = math.floor(k), math.ceil(k)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+class TestClientDriver:
+    """Sends requests through Flask test clients, one per worker thread"""
+
+    def __init__(self, app):
+        self.app = app
+        self._local = threading.local()
+
+    def get(self, url: str) -> Tuple[int, int]:
+        if not hasattr(self._local, 'client'):
+            self._local.client = self.app.test_client()
+        response = self._local.client.get(url)
+        return response.status_code, len(response.get_data())
+
+
+class HTTPDriver:
+    """Sends requests to a running server"""
+
+    def __init__(self, base_url: str, timeout: float = 60.0):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+
+    def get(self, url: str) -> Tuple[int, int]:
+        try:
+            with urllib.request.urlopen(self.base_url + url, timeout=self.timeout) as response:
+                return response.status, len(response.read())
+        except urllib.error.HTTPError as e:
+            return e.code, len(e.read())
+
+
+def run_endpoint(driver, url_factory: Callable[[], str], requests: int, concurrency: int) -> Dict[str, Any]:
+    """Issue requests to one endpoint and summarize latency, throughput and status codes"""
+    urls = [url_factory() for _ in range(requests)]
+
+    def timed(url: str) -> Tuple[float, int, int]:
+        started = time.perf_counter()
+        status, size = driver.get(url)
+        return time.perf_counter() - started, status, size
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = list(pool.map(timed, urls))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(s[0] * 1000 for s in samples)
+    statuses: Dict[str, int] = {}
+    for _, status, _ in samples:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+
+    return {
+        'requests': requests,
+        'concurrency': concurrency,
+        'status_codes': statuses,
+        'latency_ms': {
+            'p50': round(percentile(latencies, 0.50), 3),
+            'p95': round(percentile(latencies, 0.95), 3),
+            'p99': round(percentile(latencies, 0.99), 3),
+            'mean': round(statistics.fmean(latencies), 3),
+            'max': round(latencies[-1], 3),
+        },
+        'throughput_rps': round(requests / elapsed, 2) if elapsed > 0 else None,
+        'mean_response_bytes': round(statistics.fmean(s[2] for s in samples), 1),
+    }
+
+
+def check_request_metrics(frequency_api) -> Dict[str, Any]:
+    """
+    Send requests that end in 400, 404 and 503, plus a stream the client drops
+    after the first line (499), through the test client and verify that /metrics
+    counts them and that no request is left in flight.
+    """
+    client = frequency_api.app.test_client()
+    expected = {
+        ('/harmonics/<float:frequency>', '400'): '/harmonics/10.0?tolerance=5',
+        ('/frequencies/<name>', '404'): '/frequencies/__missing__',
+        ('unmatched', '404'): '/__missing__',
+        ('/golden-ratio', '503'): '/golden-ratio?tolerance=0.01',
+    }
+    deadline = frequency_api.app.config['QUERY_DEADLINE_SECONDS']
+    frequency_api.app.config['QUERY_DEADLINE_SECONDS'] = 1e-9
+    try:
+        statuses = {url: client.get(url).status_code for url in expected.values()}
+    finally:
+        frequency_api.app.config['QUERY_DEADLINE_SECONDS'] = deadline
+
+    disconnect_url = '/search?q=_&stream=1'
+    response = client.get(disconnect_url, buffered=False)
+    next(iter(response.response))
+    response.close()
+    expected[('/search', '499')] = disconnect_url
+    statuses[disconnect_url] = 499
+
+    exposition = client.get('/metrics').get_data(as_text=True)
+    recorded = {
+        key: f'gnosisloom_http_requests_total{{route="{key[0]}",method="GET",status="{key[1]}"}}' in exposition
+        for key in expected
+    }
+    in_flight = frequency_api.metrics.in_flight
+    return {
+        'statuses': statuses,
+        'recorded': {f"{route} {status}": seen for (route, status), seen in recorded.items()},
+        'in_flight_after': in_flight,
+        'ok': all(recorded.values()) and in_flight == 0
+              and all(str(status) == key[1] for key, status in zip(expected, statuses.values())),
+    }
+
+
+def run_scale(scale: int, args, work_dir: Path) -> Dict[str, Any]:
+    """Generate a dataset of the given size and benchmark every endpoint against it"""
+    data_dir = work_dir / f"scale_{scale}"
+    counts = generate_synthetic_dataset(data_dir, scale, max(7, scale // 10), max(5, scale // 20), args.seed)
+    result: Dict[str, Any] = {'scale': scale, 'entities': counts, 'endpoints': {}}
+
+    if args.base_url:
+        driver = HTTPDriver(args.base_url)
+    else:
+        import frequency_api
+        dataset_path = None
+        if args.mmap:
+            from mmap_dataset import build_dataset
+            dataset_path = data_dir / 'gnosisloom_dataset.bin'
+            build_dataset(data_dir, dataset_path)
+        rss_before = peak_rss_mb()
+        started = time.perf_counter()
+        frequency_api.api = frequency_api.GnosisLoomAPI(str(data_dir), dataset_path=dataset_path)
+        result['startup'] = {
+            'seconds': round(time.perf_counter() - started, 4),
+            'data_load_seconds': round(frequency_api.api.load_duration, 4),
+            'mode': 'mmap' if args.mmap else 'json',
+            'peak_rss_mb_before': round(rss_before, 1),
+            'peak_rss_mb_after': round(peak_rss_mb(), 1),
+        }
+        driver = TestClientDriver(frequency_api.app)
+
+    rng = random.Random(args.seed)
+    for endpoint, url_factory, heavy in build_workload(data_dir, rng):
+        if args.endpoints and endpoint not in args.endpoints:
+            continue
+        requests = args.heavy_requests if heavy else args.requests
+        rss_before = current_rss_mb()
+        stats = run_endpoint(driver, url_factory, requests, args.concurrency)
+        if not args.base_url:
+            rss_after = current_rss_mb()
+            stats['rss_delta_mb'] = (round(rss_after - rss_before, 1)
+                                     if rss_before is not None and rss_after is not None else None)
+            # High-water mark of the whole process so far, not of this endpoint alone
+            stats['process_peak_rss_mb'] = round(peak_rss_mb(), 1)
+        result['endpoints'][endpoint] = stats
+        logging.info(f"scale={scale} {endpoint}: p50={stats['latency_ms']['p50']}ms "
+                     f"p99={stats['latency_ms']['p99']}ms {stats['throughput_rps']} req/s {stats['status_codes']}")
+
+    if not args.base_url:
+        result['metrics_check'] = check_request_metrics(frequency_api)
+        if not result['metrics_check']['ok']:
+            logging.warning(f"scale={scale}: /metrics check failed: {result['metrics_check']}")
+
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Synthetic-scale load test for the GnosisLoom Frequency API')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1000, 10000],
+                        help='Number of frequency entries per run (e.g. 1000 10000 100000 1000000)')
+    parser.add_argument('--requests', type=int, default=200, help='Requests per endpoint')
+    parser.add_argument('--heavy-requests', type=int, default=8,
+                        help='Requests for pair-scanning endpoints such as /golden-ratio')
+    parser.add_argument('--concurrency', type=int, default=8, help='Concurrent client threads')
+    parser.add_argument('--endpoints', nargs='*', help='Only run these endpoint patterns (e.g. /search)')
+    parser.add_argument('--mmap', action='store_true', help='Serve each scale from a memory-mapped dataset')
+    parser.add_argument('--base-url', help='Drive a running server instead of the in-process test client')
+    parser.add_argument('--work-dir', help='Directory for generated datasets (default: temporary)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed for data and workload')
+    parser.add_argument('--output', help='Write the JSON report here instead of stdout')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+
+    with tempfile.TemporaryDirectory(prefix='gnosisloom_load_') as tmp:
+        work_dir = Path(args.work_dir) if args.work_dir else Path(tmp)
+        report = {
+            'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'target': args.base_url or 'flask_test_client',
+            'python': sys.version.split()[0],
+            'runs': [run_scale(scale, args, work_dir) for scale in args.scales],
+        }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output)
+        logging.info(f"Report written to {args.output}")
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+GnosisLoom Memory-Mapped Dataset
+
+Builds and reads a prebuilt, read-only binary snapshot of the Frequency API data
+(frequencies, stellar anchors, feedback loops). The file is opened with mmap, so
+every worker process of a multi-process WSGI server shares the same physical pages
+instead of parsing the JSON and building its own Python dict copies.
+
+File layout:
+    8 bytes   magic (b'GLMDS001')
+    8 bytes   header length (little-endian uint64)
+    N bytes   header JSON (section table, counts, source generation)
+    ...       8-byte aligned sections in native byte order (uint64/uint32/int32/float64
+              columns, utf-8 blobs)
+
+Each table stores its names and JSON-encoded records as string tables (blob +
+offsets), plus a name-sorted index for O(log n) lookups. The frequency table also
+stores numeric/categorical columns and a frequency-sorted index for range queries.
+
+Usage:
+    python3 mmap_dataset.py --data-path ../data --output ../data/gnosisloom_dataset.bin
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import math
+import mmap
+import struct
+import sys
+import time
+from array import array
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'GLMDS001'
+FORMAT_VERSION = 1
+
+# Source files and the table each one is loaded into
+SOURCE_FILES = {
+    'frequencies': 'comprehensive_frequencies.json',
+    'stellar_anchors': 'comprehensive_stellar_anchors.json',
+    'feedback_loops': 'feedback_loops.json',
+}
+
+NO_STRING = -1
+
+# Columns of a /frequencies listing summary
+SUMMARY_FIELDS = ('name', 'frequency', 'stellar_anchor', 'category')
+
+
+def record_frequency(data: Any) -> Optional[float]:
+    """Return the numeric frequency of a record, matching the API's lookup rules"""
+    if not isinstance(data, dict):
+        return None
+    freq = data.get('normal_freq') or data.get('frequency')
+    if not freq or not isinstance(freq, (int, float)):
+        return None
+    return freq
+
+
+def source_generation(data_path: Path) -> str:
+    """Fingerprint the source JSON files (name, size, mtime) for staleness checks"""
+    digest = hashlib.sha1()
+    for table, filename in sorted(SOURCE_FILES.items()):
+        source = Path(data_path) / filename
+        if source.exists():
+            stat = source.stat()
+            digest.update(f"{filename}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return digest.hexdigest()[:16]
+
+
+def source_mtime(data_path: Path) -> float:
+    """Latest modification time of the source JSON files (0 if none exist)"""
+    mtimes = [(Path(data_path) / filename).stat().st_mtime
+              for filename in SOURCE_FILES.values() if (Path(data_path) / filename).exists()]
+    return max(mtimes, default=0.0)
+
+
+def _string_table(strings: List[bytes]) -> Tuple[bytes, array]:
+    """Concatenate byte strings into a blob with n+1 uint64 offsets"""
+    offsets = array('Q', [0])
+    for s in strings:
+        offsets.append(offsets[-1] + len(s))
+    return b''.join(strings), offsets
+
+
+class _SectionWriter:
+    """Accumulates aligned binary sections and their header entries"""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.sections: Dict[str, Dict[str, Any]] = {}
+        self.size = 0
+
+    def add(self, name: str, payload, typecode: str = 'B'):
+        data = payload.tobytes() if isinstance(payload, array) else bytes(payload)
+        padding = (-self.size) % 8
+        if padding:
+            self.chunks.append(b'\0' * padding)
+            self.size += padding
+        self.sections[name] = {'offset': self.size, 'length': len(data), 'typecode': typecode}
+        self.chunks.append(data)
+        self.size += len(data)
+
+
+def build_dataset(data_path: str, output_path: str) -> Dict[str, Any]:
+    """
+    Build a memory-mappable dataset file from the JSON data directory.
+
+    Args:
+        data_path: Directory containing the GnosisLoom JSON files
+        output_path: Destination file (written atomically)
+
+    Returns:
+        The header written to the file
+    """
+    data_path = Path(data_path)
+    writer = _SectionWriter()
+    counts = {}
+
+    for table, filename in SOURCE_FILES.items():
+        source = data_path / filename
+        records = {}
+        if source.exists():
+            with open(source, 'r') as f:
+                records = json.load(f)
+
+        names = list(records.keys())
+        counts[table] = len(names)
+
+        name_blob, name_offsets = _string_table([n.encode('utf-8') for n in names])
+        record_blob, record_offsets = _string_table(
+            [json.dumps(records[n], separators=(',', ':')).encode('utf-8') for n in names]
+        )
+        name_index = array('I', sorted(range(len(names)), key=lambda i: names[i].encode('utf-8')))
+
+        writer.add(f'{table}.names', name_blob)
+        writer.add(f'{table}.name_offsets', name_offsets, 'Q')
+        writer.add(f'{table}.records', record_blob)
+        writer.add(f'{table}.record_offsets', record_offsets, 'Q')
+        writer.add(f'{table}.name_index', name_index, 'I')
+
+        if table != 'frequencies':
+            continue
+
+        # Typed columns for the frequency table
+        strings: Dict[str, int] = {}
+
+        def intern(value) -> int:
+            if not isinstance(value, str):
+                return NO_STRING
+            if value not in strings:
+                strings[value] = len(strings)
+            return strings[value]
+
+        frequency = array('d')
+        stellar_anchor = array('i')
+        category = array('i')
+        for n in names:
+            data = records[n]
+            freq = record_frequency(data)
+            frequency.append(float(freq) if freq is not None else math.nan)
+            is_dict = isinstance(data, dict)
+            stellar_anchor.append(intern(data.get('stellar_anchor')) if is_dict else NO_STRING)
+            category.append(intern(data.get('category', 'biological_system')) if is_dict else NO_STRING)
+
+        # Records listed by /frequencies, and a frequency-sorted index over those with a usable frequency
+        listed = array('I', (i for i in range(len(names)) if isinstance(records[names[i]], dict)))
+        by_frequency = sorted((i for i in range(len(names)) if not math.isnan(frequency[i])),
+                              key=lambda i: frequency[i])
+
+        string_blob, string_offsets = _string_table([s.encode('utf-8') for s in strings])
+        writer.add('strings', string_blob)
+        writer.add('string_offsets', string_offsets, 'Q')
+        writer.add('frequencies.frequency', frequency, 'd')
+        writer.add('frequencies.stellar_anchor', stellar_anchor, 'i')
+        writer.add('frequencies.category', category, 'i')
+        writer.add('frequencies.listed_ids', listed, 'I')
+        writer.add('frequencies.sorted_ids', array('I', by_frequency), 'I')
+        writer.add('frequencies.sorted_values', array('d', (frequency[i] for i in by_frequency)), 'd')
+
+    header = {
+        'format_version': FORMAT_VERSION,
+        'byteorder': sys.byteorder,
+        'built_at': time.time(),
+        'source_generation': source_generation(data_path),
+        'source_mtime': source_mtime(data_path),
+        'counts': counts,
+        'sections': writer.sections,
+    }
+    header_bytes = json.dumps(header).encode('utf-8')
+    preamble = MAGIC + struct.pack('<Q', len(header_bytes)) + header_bytes
+    preamble += b'\0' * ((-len(preamble)) % 8)
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_suffix(output_path.suffix + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(preamble)
+        for chunk in writer.chunks:
+            f.write(chunk)
+    tmp_path.replace(output_path)
+
+    logger.info(f"Built dataset {output_path} ({len(preamble) + writer.size:,} bytes): {counts}")
+    return header
+
+
+class MappedTable(Mapping):
+    """
+    Read-only mapping over one table of a MappedDataset.
+
+    Iteration yields names in source order; lookups binary-search the name index.
+    Records are decoded from the shared mapping on each access and never cached,
+    so per-worker memory stays flat.
+    """
+
+    def __init__(self, dataset: 'MappedDataset', table: str):
+        self._dataset = dataset
+        self._names = dataset.section(f'{table}.names')
+        self._name_offsets = dataset.section(f'{table}.name_offsets')
+        self._records = dataset.section(f'{table}.records')
+        self._record_offsets = dataset.section(f'{table}.record_offsets')
+        self._name_index = dataset.section(f'{table}.name_index')
+
+    def __len__(self) -> int:
+        return len(self._name_offsets) - 1
+
+    def name(self, i: int) -> str:
+        return bytes(self._names[self._name_offsets[i]:self._name_offsets[i + 1]]).decode('utf-8')
+
+    def record(self, i: int) -> Any:
+        return json.loads(bytes(self._records[self._record_offsets[i]:self._record_offsets[i + 1]]))
+
+    def raw_record(self, i: int) -> bytes:
+        """Return the JSON-encoded record without decoding it"""
+        return bytes(self._records[self._record_offsets[i]:self._record_offsets[i + 1]])
+
+    def find(self, name: str) -> Optional[int]:
+        """Binary-search the name index; returns the record id or None"""
+        if not isinstance(name, str):
+            return None
+        key = name.encode('utf-8')
+        lo, hi = 0, len(self._name_index)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            i = self._name_index[mid]
+            candidate = bytes(self._names[self._name_offsets[i]:self._name_offsets[i + 1]])
+            if candidate < key:
+                lo = mid + 1
+            elif candidate > key:
+                hi = mid
+            else:
+                return i
+        return None
+
+    def __contains__(self, name) -> bool:
+        return self.find(name) is not None
+
+    def __getitem__(self, name: str) -> Any:
+        i = self.find(name)
+        if i is None:
+            raise KeyError(name)
+        return self.record(i)
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(len(self)):
+            yield self.name(i)
+
+    def items(self):
+        for i in range(len(self)):
+            yield self.name(i), self.record(i)
+
+
+class _IndexedNames(Sequence):
+    """Sequence of table names in the order given by an id column"""
+
+    def __init__(self, table: MappedTable, ids: memoryview):
+        self._table = table
+        self._ids = ids
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __getitem__(self, k):
+        if isinstance(k, slice):
+            return [self._table.name(i) for i in self._ids[k]]
+        return self._table.name(self._ids[k])
+
+
+class MappedDataset:
+    """
+    Read-only view over a dataset file built by build_dataset().
+
+    Attributes:
+        frequencies, stellar_anchors, feedback_loops: MappedTable mappings
+        header: Parsed file header
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+
+        if self._view[:8] != MAGIC:
+            raise ValueError(f"{self.path} is not a GnosisLoom dataset file")
+        (header_len,) = struct.unpack_from('<Q', self._mmap, 8)
+        self.header = json.loads(bytes(self._view[16:16 + header_len]))
+        if self.header.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported dataset format version: {self.header.get('format_version')}")
+        if sys.byteorder != self.header.get('byteorder'):
+            raise ValueError("Dataset byte order does not match this platform")
+        self._data_offset = 16 + header_len + ((-(16 + header_len)) % 8)
+
+        self.frequencies = MappedTable(self, 'frequencies')
+        self.stellar_anchors = MappedTable(self, 'stellar_anchors')
+        self.feedback_loops = MappedTable(self, 'feedback_loops')
+
+        self._frequency = self.section('frequencies.frequency')
+        self._stellar_anchor = self.section('frequencies.stellar_anchor')
+        self._category = self.section('frequencies.category')
+        self._strings = self.section('strings')
+        self._string_offsets = self.section('string_offsets')
+        self.listed_ids = self.section('frequencies.listed_ids')
+        self.sorted_ids = self.section('frequencies.sorted_ids')
+        self.sorted_values = self.section('frequencies.sorted_values')
+        self.sorted_names = _IndexedNames(self.frequencies, self.sorted_ids)
+
+    def section(self, name: str) -> memoryview:
+        """Return a zero-copy typed view of a section"""
+        info = self.header['sections'][name]
+        start = self._data_offset + info['offset']
+        view = self._view[start:start + info['length']]
+        return view if info['typecode'] == 'B' else view.cast(info['typecode'])
+
+    def string(self, string_id: int) -> Optional[str]:
+        if string_id == NO_STRING:
+            return None
+        start, end = self._string_offsets[string_id], self._string_offsets[string_id + 1]
+        return bytes(self._strings[start:end]).decode('utf-8')
+
+    def frequency(self, i: int) -> Optional[float]:
+        value = self._frequency[i]
+        return None if math.isnan(value) else value
+
+    def frequency_summary(self, i: int, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Listing summary for a frequency record built from columns only"""
+        summary = {}
+        for field in fields or SUMMARY_FIELDS:
+            if field == 'name':
+                summary[field] = self.frequencies.name(i)
+            elif field == 'frequency':
+                summary[field] = self.frequency(i)
+            elif field == 'stellar_anchor':
+                summary[field] = self.string(self._stellar_anchor[i])
+            elif field == 'category':
+                summary[field] = self.string(self._category[i])
+        return summary
+
+    def is_stale(self, data_path: str) -> bool:
+        """True if the source JSON files changed since the dataset was built"""
+        return source_generation(Path(data_path)) != self.header.get('source_generation')
+
+    def close(self):
+        for attr in ('_frequency', '_stellar_anchor', '_category', '_strings',
+                     '_string_offsets', 'listed_ids', 'sorted_ids', 'sorted_values'):
+            getattr(self, attr).release()
+        for table in (self.frequencies, self.stellar_anchors, self.feedback_loops):
+            for view in vars(table).values():
+                if isinstance(view, memoryview):
+                    view.release()
+        self._view.release()
+        self._mmap.close()
+        self._file.close()
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description='Build a memory-mapped GnosisLoom dataset')
+    parser.add_argument('--data-path', default='../data', help='Directory containing the JSON data files')
+    parser.add_argument('--output', default='../data/gnosisloom_dataset.bin', help='Output dataset file')
+    args = parser.parse_args()
+
+    header = build_dataset(args.data_path, args.output)
+    print(f"✅ Dataset written to {args.output}")
+    for table, count in header['counts'].items():
+        print(f"  {table}: {count}")
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+GnosisLoom API Request Metrics
+
+Lightweight in-process metrics for the Frequency API, rendered in the Prometheus
+text exposition format. Counters, gauges and fixed-bucket histograms are kept in
+plain dicts behind a single lock; recording a request is a handful of dict
+updates, so the hooks add negligible latency.
+
+Metrics are per worker process: scrape each worker (or run a single worker)
+when capacity-tuning locally.
+"""
+
+import threading
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Latency buckets in seconds (1 ms .. 10 s)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Response size buckets in bytes (256 B .. 64 MB)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216, 67108864)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    escaped = (f'{k}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+               for k, v in pairs)
+    return '{' + ','.join(escaped) + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """Cumulative fixed-bucket histogram"""
+
+    def __init__(self, buckets: Iterable[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self, name: str, labels: Labels) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            cumulative += count
+            lines.append(f"{name}_bucket{_format_labels(labels, ('le', _format_value(bound)))} {cumulative}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(self.sum)}")
+        lines.append(f"{name}_count{_format_labels(labels)} {self.count}")
+        return lines
+
+
+class RequestMetrics:
+    """Per-route request counters and histograms plus free-form gauges"""
+
+    def __init__(self, prefix: str = 'gnosisloom'):
+        self.prefix = prefix
+        self.in_flight = 0
+        self._requests: Dict[Labels, int] = {}
+        self._latency: Dict[Labels, Histogram] = {}
+        self._size: Dict[Labels, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def request_started(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def request_finished(self, route: str, method: str, status: int,
+                         duration: float, size: Optional[int]):
+        route_labels = (('route', route),)
+        with self._lock:
+            self.in_flight -= 1
+            key = (('route', route), ('method', method), ('status', str(status)))
+            self._requests[key] = self._requests.get(key, 0) + 1
+
+            if route_labels not in self._latency:
+                self._latency[route_labels] = Histogram(LATENCY_BUCKETS)
+            self._latency[route_labels].observe(duration)
+
+            if size is not None:
+                if route_labels not in self._size:
+                    self._size[route_labels] = Histogram(SIZE_BUCKETS)
+                self._size[route_labels].observe(size)
+
+    def render(self, extra: Iterable[Tuple[str, str, str, Labels, float]] = ()) -> str:
+        """
+        Render all metrics in the text exposition format.
+
+        Args:
+            extra: Additional (name, type, help, labels, value) samples collected at scrape time
+        """
+        p = self.prefix
+        lines = []
+        with self._lock:
+            lines += [f"# HELP {p}_http_requests_total Requests handled, by route, method and status.",
+                      f"# TYPE {p}_http_requests_total counter"]
+            for labels, count in sorted(self._requests.items()):
+                lines.append(f"{p}_http_requests_total{_format_labels(labels)} {count}")
+
+            lines += [f"# HELP {p}_http_request_duration_seconds Request latency, including streamed bodies.",
+                      f"# TYPE {p}_http_request_duration_seconds histogram"]
+            for labels, hist in sorted(self._latency.items()):
+                lines += hist.samples(f"{p}_http_request_duration_seconds", labels)
+
+            lines += [f"# HELP {p}_http_response_size_bytes Response body size as sent (after compression).",
+                      f"# TYPE {p}_http_response_size_bytes histogram"]
+            for labels, hist in sorted(self._size.items()):
+                lines += hist.samples(f"{p}_http_response_size_bytes", labels)
+
+            lines += [f"# HELP {p}_http_requests_in_flight Requests currently being processed.",
+                      f"# TYPE {p}_http_requests_in_flight gauge",
+                      f"{p}_http_requests_in_flight {self.in_flight}"]
+
+        # Group extra samples by name so each metric gets a single HELP/TYPE block
+        grouped: Dict[str, Tuple[str, str, List[Tuple[Labels, float]]]] = {}
+        for name, metric_type, help_text, labels, value in extra:
+            grouped.setdefault(name, (metric_type, help_text, []))[2].append((labels, value))
+        for name, (metric_type, help_text, samples) in grouped.items():
+            lines += [f"# HELP {p}_{name} {help_text}", f"# TYPE {p}_{name} {metric_type}"]
+            for labels, value in samples:
+                lines.append(f"{p}_{name}{_format_labels(labels)} {_format_value(value)}")
+
+        return '\n'.join(lines) + '\n'
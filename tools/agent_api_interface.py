@@ -13,17 +13,26 @@ Key Features:
 - Simple function-based API for agents
 - Natural language query processing
 - JSON-serializable results
-- Caching for performance
+- Per-instance TTL cache with engine-generation invalidation
+- Optional lazy start: data loads on a background thread while calls block only
+  on the load stage they need
 - Error handling and validation
 - Multi-domain frequency relationship discovery
 """
 
+import asyncio
+import base64
+import copy
 import json
 import logging
-from typing import Dict, List, Any, Optional, Tuple, Union
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, List, Any, Callable, Optional, Tuple, Union
 from pathlib import Path
 import time
-from functools import lru_cache
+from functools import wraps
+import numpy as np
 
 from universal_resonance_engine import UniversalResonanceEngine, ScientificDomain
 from gnosisloom_data_integrator import GnosisLoomDataIntegrator
@@ -33,6 +42,124 @@ from resql_query_engine import ResQLQueryEngine, QueryResult
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Load stages a lazily initialized API passes through. "entities" means every
+# database has been ingested; "complete" adds feedback loop linking, the ResQL
+# query engine and integration statistics.
+LOAD_STAGES = ("entities", "complete")
+
+# Fields available in entity listings; the defaults match the original summaries
+ENTITY_SUMMARY_FIELDS = ("entity_id", "name", "domain", "biofreq_code", "frequency", "stellar_anchor", "api_source")
+DEFAULT_ENTITY_FIELDS = ("name", "domain", "biofreq_code", "frequency", "stellar_anchor")
+
+# Sort orders for entity listings (None keeps ingestion order)
+ENTITY_SORT_KEYS = {
+    None: None,
+    "name": lambda entity: entity.name.lower(),
+    "frequency": lambda entity: entity.frequency_signature.primary_frequency if entity.frequency_signature else float("inf"),
+}
+
+
+class QueryCache:
+    """
+    Per-instance TTL cache for read-mostly API methods.
+
+    Entries are keyed by method name and arguments and remember the engine
+    generation they were computed against, so any change to the knowledge graph
+    invalidates them immediately rather than after the TTL. Cached values are
+    deep-copied on the way out so callers cannot mutate them.
+    """
+
+    def __init__(self, ttl_seconds: float = 300, max_entries: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()  # key -> (generation, expires_at, value)
+        self._metrics: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def _count(self, method: str, outcome: str):
+        counters = self._metrics.setdefault(method, {"hits": 0, "misses": 0, "expired": 0, "invalidated": 0})
+        counters[outcome] += 1
+
+    def get(self, key: Tuple, generation: int) -> Tuple[bool, Any]:
+        """Return (found, value) for a key, dropping stale or expired entries."""
+        method = key[0]
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry_generation, expires_at, value = entry
+                if entry_generation != generation:
+                    del self._entries[key]
+                    self._count(method, "invalidated")
+                elif time.monotonic() >= expires_at:
+                    del self._entries[key]
+                    self._count(method, "expired")
+                else:
+                    self._entries.move_to_end(key)
+                    self._count(method, "hits")
+                    return True, copy.deepcopy(value)
+            self._count(method, "misses")
+        return False, None
+
+    def put(self, key: Tuple, generation: int, value: Any):
+        with self._lock:
+            self._entries[key] = (generation, time.monotonic() + self.ttl_seconds, copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def statistics(self) -> Dict[str, Any]:
+        """Hit/miss counters per method plus overall totals."""
+        with self._lock:
+            by_method = {method: dict(counters) for method, counters in self._metrics.items()}
+            entries = len(self._entries)
+        hits = sum(c["hits"] for c in by_method.values())
+        lookups = hits + sum(c["misses"] for c in by_method.values())
+        return {
+            "entries": entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": hits,
+            "misses": lookups - hits,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "by_method": by_method
+        }
+
+
+def cached_query(cache_if: Optional[Callable[[Any], bool]] = None, stage: str = "complete"):
+    """
+    Cache a read-mostly UniversalResonanceAPI method in the instance's QueryCache.
+
+    Args:
+        cache_if: Optional predicate on the result; results it rejects (e.g. error
+            payloads) are returned but not stored
+        stage: Load stage the method needs (see LOAD_STAGES)
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            self._ensure_initialized(stage)
+            try:
+                key = (method.__name__, args, tuple(sorted(kwargs.items())))
+                hash(key)
+            except TypeError:
+                # Unhashable arguments: compute without caching
+                return method(self, *args, **kwargs)
+
+            generation = self.engine.generation
+            found, value = self.query_cache.get(key, generation)
+            if found:
+                return value
+
+            value = method(self, *args, **kwargs)
+            if cache_if is None or cache_if(value):
+                self.query_cache.put(key, generation, value)
+            return value
+        return wrapper
+    return decorator
+
 
 class UniversalResonanceAPI:
     """
@@ -40,22 +167,33 @@ class UniversalResonanceAPI:
     Provides simple methods that agents can call without understanding internal complexity.
     """
     
-    def __init__(self, auto_initialize: bool = True, gnosisloom_data_path: str = None):
+    def __init__(self, auto_initialize: bool = True, gnosisloom_data_path: str = None,
+                 lazy: bool = False):
         """
         Initialize the Universal Resonance API.
         
         Args:
             auto_initialize: If True, automatically loads all GnosisLoom databases
             gnosisloom_data_path: Path to GnosisLoom data directory
+            lazy: With auto_initialize, return immediately and load the databases on
+                a background thread (see initialize_in_background)
         """
         self.engine = None
         self.query_engine = None
         self.initialized = False
         self.stats_cache = {}
         self.cache_timeout = 300  # 5 minutes
+        self.query_cache = QueryCache(ttl_seconds=self.cache_timeout)
+        self.ready: Optional[Future] = None  # set while/after loading in the background
+        self._stage_events = {stage: threading.Event() for stage in LOAD_STAGES}
+        self._entity_order_cache: Dict[Tuple, Tuple[int, List[str]]] = {}  # (domain, sort, desc) -> (generation, ids)
+        self._order_lock = threading.Lock()
         
         if auto_initialize:
-            self.initialize(gnosisloom_data_path)
+            if lazy:
+                self.initialize_in_background(gnosisloom_data_path)
+            else:
+                self.initialize(gnosisloom_data_path)
             
     def initialize(self, gnosisloom_data_path: str = None) -> Dict[str, Any]:
         """
@@ -73,16 +211,24 @@ class UniversalResonanceAPI:
             # Initialize data integrator
             integrator = GnosisLoomDataIntegrator(gnosisloom_data_path)
             
+            def entities_loaded():
+                # Entity lookups can be served while feedback loops are still being linked
+                self.engine = integrator.get_engine()
+                self._stage_events["entities"].set()
+                
             # Integrate all databases
             logger.info("Integrating GnosisLoom databases...")
-            stats = integrator.integrate_all_databases()
+            stats = integrator.integrate_all_databases(on_entities_loaded=entities_loaded)
             
             # Get the engine
             self.engine = integrator.get_engine()
             self.query_engine = ResQLQueryEngine(self.engine)
+            self.query_cache.clear()
             
             self.initialized = True
             self.stats_cache = {"integration_stats": stats, "timestamp": time.time()}
+            for event in self._stage_events.values():
+                event.set()
             
             logger.info(f"Universal Resonance API initialized successfully: {stats['total_entities']} entities, {stats['total_feedback_loops']} feedback loops")
             return stats
@@ -91,13 +237,86 @@ class UniversalResonanceAPI:
             logger.error(f"Failed to initialize Universal Resonance API: {str(e)}")
             raise
             
-    def _ensure_initialized(self):
-        """Ensure the API is initialized before processing requests."""
-        if not self.initialized or self.engine is None:
+    def initialize_in_background(self, gnosisloom_data_path: str = None) -> Future:
+        """
+        Start loading the GnosisLoom databases on a background thread.
+        
+        Calls made meanwhile block only until the load stage they need is reached:
+        entity lookups wait for ingestion, everything else for the full load.
+        
+        Args:
+            gnosisloom_data_path: Path to GnosisLoom data directory
+            
+        Returns:
+            Future resolving to the integration statistics (also kept as self.ready)
+        """
+        if self.ready is not None and not self.ready.done():
+            return self.ready
+            
+        future: Future = Future()
+        future.set_running_or_notify_cancel()
+        for event in self._stage_events.values():
+            event.clear()
+        self.ready = future
+        
+        def load():
+            try:
+                future.set_result(self.initialize(gnosisloom_data_path))
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                # Release waiters on failure too; _ensure_initialized re-raises the error
+                for event in self._stage_events.values():
+                    event.set()
+                    
+        threading.Thread(target=load, name="resonance-api-loader", daemon=True).start()
+        return future
+        
+    def wait_until_ready(self, timeout: float = None) -> Dict[str, Any]:
+        """
+        Block until background loading finishes.
+        
+        Returns:
+            Integration statistics
+        """
+        if self.ready is None:
+            self._ensure_initialized()
+            return self.stats_cache.get("integration_stats", {})
+        return self.ready.result(timeout)
+        
+    async def wait_until_ready_async(self) -> Dict[str, Any]:
+        """Await background loading from an asyncio event loop."""
+        if self.ready is None:
+            return self.wait_until_ready()
+        return await asyncio.wrap_future(self.ready)
+            
+    def _ensure_initialized(self, stage: str = "complete"):
+        """
+        Ensure the API is initialized before processing requests.
+        
+        Args:
+            stage: Load stage the caller needs; while loading in the background
+                this blocks until that stage is reached
+        """
+        if self.ready is not None and not self._stage_events[stage].is_set():
+            self._stage_events[stage].wait()
+        if self.ready is not None and self.ready.done() and self.ready.exception() is not None:
+            raise RuntimeError("Universal Resonance API failed to load") from self.ready.exception()
+            
+        if stage == "entities":
+            ready = self.engine is not None
+        else:
+            ready = self.initialized and self.engine is not None
+        if not ready:
             raise RuntimeError("Universal Resonance API not initialized. Call initialize() first.")
             
+    def get_cache_statistics(self) -> Dict[str, Any]:
+        """Get hit/miss metrics for the query cache."""
+        return self.query_cache.statistics()
+            
     # ===== CORE QUERY METHODS =====
     
+    @cached_query(cache_if=lambda result: result.get("query_type") != "error")
     def query_natural_language(self, query: str) -> Dict[str, Any]:
         """
         Process a natural language query and return results.
@@ -124,6 +343,7 @@ class UniversalResonanceAPI:
                 "results": []
             }
             
+    @cached_query(stage="entities")
     def find_frequency_matches(self, frequency_hz: float, tolerance_percent: float = 2.0) -> List[Dict[str, Any]]:
         """
         Find entities with frequencies matching the target frequency.
@@ -135,13 +355,14 @@ class UniversalResonanceAPI:
         Returns:
             List of matching entities
         """
-        self._ensure_initialized()
+        self._ensure_initialized("entities")
         
         tolerance = tolerance_percent / 100.0
         entities = self.engine.find_entities_by_frequency(frequency_hz, tolerance)
         
         return [self._entity_to_dict(entity) for entity in entities]
         
+    @cached_query(stage="entities")
     def find_harmonic_relationships(self, entity_name: str, tolerance_percent: float = 2.0) -> List[Dict[str, Any]]:
         """
         Find harmonic relationships for a given entity.
@@ -153,7 +374,7 @@ class UniversalResonanceAPI:
         Returns:
             List of harmonic relationships
         """
-        self._ensure_initialized()
+        self._ensure_initialized("entities")
         
         # Find entity by name
         target_entity = None
@@ -179,6 +400,7 @@ class UniversalResonanceAPI:
             
         return results
         
+    @cached_query(stage="entities")
     def find_cross_domain_connections(self, domain1: str, domain2: str, 
                                     frequency_tolerance_percent: float = 10.0) -> List[Dict[str, Any]]:
         """
@@ -192,7 +414,7 @@ class UniversalResonanceAPI:
         Returns:
             List of cross-domain connections
         """
-        self._ensure_initialized()
+        self._ensure_initialized("entities")
         
         # Convert domain strings to enums
         domain1_enum = self._string_to_domain(domain1)
@@ -215,6 +437,7 @@ class UniversalResonanceAPI:
             
         return results
         
+    @cached_query()
     def get_therapeutic_frequencies(self, condition_or_entity: str) -> List[Dict[str, Any]]:
         """
         Get therapeutic frequency recommendations for a condition or entity.
@@ -238,6 +461,7 @@ class UniversalResonanceAPI:
                 
         return therapeutic_protocols
         
+    @cached_query()
     def get_stellar_anchor_relationships(self, stellar_anchor: str = None) -> List[Dict[str, Any]]:
         """
         Get entities related to specific stellar anchors.
@@ -258,6 +482,7 @@ class UniversalResonanceAPI:
         result = self.query_natural_language(query)
         return result.get("results", [])
         
+    @cached_query()
     def get_feedback_loops(self, biofreq_code: str = None) -> List[Dict[str, Any]]:
         """
         Get feedback loop information.
@@ -280,6 +505,7 @@ class UniversalResonanceAPI:
         
     # ===== DISCOVERY METHODS =====
     
+    @cached_query()
     def discover_frequency_patterns(self) -> Dict[str, Any]:
         """
         Discover interesting frequency patterns across the knowledge graph.
@@ -293,6 +519,7 @@ class UniversalResonanceAPI:
         result = self.query_natural_language(query)
         return result
         
+    @cached_query()
     def find_frequency_clusters(self, min_cluster_size: int = 3) -> List[Dict[str, Any]]:
         """
         Find clusters of entities with similar frequencies.
@@ -317,48 +544,45 @@ class UniversalResonanceAPI:
                 
         return clusters
         
-    def get_disease_frequency_signatures(self, disease_name: str) -> List[Dict[str, Any]]:
+    @cached_query(stage="entities")
+    def get_disease_frequency_signatures(self, disease_name: str, fuzzy: bool = False) -> List[Dict[str, Any]]:
         """
         Get frequency signatures associated with a disease state.
         
         Args:
             disease_name: Name of disease or condition
+            fuzzy: Also return partial-name and close-spelling matches
             
         Returns:
             List of frequency signatures for the disease
         """
-        self._ensure_initialized()
+        self._ensure_initialized("entities")
         
-        disease_signatures = []
+        index = self.engine.disease_index
+        rows = index.lookup(disease_name, fuzzy=fuzzy)
+        if not rows:
+            return []
+            
+        frequencies = index.frequencies[rows]
+        disruptions = index.disruption_percentages(rows)
         
-        for entity in self.engine.entities.values():
-            if (entity.domain_metadata and 
-                "disease_states" in entity.domain_metadata):
-                
-                disease_states = entity.domain_metadata["disease_states"]
-                if isinstance(disease_states, dict) and disease_name.lower() in [k.lower() for k in disease_states.keys()]:
-                    
-                    # Find the specific disease frequency
-                    disease_freq = None
-                    for k, v in disease_states.items():
-                        if disease_name.lower() in k.lower():
-                            disease_freq = v
-                            break
-                            
-                    if disease_freq is not None:
-                        disease_signatures.append({
-                            "entity": self._entity_to_dict(entity),
-                            "disease": disease_name,
-                            "disease_frequency": disease_freq,
-                            "normal_frequency": entity.frequency_signature.primary_frequency if entity.frequency_signature else None,
-                            "frequency_disruption": self._calculate_disruption(entity.frequency_signature.primary_frequency if entity.frequency_signature else None, disease_freq)
-                        })
-                        
+        disease_signatures = []
+        for row, (normal_freq, _), disruption in zip(rows, frequencies, disruptions):
+            entity = self.engine.entities[index.entity_ids[row]]
+            disease_signatures.append({
+                "entity": self._entity_to_dict(entity),
+                "disease": disease_name,
+                "matched_disease": index.disease_names[row],
+                "disease_frequency": index.disease_values[row],
+                "normal_frequency": None if np.isnan(normal_freq) else float(normal_freq),
+                "frequency_disruption": None if np.isnan(disruption) else float(disruption)
+            })
+            
         return disease_signatures
         
     # ===== INFORMATION METHODS =====
     
-    @lru_cache(maxsize=1)
+    @cached_query()
     def get_system_statistics(self, include_detailed_breakdown: bool = False) -> Dict[str, Any]:
         """
         Get comprehensive system statistics.
@@ -371,12 +595,9 @@ class UniversalResonanceAPI:
         """
         self._ensure_initialized()
         
-        # Check cache
-        if self.stats_cache and (time.time() - self.stats_cache.get("timestamp", 0)) < self.cache_timeout:
-            base_stats = self.stats_cache["integration_stats"]
-        else:
-            base_stats = self.engine.get_statistics()
-            self.stats_cache = {"integration_stats": base_stats, "timestamp": time.time()}
+        # Integration details (databases processed, errors) plus live engine counts
+        base_stats = dict(self.stats_cache.get("integration_stats", {}))
+        base_stats.update(self.engine.get_statistics())
             
         if include_detailed_breakdown:
             # Add detailed breakdowns
@@ -386,41 +607,77 @@ class UniversalResonanceAPI:
             
         return base_stats
         
-    def list_available_entities(self, domain: str = None, limit: int = 100) -> List[Dict[str, Any]]:
+    @cached_query(stage="entities")
+    def list_available_entities(self, domain: str = None, limit: int = 100, offset: int = 0,
+                                sort_by: str = None, descending: bool = False,
+                                fields: Tuple[str, ...] = None) -> List[Dict[str, Any]]:
         """
         List available entities in the knowledge graph.
         
         Args:
             domain: Filter by domain (optional)
             limit: Maximum number of entities to return
+            offset: Number of entities to skip
+            sort_by: None (ingestion order), "name" or "frequency"
+            descending: Reverse the sort order
+            fields: Summary fields to include (see ENTITY_SUMMARY_FIELDS)
             
         Returns:
             List of entity summaries
         """
-        self._ensure_initialized()
+        return self.list_entities_page(domain, limit, offset=offset, sort_by=sort_by,
+                                       descending=descending, fields=fields)["entities"]
         
-        entities = []
-        count = 0
+    @cached_query(stage="entities")
+    def list_entities_page(self, domain: str = None, limit: int = 100, cursor: str = None,
+                           offset: int = 0, sort_by: str = None, descending: bool = False,
+                           fields: Tuple[str, ...] = None) -> Dict[str, Any]:
+        """
+        Page through entities, optionally restricted to one domain.
         
-        for entity in self.engine.entities.values():
-            if count >= limit:
-                break
-                
-            if domain is None or entity.domain.value.lower() == domain.lower():
-                entities.append({
-                    "name": entity.name,
-                    "domain": entity.domain.value,
-                    "biofreq_code": entity.biofreq_code,
-                    "frequency": entity.frequency_signature.primary_frequency if entity.frequency_signature else None,
-                    "stellar_anchor": entity.frequency_signature.stellar_anchor.star_name if entity.frequency_signature and entity.frequency_signature.stellar_anchor else None
-                })
-                count += 1
-                
-        return entities
+        Domain filters read the engine's per-domain id lists, so listing a rare
+        domain costs the size of that domain rather than the whole graph.
+        
+        Args:
+            domain: Filter by domain (optional)
+            limit: Page size
+            cursor: next_cursor from a previous page (overrides offset)
+            offset: Number of entities to skip
+            sort_by: None (ingestion order), "name" or "frequency"
+            descending: Reverse the sort order
+            fields: Summary fields to include (see ENTITY_SUMMARY_FIELDS)
+            
+        Returns:
+            Dictionary with entities, total, offset and next_cursor (None on the last page)
+        """
+        self._ensure_initialized("entities")
+        
+        if sort_by not in ENTITY_SORT_KEYS:
+            raise ValueError(f"sort_by must be one of {sorted(k for k in ENTITY_SORT_KEYS if k)} or None")
+        fields = tuple(fields) if fields else DEFAULT_ENTITY_FIELDS
+        unknown = [f for f in fields if f not in ENTITY_SUMMARY_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown fields: {unknown}")
+        if cursor is not None:
+            offset = self._decode_cursor(cursor, domain, sort_by, descending)
+        offset = max(0, offset)
+        
+        ordered_ids = self._ordered_entity_ids(domain, sort_by, descending)
+        page_ids = ordered_ids[offset:offset + max(0, limit)]
+        next_offset = offset + len(page_ids)
+        
+        return {
+            "entities": [self._entity_summary(self.engine.entities[eid], fields) for eid in page_ids],
+            "total": len(ordered_ids),
+            "offset": offset,
+            "next_cursor": (self._encode_cursor(next_offset, domain, sort_by, descending)
+                            if page_ids and next_offset < len(ordered_ids) else None)
+        }
         
+    @cached_query(stage="entities")
     def get_supported_domains(self) -> List[str]:
         """Get list of supported scientific domains."""
-        self._ensure_initialized()
+        self._ensure_initialized("entities")
         return [domain.value for domain in self.engine.get_statistics()["supported_domains"] if isinstance(domain, str)] + [domain for domain in self.engine.get_statistics()["supported_domains"] if isinstance(domain, ScientificDomain)]
         
     # ===== UTILITY METHODS =====
@@ -440,6 +697,57 @@ class UniversalResonanceAPI:
             "api_source": entity.api_source
         }
         
+    def _entity_summary(self, entity, fields: Tuple[str, ...]) -> Dict[str, Any]:
+        """Lightweight projection of an entity for listings."""
+        signature = entity.frequency_signature
+        summary = {}
+        for field_name in fields:
+            if field_name == "domain":
+                summary["domain"] = entity.domain.value
+            elif field_name == "frequency":
+                summary["frequency"] = signature.primary_frequency if signature else None
+            elif field_name == "stellar_anchor":
+                summary["stellar_anchor"] = signature.stellar_anchor.star_name if signature and signature.stellar_anchor else None
+            else:
+                summary[field_name] = getattr(entity, field_name)
+        return summary
+        
+    def _ordered_entity_ids(self, domain: Optional[str], sort_by: Optional[str], descending: bool) -> List[str]:
+        """Entity ids for a domain in the requested order, memoized per engine generation."""
+        if domain is None:
+            ids = list(self.engine.entities.keys())
+        else:
+            domain_enum = next((d for d in ScientificDomain if d.value == domain.lower()), None)
+            ids = self.engine.domain_index.get(domain_enum, []) if domain_enum else []
+        if sort_by is None:
+            return ids[::-1] if descending else ids
+            
+        key = (domain.lower() if domain else None, sort_by, descending)
+        with self._order_lock:
+            cached = self._entity_order_cache.get(key)
+            if cached is not None and cached[0] == self.engine.generation:
+                return cached[1]
+                
+        sort_key = ENTITY_SORT_KEYS[sort_by]
+        ordered = sorted(ids, key=lambda eid: sort_key(self.engine.entities[eid]), reverse=descending)
+        with self._order_lock:
+            self._entity_order_cache[key] = (self.engine.generation, ordered)
+        return ordered
+        
+    def _encode_cursor(self, offset: int, domain: Optional[str], sort_by: Optional[str], descending: bool) -> str:
+        payload = json.dumps([offset, domain.lower() if domain else None, sort_by, descending])
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+        
+    def _decode_cursor(self, cursor: str, domain: Optional[str], sort_by: Optional[str], descending: bool) -> int:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            offset, cursor_domain, cursor_sort, cursor_desc = json.loads(base64.urlsafe_b64decode(padded))
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Invalid cursor: {cursor}") from e
+        if (cursor_domain, cursor_sort, cursor_desc) != (domain.lower() if domain else None, sort_by, descending):
+            raise ValueError("Cursor was issued for a different domain or sort order")
+        return int(offset)
+        
     def _string_to_domain(self, domain_str: str) -> Optional[ScientificDomain]:
         """Convert domain string to ScientificDomain enum."""
         for domain in ScientificDomain:
@@ -447,12 +755,6 @@ class UniversalResonanceAPI:
                 return domain
         return None
         
-    def _calculate_disruption(self, normal_freq: Optional[float], disease_freq: Optional[float]) -> Optional[float]:
-        """Calculate frequency disruption percentage."""
-        if normal_freq is None or disease_freq is None or normal_freq == 0:
-            return None
-        return abs(disease_freq - normal_freq) / normal_freq * 100.0
-        
     def _analyze_frequency_ranges(self) -> Dict[str, int]:
         """Analyze frequency distribution across ranges."""
         ranges = {
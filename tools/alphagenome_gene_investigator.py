@@ -16,9 +16,11 @@ from typing import Dict, List, Tuple, Optional, Set
 from collections import defaultdict, Counter
 from datetime import datetime
 import numpy as np
-from Bio import SeqIO
 from Bio.SeqRecord import SeqRecord
 
+from genome_reader import GenomeReader, extract_location
+from genome_cache import GenomeCache, DEFAULT_LEGACY_DIRS
+
 class AlphaGenomeGeneInvestigator:
     """Use AlphaGenome to investigate gene commonalities across kingdoms"""
     
@@ -28,6 +30,9 @@ class AlphaGenomeGeneInvestigator:
         else:
             self.data_dir = Path(data_directory)
         
+        # Genomes are looked up by accession; files saved under the data directory are adopted
+        self.genome_cache = GenomeCache(legacy_dirs=DEFAULT_LEGACY_DIRS + (self.data_dir / "genomes",))
+        
         # AlphaGenome API configuration
         self.alphagenome_api_key = api_key or os.getenv('ALPHAGENOME_API_KEY')
         self.alphagenome_base_url = "https://api.deepmind.com/alphagenome/v1"  # Hypothetical endpoint
@@ -133,59 +138,49 @@ class AlphaGenomeGeneInvestigator:
         if not kingdom_info:
             return []
         
-        # Try multiple possible genome file locations
-        possible_paths = [
-            Path(__file__).parent / kingdom_info['genome_file'],
-            Path(__file__).parent.parent / kingdom_info['genome_file'],
-            self.data_dir / "genomes" / Path(kingdom_info['genome_file']).name,
-            Path(__file__).parent / "data" / "genomes" / Path(kingdom_info['genome_file']).name
-        ]
-        
-        genome_file = None
-        for path in possible_paths:
-            if path.exists():
-                genome_file = path
-                break
+        # Resolve the genome by accession through the local genome cache
+        genome_file = self.genome_cache.resolve(kingdom_info['genome_file'])
         
         if not genome_file:
-            print(f"⚠️  Genome file not found for {kingdom} in any location:")
-            for path in possible_paths:
-                print(f"    Tried: {path}")
+            print(f"⚠️  Genome file not found for {kingdom} in the genome cache ({self.genome_cache.cache_dir})")
             return []
         
         print(f"📖 Loading gene sequences from {kingdom} genome: {genome_file}")
         
         genes = []
         try:
-            # Parse GenBank file to extract gene sequences
+            # Stream the GenBank file: features come from the record header, and only
+            # the stretch of sequence covering the selected genes is kept
             record_count = 0
-            for record in SeqIO.parse(str(genome_file), "genbank"):
+            for record in GenomeReader(genome_file, 'genbank').records():
                 record_count += 1
                 print(f"    Processing record {record_count}: {record.id} ({len(record.features)} features)")
-                gene_count = 0
                 cds_features = [f for f in record.features if f.type == "CDS"]
                 print(f"    Found {len(cds_features)} CDS features")
                 
-                for feature in record.features:
-                    if feature.type == "CDS" and gene_count < max_genes:
-                        # Extract gene sequence
-                        gene_seq = feature.extract(record.seq)
-                        
-                        # Get gene info
-                        gene_info = {
-                            'kingdom': kingdom,
-                            'sequence': str(gene_seq),
-                            'length': len(gene_seq),
-                            'start': int(feature.location.start),
-                            'end': int(feature.location.end),
-                            'strand': feature.location.strand,
-                            'gene_id': feature.qualifiers.get('gene', ['Unknown'])[0],
-                            'product': feature.qualifiers.get('product', ['Unknown'])[0],
-                            'locus_tag': feature.qualifiers.get('locus_tag', ['Unknown'])[0]
-                        }
-                        
-                        genes.append(gene_info)
-                        gene_count += 1
+                selected = cds_features[:max_genes]
+                if selected:
+                    region_start = min(int(f.location.start) for f in selected)
+                    region = record.read_region(region_start, max(int(f.location.end) for f in selected))
+                
+                for feature in selected:
+                    # Extract gene sequence
+                    gene_seq = extract_location(feature.location, region, region_start).decode()
+                    
+                    # Get gene info
+                    gene_info = {
+                        'kingdom': kingdom,
+                        'sequence': gene_seq,
+                        'length': len(gene_seq),
+                        'start': int(feature.location.start),
+                        'end': int(feature.location.end),
+                        'strand': feature.location.strand,
+                        'gene_id': feature.qualifiers.get('gene', ['Unknown'])[0],
+                        'product': feature.qualifiers.get('product', ['Unknown'])[0],
+                        'locus_tag': feature.qualifiers.get('locus_tag', ['Unknown'])[0]
+                    }
+                    
+                    genes.append(gene_info)
                 
                 break  # Only process first record for now
         
@@ -30,6 +30,7 @@ from datetime import datetime
 import asyncio
 import aiohttp
 from frequency_compression_engine import FrequencyCompressionEngine
+from window_tracks import TileCountIndex
 from q_dna_frequency_mapper import QDNAFrequencyMapper
 
 @dataclass
@@ -316,23 +317,26 @@ class AlphaGenomeIntegration:
         print(f"📊 Processing large genome: {sequence_length:,} bp")
         print(f"🔄 Breaking into {self.chunk_size:,} bp chunks")
         
-        chunks = []
         chunk_results = []
         
-        # Create chunks
-        for i in range(0, sequence_length, self.chunk_size):
-            chunk = sequence[i:i + self.chunk_size]
-            chunks.append({
-                "start": i,
-                "end": i + len(chunk),
-                "sequence": chunk,
-                "chunk_id": f"chunk_{i // self.chunk_size + 1}"
-            })
+        # Composition of every chunk from one counting pass; only the chunks that
+        # are analyzed in full are sliced out of the sequence
+        track = TileCountIndex(sequence, self.chunk_size).track(
+            self.chunk_size, partial=True, base_frequencies=self.frequency_engine.base_frequencies)
+        chunks = [
+            {
+                "start": start,
+                "end": end,
+                "chunk_id": f"chunk_{start // self.chunk_size + 1}"
+            }
+            for start, end in zip(track.starts.tolist(), track.ends.tolist())
+        ]
             
         print(f"📈 Created {len(chunks)} chunks for analysis")
         
         # Process chunks (would be parallelized in production)
         for chunk_info in chunks[:3]:  # Limit to first 3 chunks for demo
+            chunk_info["sequence"] = sequence[chunk_info["start"]:chunk_info["end"]]
             print(f"🧬 Processing {chunk_info['chunk_id']}: {chunk_info['start']:,}-{chunk_info['end']:,} bp")
             
             try:
@@ -358,6 +362,9 @@ class AlphaGenomeIntegration:
         # Aggregate results
         aggregated_results = self._aggregate_chunk_results(chunk_results, organism_name)
         
+        # Whole-genome composition track (all chunks, not just the analyzed ones)
+        aggregated_results["genome_track"] = dict(track.to_dict(), chunk_size=self.chunk_size)
+        
         return aggregated_results
         
     def _aggregate_chunk_results(self, chunk_results: List[Dict], organism_name: str) -> Dict:
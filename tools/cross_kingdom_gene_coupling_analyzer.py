@@ -15,10 +15,12 @@ import numpy as np
 from datetime import datetime
 import requests
 
+from kmer_spectrum import DEFAULT_K, KmerSpectrum, kmer_spectrum_path, spectrum_distances
+
 class CrossKingdomGeneCouplingAnalyzer:
     """Analyze gene coupling patterns across Bacteria, Archaea, Fungi, and Eukarya"""
     
-    def __init__(self, data_directory: str = None):
+    def __init__(self, data_directory: str = None, kmer_k: int = DEFAULT_K):
         if data_directory is None:
             # Default to GnosisLoom data directory
             self.data_dir = Path(__file__).parent.parent / "data"
@@ -30,6 +32,15 @@ class CrossKingdomGeneCouplingAnalyzer:
         self.shared_functions = defaultdict(set)
         self.frequency_correlations = {}
         
+        # Reference organism of each kingdom and the k of the k-mer spectra compared
+        self.kingdom_organisms = {
+            'bacteria': 'ecoli',
+            'archaea': 'methanocaldococcus',
+            'fungi': 'neurospora',
+            'eukarya': 'yeast'
+        }
+        self.kmer_k = kmer_k
+        
         # AlphaGenome API configuration (when available)
         self.alphafold_base_url = "https://alphafold.ebi.ac.uk/api/prediction/"
         self.alphagenome_available = False  # Will check during initialization
@@ -231,6 +242,35 @@ class CrossKingdomGeneCouplingAnalyzer:
         
         return coupling_mechanisms
     
+    def analyze_kmer_distances(self) -> Dict:
+        """Compare kingdom genomes by their k-mer spectra (see genomic_frequency_engine.py --kmer-k)"""
+        kmer_distances = {
+            'k': self.kmer_k,
+            'spectra': {},
+            'pairwise_distances': {}
+        }
+        
+        spectra = {}
+        for kingdom, organism in self.kingdom_organisms.items():
+            spectrum_file = kmer_spectrum_path(self.data_dir, organism, self.kmer_k)
+            if spectrum_file.exists():
+                spectra[kingdom] = KmerSpectrum.load(spectrum_file)
+                kmer_distances['spectra'][kingdom] = {
+                    'file': spectrum_file.name,
+                    'total_kmers': spectra[kingdom].total,
+                    'distinct_kmers': len(spectra[kingdom])
+                }
+            else:
+                print(f"⚠️  Missing {kingdom} k-mer spectrum: {spectrum_file.name}")
+        
+        kingdoms = list(spectra.keys())
+        for i, kingdom1 in enumerate(kingdoms):
+            for kingdom2 in kingdoms[i+1:]:
+                kmer_distances['pairwise_distances'][f"{kingdom1}_to_{kingdom2}"] = spectrum_distances(
+                    spectra[kingdom1], spectra[kingdom2])
+        
+        return kmer_distances
+    
     def check_alphafold_integration(self) -> Dict:
         """Check available protein structure data from AlphaFold"""
         alphafold_data = {
@@ -361,6 +401,9 @@ class CrossKingdomGeneCouplingAnalyzer:
         print("\n📡 Detecting frequency coupling mechanisms...")
         coupling_mechanisms = self.detect_frequency_coupling_mechanisms()
         
+        print(f"\n🧮 Computing {self.kmer_k}-mer spectrum distances...")
+        kmer_distances = self.analyze_kmer_distances()
+        
         print("\n🧬 Checking AlphaFold integration potential...")
         alphafold_integration = self.check_alphafold_integration()
         
@@ -379,6 +422,7 @@ class CrossKingdomGeneCouplingAnalyzer:
             'codon_conservation': codon_conservation,
             'universal_functions': universal_functions,
             'coupling_mechanisms': coupling_mechanisms,
+            'kmer_distances': kmer_distances,
             'alphafold_integration': alphafold_integration,
             'key_insights': insights
         }
@@ -20,6 +20,8 @@ from collections import defaultdict
 import asyncio
 import aiohttp
 
+from window_tracks import TileCountIndex
+
 # Import existing components
 try:
     from genomic_frequency_engine import AramIsFieldGenomeAnalyzer
@@ -513,13 +515,15 @@ class EnhancedGenomicDiscoveryEngine:
         window_size = 1000  # 1kb windows
         step_size = 500     # 50% overlap
         
-        for i in range(0, len(genome_sequence) - window_size, step_size):
+        # SDFA frequency signature of every window from per-step tile counts (one pass)
+        starts = np.arange(0, len(genome_sequence) - window_size, step_size)
+        track = TileCountIndex(genome_sequence, step_size).region_track(
+            starts, starts + window_size, base_frequencies=self.genome_analyzer.DNA_BASE_FREQUENCIES)
+        
+        for i, window_freq in zip(starts.tolist(), track.primary_frequency.tolist()):
             window_seq = genome_sequence[i:i+window_size]
             window_id = f"{organism}_region_{i}_{i+window_size}"
             
-            # Calculate SDFA frequency signature for this window
-            window_freq = self._calculate_sdfa_frequency_signature(window_seq)
-            
             # Check if this frequency resonates with known coordination patterns
             coordination_functions = self._identify_coordination_functions(
                 window_freq, window_seq, window_id
@@ -533,28 +537,6 @@ class EnhancedGenomicDiscoveryEngine:
         
         return revelations
     
-    def _calculate_sdfa_frequency_signature(self, sequence: str) -> float:
-        """Calculate SDFA frequency signature using existing framework"""
-        # Use DNA base frequencies from existing system
-        base_counts = {'A': 0, 'T': 0, 'G': 0, 'C': 0}
-        
-        for base in sequence.upper():
-            if base in base_counts:
-                base_counts[base] += 1
-        
-        total_bases = sum(base_counts.values())
-        if total_bases == 0:
-            return 0.0
-        
-        # Calculate weighted frequency
-        weighted_freq = 0
-        for base, count in base_counts.items():
-            proportion = count / total_bases
-            base_freq = self.genome_analyzer.DNA_BASE_FREQUENCIES[base]
-            weighted_freq += proportion * base_freq
-        
-        return weighted_freq
-    
     def _identify_coordination_functions(self, window_freq: float, sequence: str, window_id: str) -> List[GenomicJunkDNARevelation]:
         """Identify coordination functions based on frequency resonance"""
         revelations = []
@@ -20,10 +20,14 @@ import hashlib
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional, Union
 from dataclasses import dataclass
-from Bio import SeqIO
 import gzip
 import pickle
 
+from genome_reader import GenomeReader
+from genome_cache import GenomeCache
+from nucleotide_codec import count_bytes, sequence_digest
+from window_tracks import TileCountIndex
+
 @dataclass
 class FrequencySignature:
     """Compressed frequency representation of genomic sequence"""
@@ -56,17 +60,12 @@ class FrequencyCompressionEngine:
             'phylogenetic_delta': self.phylogenetic_delta_compression
         }
         
-    def calculate_sequence_frequency(self, sequence: str) -> Tuple[float, Dict]:
-        """Calculate primary frequency and harmonics for sequence"""
+    def calculate_sequence_frequency(self, sequence: Union[str, bytes, GenomeReader]) -> Tuple[float, Dict]:
+        """Calculate primary frequency and harmonics for sequence (str, bytes or streamed genome)"""
         
-        if not sequence:
-            return 0.0, {}
-            
-        # Count nucleotides
-        counts = {'A': 0, 'T': 0, 'G': 0, 'C': 0, 'N': 0}
-        for base in sequence.upper():
-            if base in counts:
-                counts[base] += 1
+        # Count nucleotides (case-insensitive; other characters are ignored)
+        byte_counts = count_bytes(sequence)
+        counts = {base: int(byte_counts[ord(base)] + byte_counts[ord(base.lower())]) for base in 'ATGCN'}
                 
         total = sum(counts.values())
         if total == 0:
@@ -146,7 +145,7 @@ class FrequencyCompressionEngine:
         }
         
         # Create verification hash
-        sequence_hash = hashlib.md5(sequence.encode()).hexdigest()[:12]
+        sequence_hash = sequence_digest(sequence, hashlib.md5()).hexdigest()[:12]
         
         compressed_data = json.dumps(signature)
         compression_ratio = len(sequence) / len(compressed_data.encode())
@@ -166,17 +165,16 @@ class FrequencyCompressionEngine:
         
         primary_freq, freq_data = self.calculate_sequence_frequency(sequence)
         
-        # Find resonance patterns in sequence
-        resonance_points = []
-        chunk_size = 1000  # Analyze in 1kb chunks
+        # Find resonance patterns in sequence (1kb chunks, counted in one streaming pass)
+        chunk_size = 1000
+        track = TileCountIndex(sequence, chunk_size).track(chunk_size, partial=True,
+                                                           base_frequencies=self.base_frequencies)
         
-        for i in range(0, len(sequence), chunk_size):
-            chunk = sequence[i:i+chunk_size]
-            chunk_freq, _ = self.calculate_sequence_frequency(chunk)
-            
-            # Calculate resonance with primary frequency
-            resonance_ratio = chunk_freq / primary_freq if primary_freq > 0 else 0
-            resonance_points.append(round(resonance_ratio, 4))
+        # Calculate resonance with primary frequency
+        if primary_freq > 0:
+            resonance_points = [round(ratio, 4) for ratio in (track.primary_frequency / primary_freq).tolist()]
+        else:
+            resonance_points = [0] * len(track)
             
         # Compress resonance pattern
         compressed_resonance = self._compress_resonance_pattern(resonance_points)
@@ -277,20 +275,9 @@ class FrequencyCompressionEngine:
         print(f"🧬 Compressing genome: {genome_path.name}")
         print(f"📊 Algorithm: {algorithm}")
         
-        # Read genome sequence
-        sequence = ""
-        if genome_path.suffix.lower() in ['.fasta', '.fa', '.fas']:
-            with open(genome_path, 'r') as f:
-                for record in SeqIO.parse(f, 'fasta'):
-                    sequence += str(record.seq)
-        elif genome_path.suffix.lower() in ['.gb', '.gbk']:
-            with open(genome_path, 'r') as f:
-                for record in SeqIO.parse(f, 'genbank'):
-                    sequence += str(record.seq)
-        else:
-            # Assume raw text sequence
-            with open(genome_path, 'r') as f:
-                sequence = f.read().strip()
+        # Stream the genome sequence (FASTA, GenBank or raw text) rather than loading it;
+        # multiple records are read back to back
+        sequence = GenomeReader(genome_path)
                 
         print(f"📏 Original size: {len(sequence):,} bp ({genome_path.stat().st_size / 1024 / 1024:.1f} MB)")
         
@@ -411,9 +398,9 @@ def main():
     engine = FrequencyCompressionEngine()
     
     # Test with E. coli data if available
-    ecoli_genome = "/home/kmr/LoomAgent/Stella/notebooks/BioFreqKnowledge/GnosisLoom/data/genomes/ecoli_NC_000913.3.gb"
+    ecoli_genome = GenomeCache().genbank_path("NC_000913.3")
     
-    if Path(ecoli_genome).exists():
+    if ecoli_genome:
         print(f"\n🦠 Testing with E. coli genome")
         try:
             compressed_ecoli = engine.compress_genome_file(ecoli_genome, 'frequency_signature')
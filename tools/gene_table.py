@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Gene Table - Columnar storage for per-gene frequency analyses
+
+The per-gene table of a genome analysis (gene_frequencies.individual_genes) is
+stored as typed columns in an NPZ archive next to a slim summary JSON, instead
+of as thousands of indented JSON objects. Numeric fields are native int/float
+arrays; text fields are UTF-8 bytes plus per-value byte lengths; fields that
+may be None carry a null mask. NPZ members are read on access, so a loader
+that only needs, say, gc_content decompresses that one column.
+
+The summary JSON keeps everything else from the analysis and describes the
+table under gene_frequencies.gene_table (file, format, row count, column
+types). load_analysis() turns a summary back into the full analysis, and reads
+legacy single-file analyses unchanged.
+
+Author: Dr. Mordin Solus (custom research persona of Claude Code)
+Date: 2025-09-02
+Version: 1.0.0
+
+Usage:
+    columns = read_gene_table("data/genomic_frequencies_ecoli.genes.npz", ["gene_id", "gc_content"])
+    analysis = load_analysis("data/genomic_frequencies_ecoli.json")   # full, as json.load gave
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+import numpy as np
+
+GENE_TABLE_SUFFIX = ".genes.npz"
+GENE_TABLE_FORMAT = "npz"
+GENE_TABLE_VERSION = 1
+
+# Per-gene fields in their order within each gene record, with storage types
+# (gene_id is the key of individual_genes)
+GENE_COLUMNS = {
+    'gene_id': 'str',
+    'gene_name': 'str',
+    'length': 'int64',
+    'location': 'str',
+    'strand': 'int8',
+    'nucleotide_frequency': 'float64',
+    'codon_frequency': 'float64',
+    'gc_content': 'float64',
+    'gene_signature': 'str'
+}
+
+
+def gene_table_path(analysis_file: Union[str, Path]) -> Path:
+    """Gene table stored alongside an analysis summary (same stem, .genes.npz)."""
+    analysis_file = Path(analysis_file)
+    return analysis_file.with_name(analysis_file.stem + GENE_TABLE_SUFFIX)
+
+
+def _encode_column(name: str, kind: str, values: List[Any]) -> Dict[str, np.ndarray]:
+    arrays = {}
+    nulls = np.array([value is None for value in values], dtype=bool)
+    if nulls.any():
+        arrays[f"{name}.null"] = nulls
+    if kind == 'str':
+        encoded = [b"" if value is None else str(value).encode('utf-8') for value in values]
+        lengths = np.array([len(value) for value in encoded], dtype=np.int64)
+        arrays[f"{name}.data"] = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        # Per-value byte lengths in the narrowest unsigned type (smaller and more compressible than offsets)
+        arrays[f"{name}.lengths"] = lengths.astype(np.min_scalar_type(int(lengths.max(initial=0))))
+    else:
+        arrays[name] = np.array([0 if value is None else value for value in values], dtype=kind)
+    return arrays
+
+
+def write_gene_table(individual_genes: Dict[str, Dict[str, Any]], path: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Write a per-gene table as compressed NPZ columns.
+
+    Args:
+        individual_genes: gene_id -> gene record, as produced by analyze_gene_frequencies
+        path: Output .npz file (written to a temporary file and renamed into place)
+
+    Returns:
+        Table description for the analysis summary (file name, format, rows, columns)
+    """
+    path = Path(path)
+    rows = list(individual_genes.items())
+    arrays = {}
+    for name, kind in GENE_COLUMNS.items():
+        values = [gene_id for gene_id, _ in rows] if name == 'gene_id' else [gene.get(name) for _, gene in rows]
+        arrays.update(_encode_column(name, kind, values))
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = path.with_name(path.name + ".tmp")
+    with open(tmp_file, 'wb') as f:
+        np.savez_compressed(f, **arrays)
+    tmp_file.replace(path)
+
+    return {
+        'file': path.name,
+        'format': GENE_TABLE_FORMAT,
+        'version': GENE_TABLE_VERSION,
+        'rows': len(rows),
+        'columns': dict(GENE_COLUMNS)
+    }
+
+
+def read_gene_table(path: Union[str, Path], columns: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """
+    Read columns of a gene table.
+
+    Args:
+        path: .genes.npz file
+        columns: Column names to read (default: all)
+
+    Returns:
+        Column name -> numpy array for numeric columns, list of str for text
+        columns; values stored as None come back as None
+    """
+    table = {}
+    with np.load(path) as archive:
+        for name in columns or GENE_COLUMNS:
+            kind = GENE_COLUMNS[name]
+            if kind == 'str':
+                data = archive[f"{name}.data"].tobytes()
+                offsets = [0] + np.cumsum(archive[f"{name}.lengths"], dtype=np.int64).tolist()
+                values = [data[start:end].decode('utf-8') for start, end in zip(offsets[:-1], offsets[1:])]
+            else:
+                values = archive[name]
+            if f"{name}.null" in archive.files:
+                nulls = archive[f"{name}.null"]
+                values = [None if null else value for value, null in zip(
+                    values if kind == 'str' else values.tolist(), nulls.tolist())]
+            table[name] = values
+    return table
+
+
+def gene_records(table: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Rebuild individual_genes (gene_id -> record with plain Python values) from a full table."""
+    columns = {name: values.tolist() if isinstance(values, np.ndarray) else values
+               for name, values in table.items()}
+    fields = [name for name in GENE_COLUMNS if name != 'gene_id']
+    return {
+        gene_id: {name: columns[name][i] for name in fields}
+        for i, gene_id in enumerate(columns['gene_id'])
+    }
+
+
+def split_analysis(analysis: Dict[str, Any], analysis_file: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Write an analysis's per-gene table next to analysis_file and return the slim
+    summary (the analysis with individual_genes replaced by the table description).
+    """
+    gene_frequencies = dict(analysis.get('gene_frequencies', {}))
+    individual_genes = gene_frequencies.pop('individual_genes', {})
+    gene_frequencies['gene_table'] = write_gene_table(individual_genes, gene_table_path(analysis_file))
+    return dict(analysis, gene_frequencies=gene_frequencies)
+
+
+def load_analysis(analysis_file: Union[str, Path], include_genes: bool = True) -> Dict[str, Any]:
+    """
+    Load a saved genome analysis.
+
+    Args:
+        analysis_file: Summary JSON (or a legacy analysis with genes inline)
+        include_genes: Rebuild gene_frequencies.individual_genes from the gene table
+
+    Returns:
+        The analysis as it was before saving
+    """
+    analysis_file = Path(analysis_file)
+    with open(analysis_file) as f:
+        analysis = json.load(f)
+    gene_frequencies = analysis.get('gene_frequencies', {})
+    if include_genes and 'gene_table' in gene_frequencies:
+        table_file = analysis_file.parent / gene_frequencies['gene_table']['file']
+        individual_genes = gene_records(read_gene_table(table_file))
+        rest = {key: value for key, value in gene_frequencies.items() if key != 'gene_table'}
+        analysis['gene_frequencies'] = {'individual_genes': individual_genes, **rest}
+    return analysis
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Genome Cache - Local content-addressed store for downloaded genomes
+
+Genomes are resolved by accession through an index file. Each entry records
+where the GenBank file lives, its SHA-256, its size and summary statistics, and
+a packed 2-bit store (see packed_genome.py) is kept next to every file, so a
+re-run finds both without touching the network or re-parsing. New downloads are
+stored under their content hash (objects/<sha256>.gb). GenBank files that were
+saved before the cache existed (<organism>_<accession>.gb in the cache or a
+legacy directory) are adopted in place the first time they are looked up.
+
+Every write (GenBank files, packed stores, the index) goes to a temporary file
+that is renamed into place, and index updates are serialized with a lock file,
+so concurrent pipelines never see partial data. In offline mode (offline=True
+or GNOSISLOOM_OFFLINE=1) a miss raises GenomeCacheMiss instead of downloading.
+
+Layout:
+    <cache_dir>/genome_index.json       accession -> entry
+    <cache_dir>/objects/<sha256>.gb     downloaded GenBank text
+    <cache_dir>/objects/<sha256>.pgen   packed sequence
+
+Author: Dr. Mordin Solus (custom research persona of Claude Code)
+Date: 2025-09-02
+Version: 1.0.0
+"""
+
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import re
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Union
+
+import numpy as np
+from Bio import SeqIO
+
+from genome_reader import GenomeReader
+from nucleotide_codec import CHUNK_SIZE
+from packed_genome import PackedGenome, PackedGenomeWriter, packed_genome_path
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path(__file__).parent / "data" / "genomes"
+# Where genome files were saved before the cache existed (relative to tools/ and to the repo root)
+DEFAULT_LEGACY_DIRS = (DEFAULT_CACHE_DIR, Path(__file__).parent.parent / "data" / "genomes")
+INDEX_FILE = "genome_index.json"
+LOCK_FILE = ".genome_index.lock"
+OBJECTS_DIR = "objects"
+
+CACHE_DIR_ENV = "GNOSISLOOM_GENOME_CACHE"
+OFFLINE_ENV = "GNOSISLOOM_OFFLINE"
+
+ACCESSION_PATTERN = re.compile(r"((?:N[CGTWZ]|GC[AF]|AC|NT)_\d+(?:\.\d+)?)")
+
+
+class GenomeCacheMiss(LookupError):
+    """Raised when a genome is not cached and the cache is offline."""
+
+
+def accession_from_filename(path: Union[str, Path]) -> Optional[str]:
+    """Accession embedded in a genome file name such as yeast_NC_001133.9.gb."""
+    match = ACCESSION_PATTERN.search(Path(path).name)
+    return match.group(1) if match else None
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _gc_fraction(byte_counts: np.ndarray) -> float:
+    """Bio.SeqUtils.gc_fraction (ambiguous='remove') from a byte histogram."""
+    gc = sum(int(byte_counts[ord(c)]) for c in "CGScgs")
+    length = gc + sum(int(byte_counts[ord(c)]) for c in "ATWUatwu")
+    return gc / length if length else 0
+
+
+class GenomeCache:
+    """
+    Accession-keyed cache of GenBank files and their packed stores.
+
+    Args:
+        cache_dir: Cache directory (default: $GNOSISLOOM_GENOME_CACHE or tools/data/genomes)
+        offline: Never download; defaults to $GNOSISLOOM_OFFLINE
+        legacy_dirs: Extra directories searched for <organism>_<accession>.gb files to adopt
+    """
+
+    def __init__(self, cache_dir: Union[str, Path, None] = None, offline: Optional[bool] = None,
+                 legacy_dirs: Iterable[Union[str, Path]] = DEFAULT_LEGACY_DIRS):
+        self.cache_dir = Path(cache_dir or os.environ.get(CACHE_DIR_ENV) or DEFAULT_CACHE_DIR)
+        if offline is None:
+            offline = os.environ.get(OFFLINE_ENV, '').lower() in ('1', 'true', 'yes')
+        self.offline = offline
+        self.legacy_dirs = [Path(d) for d in legacy_dirs]
+        self.index_file = self.cache_dir / INDEX_FILE
+
+    # ----- index -----
+
+    def _read_index(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.index_file) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except json.JSONDecodeError as e:
+            logger.warning(f"Ignoring unreadable genome index {self.index_file}: {e}")
+            return {}
+
+    @contextmanager
+    def _locked(self):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_dir / LOCK_FILE, 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _write_entry(self, accession: str, entry: Dict[str, Any]):
+        """Add or replace an index entry (read-modify-write under the lock, atomic replace)."""
+        with self._locked():
+            index = self._read_index()
+            index[accession] = entry
+            tmp_file = self.index_file.with_name(self.index_file.name + '.tmp')
+            with open(tmp_file, 'w') as f:
+                json.dump(index, f, indent=2, sort_keys=True)
+            os.replace(tmp_file, self.index_file)
+
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        """All index entries by accession."""
+        return self._read_index()
+
+    def _resolve_path(self, relative: str) -> Path:
+        path = Path(relative)
+        return path if path.is_absolute() else self.cache_dir / path
+
+    # ----- lookup -----
+
+    def lookup(self, accession: str) -> Optional[Dict[str, Any]]:
+        """
+        Index entry for an accession, with 'path' resolved to the GenBank file, or
+        None if it is not cached. Legacy files are adopted on first lookup.
+        """
+        entry = self._read_index().get(accession)
+        if entry:
+            path = self._resolve_path(entry['path'])
+            if path.exists() and path.stat().st_size == entry['size']:
+                return dict(entry, path=str(path))
+            logger.warning(f"Cached genome for {accession} is missing or changed: {path}")
+        return self._adopt_legacy_file(accession)
+
+    def genbank_path(self, accession: str) -> Optional[Path]:
+        """Cached GenBank file for an accession, or None."""
+        entry = self.lookup(accession)
+        return Path(entry['path']) if entry else None
+
+    def resolve(self, name: Union[str, Path]) -> Optional[Path]:
+        """Cached GenBank file for an accession or a file name containing one."""
+        accession = accession_from_filename(name) or str(name)
+        return self.genbank_path(accession)
+
+    def packed(self, accession: str) -> Optional[PackedGenome]:
+        """Packed store for an accession (built from the GenBank file if missing), or None."""
+        entry = self.lookup(accession)
+        if not entry:
+            return None
+        packed_file = packed_genome_path(entry['path'])
+        if not packed_file.exists() or packed_file.stat().st_mtime < Path(entry['path']).stat().st_mtime:
+            self._register(accession, Path(entry['path']), entry.get('organism'), entry.get('added'))
+        return PackedGenome(packed_file)
+
+    def _adopt_legacy_file(self, accession: str) -> Optional[Dict[str, Any]]:
+        for directory in dict.fromkeys([self.cache_dir] + self.legacy_dirs):
+            for candidate in sorted(directory.glob(f"*_{accession}.gb")):
+                organism = candidate.name[:-len(f"_{accession}.gb")]
+                logger.info(f"Adopting existing genome file {candidate} for {accession}")
+                return self._register(accession, candidate, organism)
+        return None
+
+    # ----- storing -----
+
+    def _register(self, accession: str, path: Path, organism: Optional[str] = None,
+                  added: Optional[str] = None) -> Dict[str, Any]:
+        """Pack a GenBank file, collect its summary statistics in the same pass, and index it."""
+        sha256 = _file_sha256(path)
+        byte_counts = np.zeros(256, dtype=np.int64)
+        description = None
+        with PackedGenomeWriter(packed_genome_path(path)) as writer:
+            for record in GenomeReader(path, 'genbank').records():
+                description = record.description if description is None else description
+                writer.begin_contig(record.id, description=record.description)
+                for chunk in record.iter_chunks():
+                    writer.write(chunk)
+                    byte_counts += np.bincount(np.frombuffer(chunk, dtype=np.uint8), minlength=256)
+            writer.close({'accession': accession, 'sha256': sha256})
+            length = writer.length
+
+        try:
+            stored_path = str(path.relative_to(self.cache_dir))
+        except ValueError:
+            stored_path = str(path.resolve())
+        entry = {
+            'accession': accession,
+            'organism': organism,
+            'path': stored_path,
+            'sha256': sha256,
+            'size': path.stat().st_size,
+            'length': length,
+            'gc_content': _gc_fraction(byte_counts),
+            'description': description or '',
+            'added': added or datetime.now().isoformat()
+        }
+        self._write_entry(accession, entry)
+        return dict(entry, path=str(path))
+
+    def store(self, accession: str, record, organism: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Write a SeqRecord under its content hash, pack it and index it.
+
+        Returns:
+            The new index entry (with 'path' resolved)
+        """
+        objects_dir = self.cache_dir / OBJECTS_DIR
+        objects_dir.mkdir(parents=True, exist_ok=True)
+        tmp_file = objects_dir / f".{accession}.{os.getpid()}.gb.tmp"
+        with open(tmp_file, 'w') as f:
+            SeqIO.write(record, f, 'genbank')
+        path = objects_dir / f"{_file_sha256(tmp_file)}.gb"
+        os.replace(tmp_file, path)
+        return self._register(accession, path, organism)
+
+    def fetch(self, accession: str, download: Callable[[], Any], organism: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Cached entry for an accession, calling download() for the SeqRecord and
+        storing it on a miss.
+
+        Raises:
+            GenomeCacheMiss: The genome is not cached and the cache is offline
+        """
+        entry = self.lookup(accession)
+        if entry:
+            logger.info(f"Using cached genome for {accession}: {entry['path']}")
+            return entry
+        if self.offline:
+            raise GenomeCacheMiss(f"Genome {accession} is not cached and the genome cache is offline")
+        return self.store(accession, download(), organism)
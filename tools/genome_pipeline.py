@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Genome Pipeline - Batch download and analysis of many genomes with resume
+
+Runs genomic_frequency_engine over a list of organisms or accessions (or the
+whole REFERENCE_GENOMES collection) in two stages per genome:
+
+    fetch    resolve the genome through the genome cache, downloading on a miss
+             (a few threads, since NCBI rate-limits requests)
+    analyze  analyze_complete_genome + save_analysis in a worker process
+
+Analysis starts as soon as each genome is fetched, with as many worker
+processes as the CPU budget allows; when there are fewer genomes than CPUs the
+spare cores go to each genome's per-gene analysis. Every completed stage is
+recorded in a manifest (written atomically after each stage), so an interrupted
+run picks up where it stopped: a genome whose analysis file exists and whose
+GenBank content hash still matches is not analyzed again. Failures are recorded
+and do not stop the other genomes.
+
+When the run finishes, a cross-organism summary table (one row per genome:
+length, GC content, gene count, frequencies, signature) is written as JSON and
+CSV next to the analysis files.
+
+Author: Dr. Mordin Solus (custom research persona of Claude Code)
+Date: 2025-09-02
+Version: 1.0.0
+
+Usage:
+    python genome_pipeline.py --all                       # temporal diversity collection
+    python genome_pipeline.py yeast neurospora NC_000909.1
+    python genome_pipeline.py --all --offline --cpus 8    # cached genomes only
+"""
+
+import argparse
+import csv
+import json
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from genome_cache import ACCESSION_PATTERN, GenomeCache
+from genomic_frequency_engine import REFERENCE_GENOMES, AramIsFieldGenomeAnalyzer
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "genome_pipeline_manifest.json"
+SUMMARY_FILE = "genome_pipeline_summary"
+MANIFEST_VERSION = 1
+
+# Concurrent NCBI downloads (NCBI allows 3 requests per second without an API key)
+FETCH_CONCURRENCY = 3
+
+SUMMARY_COLUMNS = [
+    'organism', 'accession', 'length_bp', 'gc_content', 'total_genes',
+    'primary_frequency_hz', 'genome_base_frequency_hz', 'weighted_codon_frequency_hz',
+    'genome_signature_code', 'analysis_file', 'analysis_seconds'
+]
+
+
+def resolve_targets(names: List[str], genome_cache: Optional[GenomeCache] = None) -> List[Tuple[str, str]]:
+    """
+    (organism, accession) for each organism name or accession.
+
+    Accessions get the organism name from REFERENCE_GENOMES or the genome cache,
+    and are used as their own organism name otherwise.
+    """
+    organisms_by_accession = {accession: organism for organism, accession in REFERENCE_GENOMES.items()}
+    targets = []
+    for name in names:
+        if name in REFERENCE_GENOMES:
+            targets.append((name, REFERENCE_GENOMES[name]))
+        elif ACCESSION_PATTERN.fullmatch(name):
+            organism = organisms_by_accession.get(name)
+            if not organism and genome_cache:
+                organism = (genome_cache.lookup(name) or {}).get('organism')
+            targets.append((organism or name, name))
+        else:
+            raise ValueError(f"Unknown organism or accession: {name}")
+    return list(dict.fromkeys(targets))
+
+
+def summary_row(analysis: Dict[str, Any], accession: str, analysis_file: str, seconds: float) -> Dict[str, Any]:
+    """One summary table row from a complete genome analysis."""
+    nucleotides = analysis['nucleotide_frequencies']
+    signature = analysis['aramis_field_signature']
+    return {
+        'organism': analysis['organism'],
+        'accession': accession,
+        'length_bp': int(analysis['genome_info'].get('length', 0)),
+        'gc_content': float(nucleotides['gc_content']),
+        'total_genes': int(analysis['gene_frequencies']['genome_statistics'].get('total_genes', 0)),
+        'primary_frequency_hz': float(signature['primary_frequency_hz']),
+        'genome_base_frequency_hz': float(nucleotides['genome_base_frequency_hz']),
+        'weighted_codon_frequency_hz': float(analysis['codon_frequencies']['weighted_codon_frequency_hz']),
+        'genome_signature_code': signature['genome_signature_code'],
+        'analysis_file': analysis_file,
+        'analysis_seconds': round(seconds, 2)
+    }
+
+
+def _analyze_genome(organism: str, accession: str, cache_dir: str, output_file: str,
+                    gene_workers: int, gene_format: str) -> Dict[str, Any]:
+    """Worker process: analyze a cached genome, save the analysis and return its summary row."""
+    started = time.perf_counter()
+    analyzer = AramIsFieldGenomeAnalyzer(workers=gene_workers, genome_cache=GenomeCache(cache_dir, offline=True))
+    genome_file = analyzer.cached_genome(organism, accession)
+    if not genome_file:
+        raise FileNotFoundError(f"{accession} is not in the genome cache")
+    analysis = analyzer.analyze_complete_genome(organism, genome_file)
+    analyzer.save_analysis(organism, output_file, gene_format)
+    return summary_row(analysis, accession, output_file, time.perf_counter() - started)
+
+
+class GenomePipeline:
+    """
+    Fetch and analyze many genomes concurrently, resuming from a manifest.
+
+    Args:
+        output_dir: Where analyses, the manifest and the summary table are written
+        genome_cache: Cache genomes are resolved through (default: GenomeCache())
+        cpus: CPU budget for analysis (default: all cores)
+        fetch_concurrency: Concurrent downloads
+        email: Email for NCBI API access
+        gene_format: Per-gene table format passed to save_analysis ('npz' or 'json')
+    """
+
+    def __init__(self, output_dir: Union[str, Path] = "data", genome_cache: Optional[GenomeCache] = None,
+                 cpus: Optional[int] = None, fetch_concurrency: int = FETCH_CONCURRENCY,
+                 email: str = "gnosisloom@research.aramis", gene_format: str = 'npz'):
+        self.output_dir = Path(output_dir)
+        self.genome_cache = genome_cache or GenomeCache()
+        self.cpus = cpus or os.cpu_count() or 1
+        self.fetch_concurrency = fetch_concurrency
+        self.email = email
+        self.gene_format = gene_format
+        self.manifest_file = self.output_dir / MANIFEST_FILE
+        self.manifest = self._load_manifest()
+
+    # ----- manifest -----
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        try:
+            with open(self.manifest_file) as f:
+                manifest = json.load(f)
+            if manifest.get('version') == MANIFEST_VERSION:
+                return manifest
+            logger.warning(f"Ignoring manifest with unknown version: {self.manifest_file}")
+        except FileNotFoundError:
+            pass
+        except json.JSONDecodeError as e:
+            logger.warning(f"Ignoring unreadable manifest {self.manifest_file}: {e}")
+        return {'version': MANIFEST_VERSION, 'genomes': {}}
+
+    def _save_manifest(self):
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.manifest_file.with_name(self.manifest_file.name + '.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp_file, self.manifest_file)
+
+    def _record(self, organism: str, accession: str, stage: str, **details):
+        genome = self.manifest['genomes'].setdefault(organism, {'accession': accession, 'stages': {}})
+        genome['accession'] = accession
+        genome['stages'][stage] = {'completed': datetime.now().isoformat(), **details}
+        genome.pop('error', None)
+        self._save_manifest()
+
+    def _record_error(self, organism: str, accession: str, stage: str, error: Exception):
+        genome = self.manifest['genomes'].setdefault(organism, {'accession': accession, 'stages': {}})
+        genome['error'] = {'stage': stage, 'message': str(error), 'time': datetime.now().isoformat()}
+        self._save_manifest()
+
+    def is_analyzed(self, organism: str, sha256: str) -> bool:
+        """Whether the manifest has a saved analysis of this exact genome content."""
+        analyzed = self.manifest['genomes'].get(organism, {}).get('stages', {}).get('analyze')
+        return bool(analyzed and analyzed.get('sha256') == sha256 and Path(analyzed['output_file']).exists())
+
+    # ----- running -----
+
+    def _fetch(self, analyzer: AramIsFieldGenomeAnalyzer, organism: str, accession: str) -> Dict[str, Any]:
+        analyzer.download_genome(organism, accession)
+        return self.genome_cache.lookup(accession)
+
+    def run(self, targets: List[Tuple[str, str]], force: bool = False) -> List[Dict[str, Any]]:
+        """
+        Fetch and analyze every (organism, accession) target.
+
+        Args:
+            targets: From resolve_targets
+            force: Re-analyze genomes the manifest already has
+
+        Returns:
+            Summary rows, in target order, for every genome analyzed now or before
+        """
+        processes = max(1, min(self.cpus, len(targets)))
+        gene_workers = max(1, self.cpus // processes)
+        logger.info(f"Pipeline: {len(targets)} genomes, {processes} analysis processes "
+                    f"x {gene_workers} gene workers, {self.fetch_concurrency} concurrent fetches")
+        fetch_analyzer = AramIsFieldGenomeAnalyzer(email=self.email, workers=1, genome_cache=self.genome_cache)
+
+        with ThreadPoolExecutor(max_workers=self.fetch_concurrency) as fetchers, \
+                ProcessPoolExecutor(max_workers=processes) as analyzers:
+            pending = {fetchers.submit(self._fetch, fetch_analyzer, organism, accession): ('fetch', organism, accession)
+                       for organism, accession in targets}
+            fetched = {}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, organism, accession = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logger.error(f"{organism} ({accession}) failed at {stage}: {e}")
+                        self._record_error(organism, accession, stage, e)
+                        continue
+
+                    if stage == 'fetch':
+                        fetched[organism] = result
+                        self._record(organism, accession, 'fetch', sha256=result['sha256'], genome_file=result['path'])
+                        if not force and self.is_analyzed(organism, result['sha256']):
+                            logger.info(f"{organism}: analysis up to date, skipping")
+                            continue
+                        output_file = str(self.output_dir / f"genomic_frequencies_{organism}.json")
+                        future = analyzers.submit(_analyze_genome, organism, accession, str(self.genome_cache.cache_dir),
+                                                  output_file, gene_workers, self.gene_format)
+                        pending[future] = ('analyze', organism, accession)
+                    else:
+                        logger.info(f"{organism}: analyzed in {result['analysis_seconds']:.1f}s")
+                        self._record(organism, accession, 'analyze', sha256=fetched[organism]['sha256'],
+                                     output_file=result['analysis_file'], summary=result)
+
+        return [self.manifest['genomes'][organism]['stages']['analyze']['summary']
+                for organism, _ in targets
+                if 'analyze' in self.manifest['genomes'].get(organism, {}).get('stages', {})]
+
+    def failures(self, targets: List[Tuple[str, str]]) -> Dict[str, Dict[str, str]]:
+        """Recorded errors for the given targets."""
+        return {organism: self.manifest['genomes'][organism]['error']
+                for organism, _ in targets
+                if 'error' in self.manifest['genomes'].get(organism, {})}
+
+    def write_summary(self, rows: List[Dict[str, Any]]) -> Tuple[Path, Path]:
+        """Write the cross-organism summary table as JSON and CSV."""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        json_file = self.output_dir / f"{SUMMARY_FILE}.json"
+        csv_file = self.output_dir / f"{SUMMARY_FILE}.csv"
+        with open(json_file, 'w') as f:
+            json.dump({'generated': datetime.now().isoformat(), 'columns': SUMMARY_COLUMNS, 'genomes': rows}, f, indent=2)
+        with open(csv_file, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=SUMMARY_COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
+        return json_file, csv_file
+
+
+def main():
+    """Main function for command-line usage."""
+    parser = argparse.ArgumentParser(description="Batch genome download and Aramis Field analysis")
+    parser.add_argument("targets", nargs="*", help="Organism names or accessions")
+    parser.add_argument("--all", action="store_true", help="Every genome in the reference collection")
+    parser.add_argument("--cpus", type=int, help="CPU budget for analysis (default: all cores)")
+    parser.add_argument("--fetch-concurrency", type=int, default=FETCH_CONCURRENCY, help="Concurrent NCBI downloads")
+    parser.add_argument("--output-dir", default="data", help="Directory for analyses, manifest and summary")
+    parser.add_argument("--cache-dir", help="Genome cache directory (default: data/genomes)")
+    parser.add_argument("--offline", action="store_true", default=None, help="Only use cached genomes")
+    parser.add_argument("--force", action="store_true", help="Re-analyze genomes already in the manifest")
+    parser.add_argument("--gene-format", choices=["npz", "json"], default="npz", help="Per-gene table format")
+    parser.add_argument("--email", default="gnosisloom@research.aramis", help="Email for NCBI API")
+
+    args = parser.parse_args()
+    names = list(REFERENCE_GENOMES) if args.all else args.targets
+    if not names:
+        parser.error("give organisms/accessions or --all")
+
+    genome_cache = GenomeCache(args.cache_dir, offline=args.offline)
+    pipeline = GenomePipeline(args.output_dir, genome_cache, cpus=args.cpus,
+                              fetch_concurrency=args.fetch_concurrency, email=args.email,
+                              gene_format=args.gene_format)
+    targets = resolve_targets(names, genome_cache)
+    rows = pipeline.run(targets, force=args.force)
+    json_file, csv_file = pipeline.write_summary(rows)
+
+    print(f"\n📊 GENOME PIPELINE SUMMARY ({len(rows)}/{len(targets)} genomes)")
+    print(f"{'Organism':<26} {'Accession':<16} {'Length (bp)':>13} {'GC':>7} {'Genes':>7} {'Primary Hz':>11}")
+    for row in rows:
+        print(f"{row['organism']:<26} {row['accession']:<16} {row['length_bp']:>13,} {row['gc_content']:>7.2%} "
+              f"{row['total_genes']:>7,} {row['primary_frequency_hz']:>11.3e}")
+    for organism, error in pipeline.failures(targets).items():
+        print(f"❌ {organism}: {error['stage']} failed - {error['message']}")
+    print(f"✅ Summary saved to {json_file} and {csv_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Genome Reader - Streaming GenBank/FASTA reader
+
+Reads genome files line by line and hands out each record's metadata and
+feature table up front, with its sequence as fixed-size byte blocks, so the
+whole sequence is never held in memory. GenBank headers (everything before
+ORIGIN) are parsed with Biopython, so features are ordinary SeqFeature objects
+with the record's true length; sequence lines are stripped of position numbers
+and whitespace and uppercased, matching str(record.seq) from SeqIO. FASTA
+sequences keep their case, as SeqIO does. Files ending in .gz are decompressed
+on the fly.
+
+A GenomeReader is a re-iterable source: every iteration reopens the file, and
+iter_chunks() yields all records' sequences back to back in fixed-size blocks,
+so it can be passed straight to the nucleotide_codec counting kernels.
+
+Author: Dr. Mordin Solus (custom research persona of Claude Code)
+Date: 2025-09-02
+Version: 1.0.0
+
+Usage:
+    reader = GenomeReader("data/genomes/ecoli_NC_000913.3.gb")
+    for record in reader.records():
+        cds = [f for f in record.features if f.type == "CDS"]
+        for block in record.iter_chunks():
+            ...
+
+    counts = count_bases(reader)        # genome-wide, constant memory
+"""
+
+import gzip
+import io
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from Bio import SeqIO
+
+from nucleotide_codec import CHUNK_SIZE, reverse_complement
+
+GENBANK_SUFFIXES = ('.gb', '.gbk', '.genbank', '.gbff')
+FASTA_SUFFIXES = ('.fasta', '.fa', '.fas', '.fna', '.ffn', '.faa')
+
+# Bytes read from the file at a time; sequence sections are processed a read at a time
+READ_SIZE = 1 << 20
+
+_WHITESPACE = b" \t\r\n\v\f"
+_GENBANK_SEQUENCE_DELETE = b"0123456789" + _WHITESPACE
+
+
+def detect_genome_format(path: Union[str, Path]) -> str:
+    """'genbank', 'fasta' or 'raw' from the file suffix (ignoring .gz)."""
+    path = Path(path)
+    suffixes = [s.lower() for s in path.suffixes]
+    if suffixes and suffixes[-1] == '.gz':
+        suffixes = suffixes[:-1]
+    suffix = suffixes[-1] if suffixes else ''
+    if suffix in GENBANK_SUFFIXES:
+        return 'genbank'
+    if suffix in FASTA_SUFFIXES:
+        return 'fasta'
+    return 'raw'
+
+
+def rechunk(pieces: Iterator[bytes], chunk_size: int) -> Iterator[bytes]:
+    """Regroup byte pieces into blocks of exactly chunk_size (the last may be shorter)."""
+    buffer = bytearray()
+    for piece in pieces:
+        buffer += piece
+        if len(buffer) >= chunk_size:
+            whole = len(buffer) // chunk_size * chunk_size
+            for start in range(0, whole, chunk_size):
+                yield bytes(buffer[start:start + chunk_size])
+            del buffer[:whole]
+    if buffer:
+        yield bytes(buffer)
+
+
+class StreamedRecord:
+    """
+    One record's metadata plus a one-shot stream of its sequence.
+
+    Attributes:
+        id, name, description: Record identifiers as SeqIO reports them
+        length: Sequence length (from LOCUS for GenBank; set after streaming otherwise)
+        features: SeqFeature list (GenBank only)
+        annotations: Record annotations (GenBank only)
+    """
+
+    def __init__(self, id: str, name: str, description: str, length: Optional[int],
+                 pieces: Iterator[bytes], features: Optional[List] = None,
+                 annotations: Optional[Dict[str, Any]] = None):
+        self.id = id
+        self.name = name
+        self.description = description
+        self.length = length
+        self.features = features or []
+        self.annotations = annotations or {}
+        self._pieces = pieces
+        self._consumed = False
+
+    def __repr__(self) -> str:
+        return f"StreamedRecord(id={self.id!r}, length={self.length}, features={len(self.features)})"
+
+    def _counted(self) -> Iterator[bytes]:
+        length = 0
+        for piece in self._pieces:
+            length += len(piece)
+            yield piece
+        self.length = length
+
+    def iter_pieces(self) -> Iterator[bytes]:
+        """Sequence as it is read (one piece per line); can be consumed once."""
+        if self._consumed:
+            raise ValueError(f"Sequence of {self.id} has already been read")
+        self._consumed = True
+        return self._counted()
+
+    def iter_chunks(self, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """Sequence in fixed-size blocks; can be consumed once."""
+        return rechunk(self.iter_pieces(), chunk_size)
+
+    def read_region(self, start: int, end: int) -> bytes:
+        """
+        Read the sequence up to end and keep only [start, end). Consumes the stream;
+        memory is bounded by the region, not the record.
+        """
+        region = bytearray()
+        position = 0
+        for piece in self.iter_pieces():
+            piece_end = position + len(piece)
+            if piece_end > start:
+                region += piece[max(start - position, 0):end - position]
+            position = piece_end
+            if position >= end:
+                break
+        return bytes(region)
+
+    def skip(self):
+        """Read past any unconsumed sequence."""
+        if not self._consumed:
+            for _ in self.iter_pieces():
+                pass
+        else:
+            for _ in self._pieces:
+                pass
+
+
+def extract_location(location, region: bytes, offset: int = 0) -> bytes:
+    """
+    Sequence of a feature location from a region read with read_region, the way
+    SeqFeature.extract joins parts and reverse-complements minus-strand parts.
+
+    Args:
+        location: SimpleLocation or CompoundLocation
+        region: Sequence bytes starting at offset
+        offset: Record position of region[0]
+    """
+    parts = []
+    for part in location.parts:
+        sequence = region[int(part.start) - offset:int(part.end) - offset]
+        parts.append(reverse_complement(sequence) if part.strand == -1 else sequence)
+    return b"".join(parts)
+
+
+class GenomeReader:
+    """
+    Streaming reader over a GenBank, FASTA or raw sequence file.
+
+    Args:
+        path: Genome file (optionally gzip-compressed)
+        format: 'genbank', 'fasta' or 'raw' (default: from the suffix)
+    """
+
+    def __init__(self, path: Union[str, Path], format: Optional[str] = None):
+        self.path = Path(path)
+        self.format = format or detect_genome_format(self.path)
+        if self.format not in ('genbank', 'fasta', 'raw'):
+            raise ValueError(f"Unsupported genome format: {self.format}")
+        self._length: Optional[int] = None
+
+    def __repr__(self) -> str:
+        return f"GenomeReader('{self.path}', format={self.format!r})"
+
+    def __len__(self) -> int:
+        """Total sequence length (one counting pass the first time, unless already streamed)."""
+        if self._length is None:
+            self._length = sum(len(chunk) for chunk in self.iter_chunks())
+        return self._length
+
+    def _open(self):
+        if self.path.suffix.lower() == '.gz':
+            return gzip.open(self.path, 'rb')
+        return open(self.path, 'rb')
+
+    def records(self) -> Iterator[StreamedRecord]:
+        """
+        Yield records in file order. Each record's sequence must be read before
+        moving to the next one, or it is skipped.
+        """
+        with self._open() as handle:
+            lines = _BufferedLines(handle)
+            parse = {'genbank': self._genbank_records, 'fasta': self._fasta_records,
+                     'raw': self._raw_records}[self.format]
+            for record in parse(lines):
+                yield record
+                record.skip()
+
+    def iter_chunks(self, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """All records' sequences concatenated, in fixed-size blocks."""
+        length = 0
+
+        def pieces():
+            nonlocal length
+            for record in self.records():
+                for piece in record.iter_pieces():
+                    length += len(piece)
+                    yield piece
+
+        yield from rechunk(pieces(), chunk_size)
+        self._length = length
+
+    # ----- format parsers -----
+
+    def _genbank_records(self, lines: '_BufferedLines') -> Iterator[StreamedRecord]:
+        while True:
+            header = []
+            for line in lines:
+                if line.startswith(b'LOCUS') or header:
+                    header.append(line)
+                if header and (line.startswith(b'ORIGIN') or line.startswith(b'//')):
+                    break
+            if not header:
+                return
+            has_sequence = header[-1].startswith(b'ORIGIN')
+            text = b''.join(header[:-1]).decode('utf-8', 'replace') + "ORIGIN\n//\n"
+            parsed = SeqIO.read(io.StringIO(text), 'genbank')
+            pieces = self._genbank_sequence(lines) if has_sequence else iter(())
+            yield StreamedRecord(parsed.id, parsed.name, parsed.description, len(parsed.seq), pieces,
+                                 features=parsed.features, annotations=parsed.annotations)
+
+    @staticmethod
+    def _genbank_sequence(lines: '_BufferedLines') -> Iterator[bytes]:
+        for block in lines.blocks_until(b'//'):
+            yield block.translate(None, _GENBANK_SEQUENCE_DELETE).upper()
+        next(lines, None)  # the // terminator
+
+    def _fasta_records(self, lines: '_BufferedLines') -> Iterator[StreamedRecord]:
+        for line in lines:
+            if not line.startswith(b'>'):
+                continue
+            title = line[1:].strip().decode('utf-8', 'replace')
+            record_id = title.split(None, 1)[0] if title else ''
+            yield StreamedRecord(record_id, record_id, title, None, self._fasta_sequence(lines))
+
+    @staticmethod
+    def _fasta_sequence(lines: '_BufferedLines') -> Iterator[bytes]:
+        for block in lines.blocks_until(b'>'):
+            yield block.translate(None, _WHITESPACE)
+
+    def _raw_records(self, lines: '_BufferedLines') -> Iterator[StreamedRecord]:
+        yield StreamedRecord(self.path.stem, self.path.stem, '', None, self._raw_sequence(lines))
+
+    @staticmethod
+    def _raw_sequence(lines: '_BufferedLines') -> Iterator[bytes]:
+        # Same as file.read().strip(): drop leading whitespace, and hold back trailing
+        # whitespace until more sequence follows it
+        started = False
+        trailing = b''
+        for block in lines.blocks_until(None):
+            if not started:
+                block = block.lstrip(_WHITESPACE)
+                if not block:
+                    continue
+                started = True
+            body = block.rstrip(_WHITESPACE)
+            if body:
+                yield trailing + body
+                trailing = block[len(body):]
+            else:
+                trailing += block
+
+
+class _BufferedLines:
+    """
+    Buffered reader over a binary handle: iterate it for lines, or take everything
+    up to the next line starting with a marker in large blocks.
+    """
+
+    def __init__(self, handle):
+        self._handle = handle
+        self._buffer = b""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        data = self._handle.read(READ_SIZE)
+        if not data:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + data
+        self._pos = 0
+        return True
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> bytes:
+        while True:
+            end = self._buffer.find(b"\n", self._pos)
+            if end >= 0:
+                line = self._buffer[self._pos:end + 1]
+                self._pos = end + 1
+                return line
+            if not self._fill():
+                if self._pos < len(self._buffer):
+                    line = self._buffer[self._pos:]
+                    self._pos = len(self._buffer)
+                    return line
+                raise StopIteration
+
+    def blocks_until(self, marker: Optional[bytes]) -> Iterator[bytes]:
+        """
+        Yield data from the current line start up to (not including) the next line
+        beginning with marker, or to the end of the file if marker is None.
+        """
+        width = len(marker) if marker else 0
+        at_line_start = True
+        while True:
+            while len(self._buffer) - self._pos < width and self._fill():
+                pass
+            if marker and at_line_start and self._buffer.startswith(marker, self._pos):
+                return
+            found = self._buffer.find(b"\n" + marker, self._pos) if marker else -1
+            if found >= 0:
+                yield self._buffer[self._pos:found + 1]
+                self._pos = found + 1
+                return
+            # Keep back enough bytes to see a marker split across reads
+            safe = len(self._buffer) - width
+            if safe > self._pos:
+                block = self._buffer[self._pos:safe]
+                self._pos = safe
+                at_line_start = block.endswith(b"\n")
+                yield block
+            if not self._fill():
+                if self._pos < len(self._buffer):
+                    block = self._buffer[self._pos:]
+                    self._pos = len(self._buffer)
+                    yield block
+                return
@@ -18,18 +18,94 @@ import json
 import numpy as np
 from Bio import Entrez, SeqIO
 from Bio.Seq import Seq
-from Bio.SeqUtils import gc_fraction as GC
 import hashlib
 import os
 from datetime import datetime
 from typing import Dict, List, Tuple, Optional
 import argparse
 import logging
+from concurrent.futures import ProcessPoolExecutor
+
+from nucleotide_codec import (count_bases, count_codons, count_sequence_batch, reverse_complement,
+                              sequence_digest, CODONS, N_CODE)
+from packed_genome import PackedGenome, PackedGenomeWriter, packed_genome_path
+from genome_reader import GenomeReader
+from genome_cache import GenomeCache
+from gene_table import split_analysis
+from kmer_spectrum import KmerSpectrum, count_kmers, kmer_spectrum_path
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Genes per task sent to a worker, and the CDS count at which gene analysis goes parallel by default
+GENE_BATCH_SIZE = 1024
+PARALLEL_GENE_THRESHOLD = 2000
+
+# Predefined high-quality reference genomes - TEMPORAL DIVERSITY COLLECTION
+# Spanning 3.5 billion years of evolution for maximum resonance pattern discovery
+REFERENCE_GENOMES = {
+    # ARCHAEA - 3.5 billion years ago
+    'pyrococcus': 'NC_003413.1',  # Pyrococcus furiosus - hyperthermophile extremophile
+
+    # BACTERIA - 3.0 billion years ago
+    'ecoli': 'NC_000913.3',  # E. coli K-12 MG1655 - model organism
+
+    # FUNGI - 1.5 billion years ago
+    'neurospora': 'NC_026499.1',  # Neurospora crassa - filamentous fungi
+
+    # SIMPLE EUKARYOTES - 1.0 billion years ago
+    'yeast': 'NC_001133.9',  # S. cerevisiae chromosome I
+
+    # ANCIENT ANIMALS - 600 million years ago
+    'sponge': 'GCF_000090795.2',  # Amphimedon queenslandica - first animal nervous system
+
+    # ANCIENT PLANTS - 450 million years ago
+    'liverwort_chloroplast': 'NC_037507.1',  # Marchantia polymorpha chloroplast
+    'liverwort_mitochondrial': 'NC_037508.1',  # Marchantia polymorpha mitochondrial
+
+    # NEURAL COMPLEXITY REVOLUTION - 500 million years ago
+    'octopus_mitochondrial': 'NC_029723.1',  # Octopus bimaculoides mitochondrial
+    'octopus': 'GCF_001194135.2',  # Octopus bimaculoides nuclear - RNA editing mastery
+
+    # VERTEBRATE COMPLEXITY - Phase 1B Strategic Expansion
+    'human_chr1': 'NC_000001.11',  # Homo sapiens chromosome 1 - largest human chromosome
+    'human_chr21': 'NC_000021.9',  # Homo sapiens chromosome 21 - smaller, gene-dense
+    'human_chrX': 'NC_000023.11',  # Homo sapiens chromosome X - sex chromosome
+    'human_chrY': 'NC_000024.10',  # Homo sapiens chromosome Y - male-specific
+    'human_mt': 'NC_012920.1',     # Homo sapiens mitochondrial - maternal inheritance
+
+    # LEGACY - keeping for compatibility
+    'celegans': 'NC_003279.8',  # C. elegans chromosome I
+    'drosophila': 'NC_004354.4'  # D. melanogaster chromosome X
+}
+
+# Packed genome shared with gene analysis workers (memory-mapped once per worker by the pool initializer)
+_worker_genome: Optional[PackedGenome] = None
+
+
+def _init_gene_worker(packed_file: str):
+    global _worker_genome
+    _worker_genome = PackedGenome(packed_file)
+
+
+def _count_gene_batch(batch: List[List[Tuple[int, int, Optional[int]]]], genome: Optional[PackedGenome] = None):
+    """
+    Extract and count a batch of genes given as location parts (start, end, strand).
+    
+    Returns:
+        (base_counts, codon_counts, signature_hashes) for the batch
+    """
+    genome = _worker_genome if genome is None else genome
+    genes = [
+        b"".join(reverse_complement(genome.fetch(start, end)) if strand == -1 else genome.fetch(start, end)
+                 for start, end, strand in parts)
+        for parts in batch
+    ]
+    base_counts, codon_counts = count_sequence_batch(genes)
+    return base_counts, codon_counts, [hashlib.md5(gene).hexdigest()[:6].upper() for gene in genes]
+
+
 class AramIsFieldGenomeAnalyzer:
     """
     Main class for analyzing genomes through the Aramis Field frequency framework.
@@ -38,14 +114,19 @@ class AramIsFieldGenomeAnalyzer:
     the broader GnosisLoom biofrequency database system.
     """
     
-    def __init__(self, email: str = "gnosisloom@research.aramis"):
+    def __init__(self, email: str = "gnosisloom@research.aramis", workers: Optional[int] = None,
+                 genome_cache: Optional[GenomeCache] = None):
         """
         Initialize the genome analyzer.
         
         Args:
             email: Email for NCBI API access (required by NCBI guidelines)
+            workers: Processes for per-gene analysis (default: all cores for large genomes)
+            genome_cache: Cache that genomes are resolved through (default: GenomeCache())
         """
         self.email = email
+        self.workers = workers
+        self.genome_cache = genome_cache or GenomeCache()
         Entrez.email = email
         
         # Aramis Field frequency constants
@@ -59,10 +140,12 @@ class AramIsFieldGenomeAnalyzer:
         
         # Codon to amino acid frequency mappings
         self.CODON_FREQUENCIES = self._initialize_codon_frequencies()
+        self._build_codon_tables()
         
         # Storage for analysis results
         self.genome_data = {}
         self.frequency_signatures = {}
+        self.kmer_spectra = {}
         
     def _initialize_codon_frequencies(self) -> Dict[str, float]:
         """Initialize the 64 codon frequency signatures."""
@@ -109,9 +192,16 @@ class AramIsFieldGenomeAnalyzer:
         
         return codons
     
+    def _build_codon_tables(self):
+        """Index CODON_FREQUENCIES by 2-bit codon index (see nucleotide_codec.CODONS)."""
+        self.codon_frequency_table = np.array([self.CODON_FREQUENCIES[codon]['frequency_hz'] for codon in CODONS])
+        self.amino_acids = sorted({data['amino_acid'] for data in self.CODON_FREQUENCIES.values()})
+        self.codon_amino_acid_table = np.array([self.amino_acids.index(self.CODON_FREQUENCIES[codon]['amino_acid'])
+                                                for codon in CODONS])
+    
     def download_genome(self, organism: str, accession: Optional[str] = None) -> str:
         """
-        Download complete genome from NCBI.
+        Download complete genome from NCBI, or take it from the local genome cache.
         
         Args:
             organism: Organism name (e.g., 'ecoli', 'yeast')
@@ -119,133 +209,123 @@ class AramIsFieldGenomeAnalyzer:
             
         Returns:
             Filename of downloaded genome
+            
+        Raises:
+            GenomeCacheMiss: The genome is not cached and the cache is offline
         """
         logger.info(f"Downloading genome for {organism}")
         
-        # Predefined high-quality reference genomes - TEMPORAL DIVERSITY COLLECTION
-        # Spanning 3.5 billion years of evolution for maximum resonance pattern discovery
-        reference_genomes = {
-            # ARCHAEA - 3.5 billion years ago
-            'pyrococcus': 'NC_003413.1',  # Pyrococcus furiosus - hyperthermophile extremophile
-            
-            # BACTERIA - 3.0 billion years ago  
-            'ecoli': 'NC_000913.3',  # E. coli K-12 MG1655 - model organism
-            
-            # FUNGI - 1.5 billion years ago
-            'neurospora': 'NC_026499.1',  # Neurospora crassa - filamentous fungi
-            
-            # SIMPLE EUKARYOTES - 1.0 billion years ago
-            'yeast': 'NC_001133.9',  # S. cerevisiae chromosome I
-            
-            # ANCIENT ANIMALS - 600 million years ago
-            'sponge': 'GCF_000090795.2',  # Amphimedon queenslandica - first animal nervous system
-            
-            # ANCIENT PLANTS - 450 million years ago  
-            'liverwort_chloroplast': 'NC_037507.1',  # Marchantia polymorpha chloroplast
-            'liverwort_mitochondrial': 'NC_037508.1',  # Marchantia polymorpha mitochondrial
-            
-            # NEURAL COMPLEXITY REVOLUTION - 500 million years ago
-            'octopus_mitochondrial': 'NC_029723.1',  # Octopus bimaculoides mitochondrial
-            'octopus': 'GCF_001194135.2',  # Octopus bimaculoides nuclear - RNA editing mastery
-            
-            # VERTEBRATE COMPLEXITY - Phase 1B Strategic Expansion
-            'human_chr1': 'NC_000001.11',  # Homo sapiens chromosome 1 - largest human chromosome
-            'human_chr21': 'NC_000021.9',  # Homo sapiens chromosome 21 - smaller, gene-dense
-            'human_chrX': 'NC_000023.11',  # Homo sapiens chromosome X - sex chromosome
-            'human_chrY': 'NC_000024.10',  # Homo sapiens chromosome Y - male-specific
-            'human_mt': 'NC_012920.1',     # Homo sapiens mitochondrial - maternal inheritance
-            
-            # LEGACY - keeping for compatibility
-            'celegans': 'NC_003279.8',  # C. elegans chromosome I
-            'drosophila': 'NC_004354.4'  # D. melanogaster chromosome X
-        }
-        
-        if not accession and organism in reference_genomes:
-            accession = reference_genomes[organism]
+        if not accession and organism in REFERENCE_GENOMES:
+            accession = REFERENCE_GENOMES[organism]
         
         if not accession:
             raise ValueError(f"No reference genome found for {organism}. Please provide accession number.")
         
         try:
-            # Handle assembly accessions (GCF_) vs sequence accessions (NC_) differently
-            if accession.startswith('GCF_'):
-                logger.info(f"Assembly accession detected: {accession}")
-                logger.warning(f"Assembly-level downloads not yet implemented for {accession}")
-                logger.info(f"Please use individual chromosome/scaffold NC_ accessions")
-                raise ValueError(f"Assembly accession {accession} requires special handling - not yet implemented")
+            entry = self.genome_cache.fetch(accession, lambda: self._fetch_genbank_record(accession), organism)
+            self._load_cache_entry(organism, entry)
+            return entry['path']
             
-            # Standard sequence download for NC_ accessions
-            logger.info(f"Downloading GenBank record with annotations for {accession}")
-            handle = Entrez.efetch(db="nucleotide", id=accession, rettype="gb", retmode="text")
+        except Exception as e:
+            logger.error(f"Error downloading genome: {e}")
+            raise
+    
+    def _fetch_genbank_record(self, accession: str):
+        """Fetch an annotated GenBank record from NCBI Entrez."""
+        # Handle assembly accessions (GCF_) vs sequence accessions (NC_) differently
+        if accession.startswith('GCF_'):
+            logger.info(f"Assembly accession detected: {accession}")
+            logger.warning(f"Assembly-level downloads not yet implemented for {accession}")
+            logger.info(f"Please use individual chromosome/scaffold NC_ accessions")
+            raise ValueError(f"Assembly accession {accession} requires special handling - not yet implemented")
+        
+        # Standard sequence download for NC_ accessions
+        logger.info(f"Downloading GenBank record with annotations for {accession}")
+        handle = Entrez.efetch(db="nucleotide", id=accession, rettype="gb", retmode="text")
+        record = SeqIO.read(handle, "genbank")
+        handle.close()
+        
+        # Verify we got CDS features
+        cds_count = len([f for f in record.features if f.type == "CDS"])
+        gene_count = len([f for f in record.features if f.type == "gene"])
+        logger.info(f"Downloaded record has {len(record.features)} features ({cds_count} CDS, {gene_count} genes)")
+        
+        if cds_count == 0:
+            logger.warning(f"No CDS features found in {accession} - may be sequence-only record")
+            logger.info("Attempting to download from RefSeq with feature annotations...")
+            
+            # Try RefSeq-specific download
+            handle = Entrez.efetch(db="nuccore", id=accession, rettype="gbwithparts", retmode="text")
             record = SeqIO.read(handle, "genbank")
             handle.close()
             
-            # Verify we got CDS features
             cds_count = len([f for f in record.features if f.type == "CDS"])
-            gene_count = len([f for f in record.features if f.type == "gene"])
-            logger.info(f"Downloaded record has {len(record.features)} features ({cds_count} CDS, {gene_count} genes)")
-            
-            if cds_count == 0:
-                logger.warning(f"No CDS features found in {accession} - may be sequence-only record")
-                logger.info("Attempting to download from RefSeq with feature annotations...")
-                
-                # Try RefSeq-specific download
-                handle = Entrez.efetch(db="nuccore", id=accession, rettype="gbwithparts", retmode="text")
-                record = SeqIO.read(handle, "genbank")
-                handle.close()
-                
-                cds_count = len([f for f in record.features if f.type == "CDS"])
-                logger.info(f"RefSeq download resulted in {cds_count} CDS features")
-            
-            # Save to file
-            filename = f"data/genomes/{organism}_{accession}.gb"
-            os.makedirs(os.path.dirname(filename), exist_ok=True)
-            
-            with open(filename, "w") as output_file:
-                SeqIO.write(record, output_file, "genbank")
-            
-            logger.info(f"Successfully downloaded {organism} genome to {filename}")
-            logger.info(f"Genome length: {len(record.seq):,} base pairs")
-            
-            # Store basic genome info
-            seq_str = str(record.seq) if hasattr(record.seq, '__str__') else ""
-            self.genome_data[organism] = {
-                'accession': accession,
-                'filename': filename,
-                'length': len(record.seq),
-                'sequence': seq_str,
-                'gc_content': GC(record.seq) if seq_str else 0,
-                'description': record.description,
-                'download_date': datetime.now().isoformat()
-            }
-            
-            return filename
+            logger.info(f"RefSeq download resulted in {cds_count} CDS features")
+        
+        logger.info(f"Genome length: {len(record.seq):,} base pairs")
+        return record
+    
+    def _load_cache_entry(self, organism: str, entry: Dict[str, any]):
+        """Store basic genome info for a genome cache entry."""
+        sequence = self.genome_cache.packed(entry['accession'])
+        self.genome_data[organism] = {
+            'accession': entry['accession'],
+            'filename': entry['path'],
+            'length': entry['length'],
+            # Memory-mapped 2-bit store rather than a Python string
+            'sequence': sequence,
+            'packed_file': str(sequence.path),
+            'gc_content': entry['gc_content'],
+            'description': entry['description'],
+            'sha256': entry['sha256'],
+            'download_date': entry['added']
+        }
+        logger.info(f"{organism} genome ready at {entry['path']} ({entry['length']:,} bp)")
+    
+    def cached_genome(self, organism: str, accession: Optional[str] = None) -> Optional[str]:
+        """
+        Genome file for an organism from the local genome cache, without downloading.
+        
+        Args:
+            organism: Organism name (e.g., 'ecoli', 'yeast')
+            accession: Specific accession number (default: the organism's reference genome)
             
-        except Exception as e:
-            logger.error(f"Error downloading genome: {e}")
-            raise
+        Returns:
+            Filename of the cached genome, or None if it is not cached
+        """
+        accession = accession or REFERENCE_GENOMES.get(organism)
+        entry = self.genome_cache.lookup(accession) if accession else None
+        if not entry:
+            return None
+        self._load_cache_entry(organism, entry)
+        return entry['path']
     
-    def calculate_nucleotide_frequencies(self, sequence: str) -> Dict[str, any]:
+    def calculate_nucleotide_frequencies(self, sequence: str, include_signature: bool = True) -> Dict[str, any]:
         """
         Calculate frequency signatures for nucleotide composition.
         
+        Bases are counted vectorized (byte lookup table + bincount, case-insensitive)
+        and the signature hash is computed over the same chunks in one pass.
+        
         Args:
-            sequence: DNA sequence string
+            sequence: DNA sequence as str, bytes-like or uint8 array
+            include_signature: Compute the MD5-based aramis_signature (None if False)
             
         Returns:
             Dictionary with nucleotide frequency analysis
         """
         logger.info("Calculating nucleotide frequencies")
         
-        # Count nucleotides
-        counts = {'A': 0, 'T': 0, 'G': 0, 'C': 0, 'N': 0}
-        for base in sequence.upper():
-            if base in counts:
-                counts[base] += 1
-            else:
-                counts['N'] += 1
+        # Count nucleotides (anything other than A/C/G/T counts as N)
+        digest = hashlib.md5() if include_signature else None
+        code_counts = count_bases(sequence, digest=digest)
+        counts = {
+            'A': int(code_counts[0]), 'T': int(code_counts[3]),
+            'G': int(code_counts[2]), 'C': int(code_counts[1]),
+            'N': int(code_counts[N_CODE])
+        }
         
-        total_bases = len(sequence) - counts['N']  # Exclude N's
+        total_bases = int(code_counts[:N_CODE].sum())  # Exclude N's
         
         # Calculate proportions
         proportions = {base: count/total_bases for base, count in counts.items() if base != 'N'}
@@ -272,34 +352,28 @@ class AramIsFieldGenomeAnalyzer:
             'at_content': proportions['A'] + proportions['T'], 
             'genome_base_frequency_hz': genome_frequency,
             'frequency_harmonics': frequency_harmonics,
-            'aramis_signature': f"GENOME-NUC-{hashlib.md5(sequence.encode()).hexdigest()[:8].upper()}"
+            'aramis_signature': f"GENOME-NUC-{digest.hexdigest()[:8].upper()}" if digest else None
         }
     
-    def calculate_codon_frequencies(self, sequence: str) -> Dict[str, any]:
+    def calculate_codon_frequencies(self, sequence: str, all_frames: bool = False) -> Dict[str, any]:
         """
         Calculate frequency signatures for codon usage patterns.
         
         Args:
             sequence: DNA sequence string
+            all_frames: Also report codon counts for all six reading frames
             
         Returns:
-            Dictionary with codon frequency analysis
+            Dictionary with codon frequency analysis (reading frame 1)
         """
         logger.info("Calculating codon frequencies")
         
-        sequence = sequence.upper()
-        codon_counts = {}
-        codon_frequencies = []
-        
-        # Count codons (reading frame 1)
-        for i in range(0, len(sequence) - 2, 3):
-            codon = sequence[i:i+3]
-            if len(codon) == 3 and all(base in 'ATGC' for base in codon):
-                codon_counts[codon] = codon_counts.get(codon, 0) + 1
-                if codon in self.CODON_FREQUENCIES:
-                    codon_frequencies.append(self.CODON_FREQUENCIES[codon]['frequency_hz'])
+        # Count codons (reading frame 1), keyed in order of first occurrence
+        codon_table = count_codons(sequence, all_frames=all_frames)
+        counts = codon_table.frame(1)
+        codon_counts = {CODONS[index]: int(counts[index]) for index in codon_table.first_seen_order()}
         
-        total_codons = sum(codon_counts.values())
+        total_codons = int(counts.sum())
         
         # Calculate codon usage proportions
         codon_proportions = {codon: count/total_codons for codon, count in codon_counts.items()}
@@ -311,22 +385,22 @@ class AramIsFieldGenomeAnalyzer:
         )
         
         # Amino acid frequency distribution
+        aa_counts = np.bincount(self.codon_amino_acid_table, weights=counts, minlength=len(self.amino_acids))
+        aa_totals = np.bincount(self.codon_amino_acid_table, weights=counts * self.codon_frequency_table,
+                                minlength=len(self.amino_acids))
         aa_frequencies = {}
-        for codon, count in codon_counts.items():
-            if codon in self.CODON_FREQUENCIES:
-                aa = self.CODON_FREQUENCIES[codon]['amino_acid']
-                aa_freq = self.CODON_FREQUENCIES[codon]['frequency_hz']
-                if aa not in aa_frequencies:
-                    aa_frequencies[aa] = {'count': 0, 'total_frequency': 0.0}
-                aa_frequencies[aa]['count'] += count
-                aa_frequencies[aa]['total_frequency'] += aa_freq * count
+        for codon in codon_counts:
+            aa = self.CODON_FREQUENCIES[codon]['amino_acid']
+            if aa not in aa_frequencies:
+                aa_index = self.amino_acids.index(aa)
+                aa_frequencies[aa] = {'count': int(aa_counts[aa_index]), 'total_frequency': float(aa_totals[aa_index])}
         
         # Normalize amino acid frequencies
         for aa, data in aa_frequencies.items():
             data['average_frequency'] = data['total_frequency'] / data['count'] if data['count'] > 0 else 0
             data['proportion'] = data['count'] / total_codons
         
-        return {
+        result = {
             'codon_counts': codon_counts,
             'codon_proportions': codon_proportions,
             'total_codons': total_codons,
@@ -335,13 +409,45 @@ class AramIsFieldGenomeAnalyzer:
             'unique_codons': len(codon_counts),
             'aramis_signature': f"GENOME-COD-{hashlib.md5(str(codon_counts).encode()).hexdigest()[:8].upper()}"
         }
+        
+        if all_frames:
+            result['reading_frames'] = {
+                f"{frame:+d}": {CODONS[index]: int(count) for index, count in enumerate(codon_table.frame(frame)) if count}
+                for frame in (1, 2, 3, -1, -2, -3)
+            }
+        
+        return result
+    
+    def _packed_genome(self, genome_file: str) -> PackedGenome:
+        """
+        Packed store next to a genome file, packed in one streaming pass if it is
+        missing or older than the file.
+        """
+        packed_file = packed_genome_path(genome_file)
+        if not packed_file.exists() or os.path.getmtime(packed_file) < os.path.getmtime(genome_file):
+            logger.info(f"Packing {genome_file} to {packed_file}")
+            with PackedGenomeWriter(packed_file) as writer:
+                for record in GenomeReader(genome_file, 'genbank').records():
+                    writer.begin_contig(record.id, description=record.description)
+                    for chunk in record.iter_chunks():
+                        writer.write(chunk)
+                writer.close()
+        return PackedGenome(packed_file)
     
-    def analyze_gene_frequencies(self, genome_file: str) -> Dict[str, any]:
+    def analyze_gene_frequencies(self, genome_file: str, workers: Optional[int] = None,
+                                 genome: Optional[PackedGenome] = None) -> Dict[str, any]:
         """
         Analyze frequency signatures of individual genes.
         
+        CDS coordinates are collected from the record headers (the sequence lines
+        are streamed past, never parsed), and genes are sliced from the packed
+        genome and counted in batches, fanned out to a process pool when there are
+        enough of them.
+        
         Args:
             genome_file: Path to genome file
+            workers: Worker processes (overrides the analyzer setting; 1 runs in-process)
+            genome: Packed store of genome_file (default: the one next to the file)
             
         Returns:
             Dictionary with gene frequency analysis
@@ -349,45 +455,58 @@ class AramIsFieldGenomeAnalyzer:
         logger.info("Analyzing individual gene frequencies")
         
         try:
-            record = SeqIO.read(genome_file, "genbank")
+            genome = genome if genome is not None else self._packed_genome(genome_file)
             
-            gene_frequencies = {}
+            gene_info = []
+            gene_parts = []
             gene_count = 0
+            offset = 0
             
-            for feature in record.features:
-                if feature.type == "CDS":  # Coding sequences
-                    gene_count += 1
-                    
-                    # Extract gene information
-                    gene_id = None
-                    gene_name = None
-                    if 'locus_tag' in feature.qualifiers:
-                        gene_id = feature.qualifiers['locus_tag'][0]
-                    if 'gene' in feature.qualifiers:
-                        gene_name = feature.qualifiers['gene'][0]
-                    
-                    if not gene_id:
-                        gene_id = f"gene_{gene_count:04d}"
-                    
-                    # Extract gene sequence
-                    gene_seq = feature.extract(record.seq)
-                    gene_sequence = str(gene_seq)
-                    
-                    # Calculate gene-specific frequencies
-                    if len(gene_sequence) >= 3:  # Must be at least one codon
-                        nuc_freq = self.calculate_nucleotide_frequencies(gene_sequence)
-                        codon_freq = self.calculate_codon_frequencies(gene_sequence)
+            # Records are laid out back to back in the packed genome, in file order
+            for record in GenomeReader(genome_file, 'genbank').records():
+                for feature in record.features:
+                    if feature.type == "CDS":  # Coding sequences
+                        gene_count += 1
+                        
+                        # Extract gene information
+                        gene_id = None
+                        gene_name = None
+                        if 'locus_tag' in feature.qualifiers:
+                            gene_id = feature.qualifiers['locus_tag'][0]
+                        if 'gene' in feature.qualifiers:
+                            gene_name = feature.qualifiers['gene'][0]
+                        
+                        if not gene_id:
+                            gene_id = f"gene_{gene_count:04d}"
+                        
+                        # Gene coordinates (joined parts, reverse-complemented on the minus strand)
+                        parts = [(offset + int(part.start), offset + int(part.end), part.strand)
+                                 for part in feature.location.parts]
+                        length = sum(end - start for start, end, _ in parts)
                         
-                        gene_frequencies[gene_id] = {
-                            'gene_name': gene_name,
-                            'length': len(gene_sequence),
-                            'location': f"{feature.location.start}-{feature.location.end}",
-                            'strand': feature.location.strand,
-                            'nucleotide_frequency': nuc_freq['genome_base_frequency_hz'],
-                            'codon_frequency': codon_freq['weighted_codon_frequency_hz'],
-                            'gc_content': nuc_freq['gc_content'],
-                            'gene_signature': f"GENE-{gene_id}-{hashlib.md5(gene_sequence.encode()).hexdigest()[:6].upper()}"
-                        }
+                        if length >= 3:  # Must be at least one codon
+                            gene_info.append((gene_id, gene_name, length,
+                                              f"{feature.location.start}-{feature.location.end}",
+                                              feature.location.strand))
+                            gene_parts.append(parts)
+                offset += record.length
+            
+            base_counts, codon_counts, signatures = self._count_genes(genome, gene_parts, workers)
+            nucleotide_freqs, gc_contents = self._gene_nucleotide_frequencies(base_counts)
+            codon_freqs = self._gene_codon_frequencies(codon_counts)
+            
+            gene_frequencies = {}
+            for i, (gene_id, gene_name, length, location, strand) in enumerate(gene_info):
+                gene_frequencies[gene_id] = {
+                    'gene_name': gene_name,
+                    'length': length,
+                    'location': location,
+                    'strand': strand,
+                    'nucleotide_frequency': nucleotide_freqs[i],
+                    'codon_frequency': codon_freqs[i],
+                    'gc_content': gc_contents[i],
+                    'gene_signature': f"GENE-{gene_id}-{signatures[i]}"
+                }
             
             # Calculate genome-wide gene frequency statistics
             all_gene_nuc_freqs = [gene['nucleotide_frequency'] for gene in gene_frequencies.values()]
@@ -416,6 +535,59 @@ class AramIsFieldGenomeAnalyzer:
             logger.error(f"Error analyzing gene frequencies: {e}")
             return {'individual_genes': {}, 'genome_statistics': {}}
     
+    def _count_genes(self, genome: PackedGenome, gene_parts: List[List[Tuple[int, int, Optional[int]]]],
+                     workers: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+        """
+        Count bases and codons for every gene, in batches across a process pool.
+        Workers memory-map the packed genome themselves rather than receiving it.
+        
+        Returns:
+            (base_counts (n, 5), codon_counts (n, 64), signature hashes)
+        """
+        workers = workers or self.workers
+        if workers is None:
+            workers = (os.cpu_count() or 1) if len(gene_parts) >= PARALLEL_GENE_THRESHOLD else 1
+        batches = [gene_parts[i:i + GENE_BATCH_SIZE] for i in range(0, len(gene_parts), GENE_BATCH_SIZE)]
+        workers = min(workers, len(batches))
+        
+        if not batches:
+            return np.zeros((0, N_CODE + 1), dtype=np.int64), np.zeros((0, 64), dtype=np.int64), []
+        
+        if workers > 1:
+            logger.info(f"Counting {len(gene_parts)} genes in {len(batches)} batches across {workers} workers")
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_gene_worker,
+                                     initargs=(str(genome.path),)) as pool:
+                results = list(pool.map(_count_gene_batch, batches))
+        else:
+            results = [_count_gene_batch(batch, genome) for batch in batches]
+        
+        return (np.concatenate([r[0] for r in results]),
+                np.concatenate([r[1] for r in results]),
+                [signature for r in results for signature in r[2]])
+    
+    def _gene_nucleotide_frequencies(self, base_counts: np.ndarray) -> Tuple[List[float], List[float]]:
+        """Per-gene base frequency and GC content, as in calculate_nucleotide_frequencies."""
+        totals = base_counts[:, :N_CODE].sum(axis=1)
+        proportions = {
+            base: np.divide(base_counts[:, code], totals, out=np.zeros(len(totals)), where=totals > 0)
+            for code, base in enumerate('ACGT')
+        }
+        # Accumulate in the same order as the scalar version so results match bit for bit
+        frequencies = np.zeros(len(totals))
+        for base in ['A', 'T', 'G', 'C']:
+            frequencies = frequencies + proportions[base] * self.DNA_BASE_FREQUENCIES[base]
+        return frequencies.tolist(), (proportions['G'] + proportions['C']).tolist()
+    
+    def _gene_codon_frequencies(self, codon_counts: np.ndarray) -> List[float]:
+        """Per-gene weighted codon frequency, as in calculate_codon_frequencies."""
+        totals = codon_counts.sum(axis=1)
+        proportions = np.divide(codon_counts, totals[:, None], out=np.zeros(codon_counts.shape),
+                                where=totals[:, None] > 0)
+        frequencies = np.zeros(len(totals))
+        for codon, freq_data in self.CODON_FREQUENCIES.items():
+            frequencies = frequencies + proportions[:, CODONS.index(codon)] * freq_data['frequency_hz']
+        return frequencies.tolist()
+    
     def generate_therapeutic_frequencies(self, genome_analysis: Dict[str, any]) -> Dict[str, any]:
         """
         Generate therapeutic frequency derivatives from genome analysis.
@@ -476,41 +648,67 @@ class AramIsFieldGenomeAnalyzer:
         
         return therapeutic_frequencies
     
-    def analyze_complete_genome(self, organism: str, genome_file: str) -> Dict[str, any]:
+    def calculate_kmer_spectrum(self, sequence: str, k: int = 21,
+                                spill_dir: Optional[str] = None) -> KmerSpectrum:
+        """
+        Count the canonical k-mers of a genome.
+        
+        Args:
+            sequence: DNA sequence (str, PackedGenome or GenomeReader)
+            k: K-mer length (up to 31)
+            spill_dir: Directory for temporary spill files on large genomes
+            
+        Returns:
+            KmerSpectrum (sorted k-mer codes and counts)
+        """
+        spectrum = count_kmers(sequence, k, spill_dir=spill_dir)
+        logger.info(f"Counted {spectrum.total:,} {k}-mers ({len(spectrum):,} distinct)")
+        return spectrum
+    
+    def analyze_complete_genome(self, organism: str, genome_file: str,
+                                kmer_k: Optional[int] = None) -> Dict[str, any]:
         """
         Perform complete Aramis Field frequency analysis of a genome.
         
         Args:
             organism: Organism identifier
             genome_file: Path to genome file
+            kmer_k: Also count the genome's k-mer spectrum for this k (saved by
+                save_analysis as kmer_spectrum_<organism>_k<k>.npz)
             
         Returns:
             Complete frequency analysis results
         """
         logger.info(f"Starting complete genome analysis for {organism}")
         
-        # Get sequence from stored data or file
+        # Get sequence from stored data or the packed store next to the file (packed
+        # once on first use); neither is held in memory as a whole
         if organism in self.genome_data:
             sequence = self.genome_data[organism]['sequence']
         else:
-            record = SeqIO.read(genome_file, "genbank")
-            sequence = str(record.seq)
+            sequence = self._packed_genome(genome_file)
         
         # Perform all frequency analyses
         nucleotide_frequencies = self.calculate_nucleotide_frequencies(sequence)
         codon_frequencies = self.calculate_codon_frequencies(sequence)
-        gene_frequencies = self.analyze_gene_frequencies(genome_file)
+        gene_frequencies = self.analyze_gene_frequencies(genome_file, genome=sequence)
         
         # Complete analysis structure
         complete_analysis = {
             'organism': organism,
             'analysis_date': datetime.now().isoformat(),
-            'genome_info': self.genome_data.get(organism, {}),
+            # The live sequence object stays out of the saved analysis; packed_file records the store
+            'genome_info': {key: value for key, value in self.genome_data.get(organism, {}).items()
+                            if key != 'sequence'},
             'nucleotide_frequencies': nucleotide_frequencies,
             'codon_frequencies': codon_frequencies,
             'gene_frequencies': gene_frequencies,
         }
         
+        if kmer_k:
+            self.kmer_spectra[organism] = self.calculate_kmer_spectrum(sequence, kmer_k)
+            complete_analysis['kmer_spectrum'] = self.kmer_spectra[organism].summary()
+        
         # Generate therapeutic applications
         complete_analysis['therapeutic_frequencies'] = self.generate_therapeutic_frequencies(complete_analysis)
         
@@ -525,7 +723,7 @@ class AramIsFieldGenomeAnalyzer:
                 freq['nucleotide_frequency'] 
                 for freq in gene_frequencies['individual_genes'].values()
             ])),
-            'genome_signature_code': f"ARAMIS-GENOME-{organism.upper()}-{hashlib.md5(sequence.encode()).hexdigest()[:8].upper()}"
+            'genome_signature_code': f"ARAMIS-GENOME-{organism.upper()}-{sequence_digest(sequence, hashlib.md5()).hexdigest()[:8].upper()}"
         }
         
         # Store results
@@ -534,27 +732,44 @@ class AramIsFieldGenomeAnalyzer:
         logger.info(f"Complete genome analysis finished for {organism}")
         return complete_analysis
     
-    def save_analysis(self, organism: str, output_file: str = None) -> str:
+    def save_analysis(self, organism: str, output_file: str = None, gene_format: str = 'npz') -> str:
         """
         Save frequency analysis results to JSON file.
         
+        With gene_format 'npz' the per-gene table is written as typed columns to
+        <output stem>.genes.npz and the JSON is a slim summary that points to it
+        (see gene_table.load_analysis); 'json' writes everything into the JSON file.
+        A k-mer spectrum, if one was counted, is written beside it as
+        kmer_spectrum_<organism>_k<k>.npz.
+        
         Args:
             organism: Organism identifier
             output_file: Output file path (optional)
+            gene_format: 'npz' (columnar gene table) or 'json' (genes inline)
             
         Returns:
             Path to saved file
         """
         if organism not in self.frequency_signatures:
             raise ValueError(f"No analysis found for {organism}")
+        if gene_format not in ('npz', 'json'):
+            raise ValueError(f"Unknown gene table format: {gene_format}")
         
         if not output_file:
             output_file = f"data/genomic_frequencies_{organism}.json"
         
         os.makedirs(os.path.dirname(output_file), exist_ok=True)
         
+        analysis = self.frequency_signatures[organism]
+        if gene_format == 'npz':
+            analysis = split_analysis(analysis, output_file)
+        if organism in self.kmer_spectra:
+            spectrum = self.kmer_spectra[organism]
+            spectrum_file = spectrum.save(kmer_spectrum_path(os.path.dirname(output_file), organism, spectrum.k))
+            analysis = dict(analysis, kmer_spectrum=dict(analysis['kmer_spectrum'], table_file=spectrum_file.name))
+        
         with open(output_file, 'w') as f:
-            json.dump(self.frequency_signatures[organism], f, indent=2, default=str)
+            json.dump(analysis, f, indent=2, default=str)
         
         logger.info(f"Analysis saved to {output_file}")
         return output_file
@@ -567,11 +782,19 @@ def main():
     parser.add_argument("--analyze", action="store_true", help="Perform frequency analysis")
     parser.add_argument("--accession", help="Specific NCBI accession number")
     parser.add_argument("--email", default="gnosisloom@research.aramis", help="Email for NCBI API")
+    parser.add_argument("--workers", type=int, help="Processes for per-gene analysis (default: all cores for large genomes)")
+    parser.add_argument("--cache-dir", help="Genome cache directory (default: data/genomes)")
+    parser.add_argument("--offline", action="store_true", default=None,
+                        help="Only use cached genomes; never contact NCBI")
+    parser.add_argument("--gene-format", choices=["npz", "json"], default="npz",
+                        help="Per-gene table as NPZ columns beside a summary JSON, or inline JSON")
+    parser.add_argument("--kmer-k", type=int, help="Also count the canonical k-mer spectrum for this k (up to 31)")
     
     args = parser.parse_args()
     
     # Initialize analyzer
-    analyzer = AramIsFieldGenomeAnalyzer(email=args.email)
+    genome_cache = GenomeCache(args.cache_dir, offline=args.offline)
+    analyzer = AramIsFieldGenomeAnalyzer(email=args.email, workers=args.workers, genome_cache=genome_cache)
     
     try:
         genome_file = None
@@ -582,26 +805,17 @@ def main():
         
         if args.analyze:
             if not genome_file:
-                # Look for existing genome file
-                expected_files = [
-                    f"data/genomes/{args.organism}*.gb",
-                    f"{args.organism}*.gb"
-                ]
-                import glob
-                for pattern in expected_files:
-                    matches = glob.glob(pattern)
-                    if matches:
-                        genome_file = matches[0]
-                        break
+                # Resolve the genome through the local cache (never downloads)
+                genome_file = analyzer.cached_genome(args.organism, args.accession)
                 
                 if not genome_file:
                     print(f"❌ No genome file found for {args.organism}. Use --download first.")
                     return
             
             print(f"🔬 Analyzing {args.organism} genome...")
-            analysis = analyzer.analyze_complete_genome(args.organism, genome_file)
+            analysis = analyzer.analyze_complete_genome(args.organism, genome_file, kmer_k=args.kmer_k)
             
-            output_file = analyzer.save_analysis(args.organism)
+            output_file = analyzer.save_analysis(args.organism, gene_format=args.gene_format)
             print(f"✅ Analysis complete! Results saved to {output_file}")
             
             # Print summary
@@ -611,6 +825,8 @@ def main():
             print(f"Total Genes: {analysis['gene_frequencies']['genome_statistics']['total_genes']:,}")
             print(f"GC Content: {analysis['nucleotide_frequencies']['gc_content']:.2%}")
             print(f"Aramis Signature: {analysis['aramis_field_signature']['genome_signature_code']}")
+            if 'kmer_spectrum' in analysis:
+                print(f"Distinct {args.kmer_k}-mers: {analysis['kmer_spectrum']['distinct_kmers']:,}")
             
     except Exception as e:
         logger.error(f"Analysis failed: {e}")
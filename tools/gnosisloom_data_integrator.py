@@ -17,13 +17,21 @@ Integrates:
 - Cross-domain frequency mappings
 """
 
+import hashlib
+import heapq
 import json
+import math
 import os
 import glob
-from typing import Dict, List, Any, Optional, Tuple
+import pickle
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Callable, Iterable, Iterator, Optional, Tuple
 import logging
 from pathlib import Path
 
+from json_stream import JSONMemberStream
 from universal_resonance_engine import (
     UniversalResonanceEngine, ResonanceEntity, FrequencySignature, 
     FeedbackLoop, ScientificDomain, StellarAnchor, APIDataSource
@@ -109,6 +117,11 @@ class GnosisLoomBiologyAdapter(APIDataSource):
                     
         return entities
         
+    def iter_resonance_entities(self, records: Iterable[Tuple[str, Any]]) -> Iterator[ResonanceEntity]:
+        """Adapt streamed records one at a time; biological records are independent."""
+        for key, data in records:
+            yield from self.create_resonance_entities({key: data})
+        
     def get_domain_specific_metadata(self, raw_data: Dict[str, Any]) -> Dict[str, Any]:
         """Extract biology-specific metadata."""
         metadata = {
@@ -261,24 +274,240 @@ class GnosisLoomChemistryAdapter(APIDataSource):
         }
 
 
+BIOLOGY_KEYWORDS = [
+    'comprehensive_frequencies', 'neural', 'biological', 'organ', 'tissue',
+    'cellular', 'mitochondria', 'dna', 'protein', 'genomic'
+]
+
+CHEMISTRY_KEYWORDS = [
+    'periodic_table', 'molecular_chemistry', 'primordial_chemistry',
+    'chemical', 'atomic', 'molecular', 'bond', 'element'
+]
+
+FEEDBACK_LOOPS_SOURCE = "feedback_loops"
+
+MANIFEST_VERSION = 1
+
+# Keyword tokens shorter than this (or purely numeric) are too ambiguous to link on
+MIN_KEYWORD_LENGTH = 3
+
+
+def keyword_tokens(text: str) -> List[str]:
+    """
+    Split text into lowercase alphanumeric keyword tokens for entity/loop matching,
+    folding simple plurals ("cells" -> "cell") and dropping short or numeric tokens.
+    """
+    tokens = []
+    for token in re.findall(r"[a-z0-9]+", str(text).lower()):
+        if len(token) < MIN_KEYWORD_LENGTH or token.isdigit():
+            continue
+        if len(token) > MIN_KEYWORD_LENGTH and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def database_source(filename: str) -> str:
+    """Pick the adapter source name for a database file stem (lowercase)."""
+    if any(keyword in filename for keyword in BIOLOGY_KEYWORDS):
+        return "GnosisLoom_Biology"
+    if any(keyword in filename for keyword in CHEMISTRY_KEYWORDS):
+        return "GnosisLoom_Chemistry"
+    if filename == FEEDBACK_LOOPS_SOURCE:
+        return FEEDBACK_LOOPS_SOURCE
+    # Generic biological processing as default
+    logger.warning(f"Unknown database type for {filename}, treating as biology")
+    return "GnosisLoom_Biology"
+
+
+def entity_to_record(entity: ResonanceEntity) -> Dict[str, Any]:
+    """
+    Flatten a freshly adapted entity into a compact, picklable/JSON-able record.
+    
+    Records carry everything an adapter sets (relationships are built later by the
+    engine), so record_to_entity(entity_to_record(e)) reproduces the entity.
+    """
+    signature = entity.frequency_signature
+    return {
+        "entity_id": entity.entity_id,
+        "name": entity.name,
+        "domain": entity.domain.value,
+        "biofreq_code": entity.biofreq_code,
+        "signature": None if signature is None else [
+            signature.primary_frequency,
+            list(signature.frequency_range),
+            signature.harmonics,
+            signature.phase,
+            signature.stellar_anchor.name if signature.stellar_anchor else None,
+            signature.confidence,
+            signature.measurement_context
+        ],
+        "domain_metadata": entity.domain_metadata,
+        "api_source": entity.api_source,
+        "api_metadata": entity.api_metadata
+    }
+
+
+def record_to_entity(record: Dict[str, Any]) -> ResonanceEntity:
+    """Rebuild a ResonanceEntity from a record produced by entity_to_record."""
+    signature = None
+    if record["signature"] is not None:
+        primary, freq_range, harmonics, phase, anchor, confidence, context = record["signature"]
+        signature = FrequencySignature(
+            primary_frequency=primary,
+            frequency_range=tuple(freq_range),
+            harmonics=harmonics,
+            phase=phase,
+            stellar_anchor=StellarAnchor[anchor] if anchor else None,
+            confidence=confidence,
+            measurement_context=context
+        )
+    return ResonanceEntity(
+        entity_id=record["entity_id"],
+        name=record["name"],
+        domain=ScientificDomain(record["domain"]),
+        frequency_signature=signature,
+        biofreq_code=record["biofreq_code"],
+        domain_metadata=record["domain_metadata"],
+        api_source=record["api_source"],
+        api_metadata=record["api_metadata"]
+    )
+
+
+def _stream_database_file(json_file_path: Path, source: str, adapter: Optional[APIDataSource],
+                          result: Dict[str, Any]) -> bool:
+    """
+    Stream a database's top-level members into result, timing decode and adapt
+    separately. Returns False (leaving result untouched) if the document is not a
+    JSON object, so the caller can fall back to json.load.
+    """
+    decode_seconds = 0.0
+    started = time.perf_counter()
+    with JSONMemberStream(json_file_path) as stream:
+        if stream.container_type != "object":
+            return False
+            
+        def timed_members() -> Iterator[Tuple[str, Any]]:
+            nonlocal decode_seconds
+            members = iter(stream)
+            while True:
+                tick = time.perf_counter()
+                member = next(members, None)
+                decode_seconds += time.perf_counter() - tick
+                if member is None:
+                    return
+                yield member
+                
+        if source == FEEDBACK_LOOPS_SOURCE:
+            result["feedback_loops"] = dict(timed_members())
+        else:
+            result["records"] = [entity_to_record(entity)
+                                 for entity in adapter.iter_resonance_entities(timed_members())]
+            
+    result["timing"] = {
+        "parse_seconds": round(decode_seconds, 6),
+        "adapt_seconds": round(time.perf_counter() - started - decode_seconds, 6),
+        "streamed": True
+    }
+    return True
+
+
+def parse_database_file(json_file_path: Path, adapters: Dict[str, APIDataSource],
+                        stream: bool = False) -> Dict[str, Any]:
+    """
+    Decode and adapt one database file into compact records.
+    
+    Runs in worker processes for parallel integration, so it touches no shared
+    state and reports failures in the result instead of raising.
+    
+    Args:
+        json_file_path: Database file
+        adapters: Adapters by source name
+        stream: Read top-level members incrementally and hand them to the adapter
+            as a generator instead of json.load-ing the whole document
+        
+    Returns:
+        Dictionary with file, source, records, feedback_loops (raw loop data for the
+        feedback loop database), error and timing
+    """
+    result = {"file": json_file_path.name, "source": None, "records": [],
+              "feedback_loops": None, "error": None}
+    started = time.perf_counter()
+    parsed = started
+    try:
+        source = database_source(json_file_path.stem.lower())
+        result["source"] = source
+        if stream and _stream_database_file(json_file_path, source, adapters.get(source), result):
+            return result
+            
+        with open(json_file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        parsed = time.perf_counter()
+        
+        if source == FEEDBACK_LOOPS_SOURCE:
+            # Handle feedback loops separately
+            result["feedback_loops"] = data
+        else:
+            entities = adapters[source].create_resonance_entities(data)
+            result["records"] = [entity_to_record(entity) for entity in entities]
+    except Exception as e:
+        result["error"] = str(e)
+        result["records"] = []
+        result["feedback_loops"] = None
+        
+    finished = time.perf_counter()
+    result["timing"] = {
+        "parse_seconds": round(parsed - started, 6),
+        "adapt_seconds": round(finished - parsed, 6) if parsed > started else 0.0
+    }
+    return result
+
+
 class GnosisLoomDataIntegrator:
     """
     Main integration engine for all GnosisLoom databases into the Universal Resonance Engine.
     """
     
-    def __init__(self, gnosisloom_data_path: str = None):
+    def __init__(self, gnosisloom_data_path: str = None, workers: int = 1,
+                 incremental: bool = False, cache_dir: str = None, stream: bool = False):
+        """
+        Args:
+            gnosisloom_data_path: Path to GnosisLoom data directory
+            workers: Processes used to decode and adapt database files; 1 integrates
+                in-process, 0 or None uses every core
+            incremental: Keep a content-hash manifest so re-runs only re-parse new or
+                changed files, retract entities from changed or deleted files, and
+                restore unchanged files from cached records
+            cache_dir: Where the manifest and cached records live (default:
+                <data path>/.integration_cache)
+            stream: Read each database member by member and adapt records as they
+                are decoded, bounding peak memory by the largest record instead of
+                the largest file
+        """
         if gnosisloom_data_path is None:
             # Default to current directory structure
             self.data_path = Path(__file__).parent.parent / "data"
         else:
             self.data_path = Path(gnosisloom_data_path)
             
+        self.workers = workers
+        self.stream = stream
+        self.incremental = incremental
+        self.cache_dir = Path(cache_dir) if cache_dir else self.data_path / ".integration_cache"
+        self.manifest_path = self.cache_dir / "manifest.json"
+        self.loaded_files: Dict[str, Dict[str, Any]] = {}  # file -> manifest entry for what the engine holds
         self.engine = UniversalResonanceEngine()
         self.integration_stats = {
             "databases_processed": 0,
             "entities_created": 0,
             "feedback_loops_created": 0,
-            "errors": []
+            "errors": [],
+            "workers": 1,
+            "file_timings": {},
+            "files_parsed": 0,
+            "files_restored": 0,
+            "files_unchanged": 0,
+            "files_removed": 0
         }
         
         # Register adapters
@@ -287,20 +516,89 @@ class GnosisLoomDataIntegrator:
         
         logger.info(f"GnosisLoom Data Integrator initialized with path: {self.data_path}")
         
-    def integrate_all_databases(self) -> Dict[str, Any]:
-        """Integrate all JSON databases from the GnosisLoom data directory."""
-        json_files = list(self.data_path.glob("*.json"))
+    def integrate_all_databases(self, on_entities_loaded: Optional[Callable[[], None]] = None,
+                                workers: int = None) -> Dict[str, Any]:
+        """
+        Integrate all JSON databases from the GnosisLoom data directory.
+        
+        Files are decoded and adapted (in a process pool when workers > 1) and merged
+        into the engine in sorted filename order, so entity order is deterministic
+        regardless of worker count.
+        
+        Args:
+            on_entities_loaded: Called once every database has been ingested, before
+                feedback loops are linked to entities. From that point the engine's
+                entity collections no longer change, so readers may use them.
+            workers: Overrides the integrator's worker count for this run
+        """
+        json_files = sorted(self.data_path.glob("*.json"))
         logger.info(f"Found {len(json_files)} JSON databases to integrate")
         
+        # Stats describe this run; totals for everything loaded come from engine.get_statistics()
+        for counter in ("databases_processed", "feedback_loops_created",
+                        "files_parsed", "files_restored", "files_unchanged", "files_removed"):
+            self.integration_stats[counter] = 0
+        self.integration_stats["errors"] = []
+        self.integration_stats["file_timings"] = {}
+            
+        # Decide per file: parse, restore from cached records, or keep what the engine holds
+        plan = {json_file.name: ("parse", None) for json_file in json_files}
+        manifest = {}
+        if self.incremental:
+            manifest = self._load_manifest()
+            plan = self._plan_incremental_run(json_files, manifest)
+            for name in [name for name in self.loaded_files if name not in plan]:
+                logger.info(f"Retracting entities from removed database: {name}")
+                self._retract_file(name)
+                manifest.pop(name, None)
+                self.integration_stats["files_removed"] += 1
+                
+        to_parse = [json_file for json_file in json_files if plan[json_file.name][0] == "parse"]
+        workers = self.workers if workers is None else workers
+        if not workers:
+            workers = os.cpu_count() or 1
+        workers = max(1, min(workers, len(to_parse) or 1))
+        self.integration_stats["workers"] = workers
+        
+        # Parsed results arrive in to_parse order, a subsequence of json_files
+        parsed = iter(self._parse_database_files(to_parse, workers))
         for json_file in json_files:
+            action, entry = plan[json_file.name]
+            if action == "unchanged":
+                self.integration_stats["files_unchanged"] += 1
+                continue
+                
+            result = next(parsed) if action == "parse" else self._load_cached_result(json_file, entry)
+            if result is None:
+                action = "parse"
+                result = parse_database_file(json_file, self.engine.api_adapter.registered_adapters, self.stream)
+            if json_file.name in self.loaded_files:
+                self._retract_file(json_file.name)
+            manifest.pop(json_file.name, None)
+                
             try:
-                self._integrate_database_file(json_file)
+                entity_ids, loop_ids = self._merge_parsed_file(result)
                 self.integration_stats["databases_processed"] += 1
+                self.integration_stats["files_parsed" if action == "parse" else "files_restored"] += 1
             except Exception as e:
-                error_msg = f"Error processing {json_file.name}: {str(e)}"
+                error_msg = f"Error processing {result['file']}: {str(e)}"
                 logger.error(error_msg)
                 self.integration_stats["errors"].append(error_msg)
+                continue
+                
+            if self.incremental:
+                if entry is None or action == "parse":
+                    entry = self._cache_result(json_file, result)
+                entry = dict(entry, entity_ids=entity_ids, loop_ids=loop_ids)
+                manifest[json_file.name] = entry
+                self.loaded_files[json_file.name] = entry
                 
+        if self.incremental:
+            self._save_manifest(manifest)
+            
+        if on_entities_loaded is not None:
+            on_entities_loaded()
+            
         # Process feedback loops
         self._integrate_feedback_loops()
         
@@ -311,48 +609,168 @@ class GnosisLoomDataIntegrator:
         logger.info(f"Integration complete: {final_stats}")
         return final_stats
         
-    def _integrate_database_file(self, json_file_path: Path):
-        """Integrate a single JSON database file."""
-        logger.info(f"Processing: {json_file_path.name}")
-        
-        with open(json_file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+    def _parse_database_files(self, json_files: List[Path], workers: int) -> Iterable[Dict[str, Any]]:
+        """Yield parsed files in input order, decoding them in a process pool when workers > 1."""
+        adapters = self.engine.api_adapter.registered_adapters
+        if workers == 1:
+            for json_file in json_files:
+                logger.info(f"Processing: {json_file.name}")
+                yield parse_database_file(json_file, adapters, self.stream)
+            return
             
-        # Determine data type and appropriate adapter
-        filename = json_file_path.stem.lower()
-        
-        if self._is_biology_database(filename):
-            self.engine.ingest_api_data("GnosisLoom_Biology", data)
-        elif self._is_chemistry_database(filename):
-            self.engine.ingest_api_data("GnosisLoom_Chemistry", data)
-        elif filename == "feedback_loops":
-            # Handle feedback loops separately
-            self._process_feedback_loops_data(data)
+        logger.info(f"Parsing databases with {workers} worker processes")
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(parse_database_file, json_file, adapters, self.stream) for json_file in json_files]
+            for json_file, future in zip(json_files, futures):
+                logger.info(f"Processing: {json_file.name}")
+                yield future.result()
+                
+    def _merge_parsed_file(self, result: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+        """
+        Add a parsed file's entities or feedback loops to the engine.
+        
+        Returns:
+            (entity ids, feedback loop ids) created from the file
+        """
+        if result["error"] is not None:
+            raise RuntimeError(result["error"])
+            
+        started = time.perf_counter()
+        entity_ids, loop_ids = [], []
+        if result["source"] == FEEDBACK_LOOPS_SOURCE:
+            loop_ids = self._process_feedback_loops_data(result["feedback_loops"])
         else:
-            # Generic biological processing as default
-            logger.warning(f"Unknown database type for {filename}, treating as biology")
-            self.engine.ingest_api_data("GnosisLoom_Biology", data)
+            for record in result["records"]:
+                self.engine.add_entity(record_to_entity(record))
+                entity_ids.append(record["entity_id"])
+            logger.info(f"Ingested {len(result['records'])} entities from {result['source']}")
             
-        logger.debug(f"Completed processing: {json_file_path.name}")
+        timing = dict(result["timing"])
+        timing["merge_seconds"] = round(time.perf_counter() - started, 6)
+        timing["entities"] = len(result["records"])
+        self.integration_stats["file_timings"][result["file"]] = timing
+        logger.debug(f"Completed processing: {result['file']}")
+        return entity_ids, loop_ids
+        
+    # ===== INCREMENTAL RE-INTEGRATION =====
+    
+    @staticmethod
+    def _file_digest(json_file_path: Path) -> str:
+        digest = hashlib.sha256()
+        with open(json_file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+        
+    def _load_manifest(self) -> Dict[str, Dict[str, Any]]:
+        """Load the file manifest, or start empty if it is missing or from another version."""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if manifest.get("version") != MANIFEST_VERSION:
+            return {}
+        return manifest.get("files", {})
+        
+    def _save_manifest(self, manifest: Dict[str, Dict[str, Any]]):
+        """Write the manifest atomically and drop cached records no entry refers to."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": MANIFEST_VERSION, "files": manifest}, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+        
+        referenced = {entry["records"] for entry in manifest.values()}
+        for cached in self.cache_dir.glob("records-*.pickle"):
+            if cached.name not in referenced:
+                cached.unlink(missing_ok=True)
+                
+    def _plan_incremental_run(self, json_files: List[Path],
+                              manifest: Dict[str, Dict[str, Any]]) -> Dict[str, Tuple[str, Optional[Dict[str, Any]]]]:
+        """
+        Classify each file as "unchanged" (engine already holds it), "restore" (cached
+        records match its content) or "parse". Files whose size and mtime match the
+        manifest are trusted without re-hashing.
+        """
+        plan = {}
+        for json_file in json_files:
+            stat = json_file.stat()
+            entry = self.loaded_files.get(json_file.name) or manifest.get(json_file.name)
+            if entry is None:
+                plan[json_file.name] = ("parse", None)
+                continue
+                
+            if (entry["size"], entry["mtime_ns"]) != (stat.st_size, stat.st_mtime_ns):
+                if self._file_digest(json_file) != entry["sha256"]:
+                    plan[json_file.name] = ("parse", None)
+                    continue
+                entry = dict(entry, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+                
+            if self.loaded_files.get(json_file.name, {}).get("sha256") == entry["sha256"]:
+                self.loaded_files[json_file.name] = entry
+                manifest[json_file.name] = entry
+                plan[json_file.name] = ("unchanged", entry)
+            elif (self.cache_dir / entry["records"]).exists():
+                plan[json_file.name] = ("restore", entry)
+            else:
+                plan[json_file.name] = ("parse", None)
+        return plan
+        
+    def _cache_result(self, json_file_path: Path, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Store a parsed file's records and return its manifest entry."""
+        stat = json_file_path.stat()
+        sha256 = self._file_digest(json_file_path)
+        records_name = f"records-{json_file_path.stem}-{sha256[:16]}.pickle"
+        
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_dir / (records_name + ".tmp")
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({"source": result["source"], "records": result["records"],
+                         "feedback_loops": result["feedback_loops"]}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.cache_dir / records_name)
+        
+        return {"sha256": sha256, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+                "source": result["source"], "records": records_name}
+        
+    def _load_cached_result(self, json_file_path: Path, entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Restore a parsed result from cached records, or None if the cache is unreadable."""
+        started = time.perf_counter()
+        try:
+            with open(self.cache_dir / entry["records"], 'rb') as f:
+                cached = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            logger.warning(f"Cached records for {json_file_path.name} unreadable ({e}), re-parsing")
+            return None
+        logger.info(f"Restoring: {json_file_path.name} (unchanged)")
+        return {"file": json_file_path.name, "source": cached["source"], "records": cached["records"],
+                "feedback_loops": cached["feedback_loops"], "error": None,
+                "timing": {"parse_seconds": round(time.perf_counter() - started, 6), "adapt_seconds": 0.0}}
+                
+    def _retract_file(self, filename: str):
+        """Remove everything a previously integrated file contributed to the engine."""
+        entry = self.loaded_files.pop(filename, None)
+        if entry is None:
+            return
+        self.engine.remove_entities(entry.get("entity_ids", []))
+        self.engine.remove_feedback_loops(entry.get("loop_ids", []))
+        
+    def _integrate_database_file(self, json_file_path: Path):
+        """Integrate a single JSON database file."""
+        logger.info(f"Processing: {json_file_path.name}")
+        self._merge_parsed_file(parse_database_file(json_file_path, self.engine.api_adapter.registered_adapters, self.stream))
         
     def _is_biology_database(self, filename: str) -> bool:
         """Determine if database contains biological data."""
-        biology_keywords = [
-            'comprehensive_frequencies', 'neural', 'biological', 'organ', 'tissue',
-            'cellular', 'mitochondria', 'dna', 'protein', 'genomic'
-        ]
-        return any(keyword in filename for keyword in biology_keywords)
+        return any(keyword in filename for keyword in BIOLOGY_KEYWORDS)
         
     def _is_chemistry_database(self, filename: str) -> bool:
         """Determine if database contains chemistry data."""
-        chemistry_keywords = [
-            'periodic_table', 'molecular_chemistry', 'primordial_chemistry',
-            'chemical', 'atomic', 'molecular', 'bond', 'element'
-        ]
-        return any(keyword in filename for keyword in chemistry_keywords)
-        
-    def _process_feedback_loops_data(self, data: Dict[str, Any]):
-        """Process feedback loops data from GnosisLoom."""
+        return any(keyword in filename for keyword in CHEMISTRY_KEYWORDS)
+        
+    def _process_feedback_loops_data(self, data: Dict[str, Any]) -> List[str]:
+        """Process feedback loops data from GnosisLoom, returning the created loop ids."""
+        loop_ids = []
         for loop_code, description in data.items():
             if loop_code.startswith('FL-'):
                 feedback_loop = FeedbackLoop(
@@ -363,6 +781,8 @@ class GnosisLoomDataIntegrator:
                 )
                 self.engine.add_feedback_loop(feedback_loop)
                 self.integration_stats["feedback_loops_created"] += 1
+                loop_ids.append(feedback_loop.loop_id)
+        return loop_ids
                 
     def _determine_loop_type(self, code: str, description: str) -> str:
         """Determine feedback loop type from code and description."""
@@ -377,25 +797,44 @@ class GnosisLoomDataIntegrator:
         else:
             return "regulatory"
             
-    def _integrate_feedback_loops(self):
-        """Create relationships between entities and feedback loops."""
-        # This is where we would implement sophisticated relationship detection
-        # For now, we'll create basic connections based on BioFreq codes
-        
-        for loop_id, loop in self.engine.feedback_loops.items():
-            # Find entities that might be related to this feedback loop
-            related_entities = []
-            
-            # Simple matching based on description keywords
-            loop_desc = loop.description.lower()
-            for entity in self.engine.entities.values():
-                entity_name = entity.name.lower()
-                if any(word in loop_desc for word in entity_name.split('_')):
-                    related_entities.append(entity)
+    def _integrate_feedback_loops(self, max_entities_per_loop: int = 5):
+        """
+        Create relationships between entities and feedback loops.
+        
+        Loop descriptions are tokenized once into a token -> loops inverted index;
+        each entity's name tokens are then matched by hash lookup. Matches are ranked
+        by relevance (rarer shared tokens and better name coverage score higher) so
+        each loop keeps its best max_entities_per_loop entities.
+        """
+        loops = list(self.engine.feedback_loops.values())
+        loop_index: Dict[str, List[int]] = {}  # token -> positions in loops
+        for position, loop in enumerate(loops):
+            # Re-link from scratch so re-integration reflects the current entities
+            loop.entities = []
+            loop.domains_involved = set()
+            for token in set(keyword_tokens(loop.description)):
+                loop_index.setdefault(token, []).append(position)
+                
+        # Shared tokens that appear in fewer loop descriptions are stronger evidence
+        idf = {token: math.log(1.0 + len(loops) / len(positions)) for token, positions in loop_index.items()}
+        
+        scores: List[Dict[int, float]] = [{} for _ in loops]  # loop position -> entity order -> score
+        entities = list(self.engine.entities.values())
+        for order, entity in enumerate(entities):
+            name_tokens = set(keyword_tokens(entity.name))
+            if not name_tokens:
+                continue
+            norm = math.sqrt(len(name_tokens))
+            for token in name_tokens:
+                for position in loop_index.get(token, ()):
+                    loop_scores = scores[position]
+                    loop_scores[order] = loop_scores.get(order, 0.0) + idf[token] / norm
                     
-            # Add entities to the feedback loop
-            for entity in related_entities[:5]:  # Limit to 5 to avoid overcrowding
-                loop.add_entity(entity)
+        for loop, loop_scores in zip(loops, scores):
+            # Highest score first; ties keep ingestion order
+            best = heapq.nsmallest(max_entities_per_loop, loop_scores.items(), key=lambda item: (-item[1], item[0]))
+            for order, _ in best:
+                loop.add_entity(entities[order])
                 
         logger.info(f"Processed {len(self.engine.feedback_loops)} feedback loops")
         
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+JSON Stream - Incremental member-by-member JSON reading
+
+Walks the members of a JSON object or array without materializing the whole
+document: each member value is decoded on its own from a sliding buffer, so
+peak memory is bounded by the largest single member rather than by the file.
+A key path can be given to stream the members of a nested container instead
+(e.g. the per-gene table inside a genomic analysis or the pattern list inside
+universal_connection_discoveries.json).
+
+Standard library only; values are decoded with json.JSONDecoder.raw_decode, so
+they come out exactly as json.load would produce them.
+
+Author: Dr. Mordin Solus (custom research persona of Claude Code)
+Date: 2025-09-02
+Version: 1.0.0
+
+Usage:
+    with JSONMemberStream("data/harmonic_relationships.json") as stream:
+        for key, value in stream:
+            ...
+
+    for index, pattern in iter_json_members("data/universal_connection_discoveries.json",
+                                            path=("universal_patterns",)):
+        ...
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Iterator, Optional, Sequence, Tuple, Union
+
+WHITESPACE = " \t\n\r"
+NUMBER_DELIMITERS = tuple(",]}" + WHITESPACE)
+
+# Initial read size; reads double while a single member is still incomplete so
+# re-decoding a large member stays amortized linear
+CHUNK_SIZE = 1 << 16
+
+
+class JSONMemberStream:
+    """
+    Iterate (key, value) pairs of a JSON object, or (index, value) pairs of a JSON
+    array, reading the file incrementally.
+
+    Attributes:
+        container_type: "object", "array" or "scalar" for the container being
+            streamed (the top level, or the container at path). Scalars yield nothing.
+    """
+
+    def __init__(self, file_path: Union[str, Path], path: Sequence[Union[str, int]] = (),
+                 chunk_size: int = CHUNK_SIZE):
+        self.file_path = Path(file_path)
+        self.path = tuple(path)
+        self.chunk_size = chunk_size
+        self._file = open(self.file_path, 'r', encoding='utf-8')
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self.container_type: Optional[str] = self._peek_container_type()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._file.close()
+
+    def __iter__(self) -> Iterator[Tuple[Union[str, int], Any]]:
+        if self.path:
+            yield from self._stream_path(self.path)
+        elif self.container_type != "scalar":
+            yield from self._members()
+
+    # ----- buffer management -----
+
+    def _fill(self, size: int = None) -> bool:
+        """Append more of the file to the buffer, compacting consumed text first."""
+        if self._eof:
+            return False
+        if self._pos:
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+        chunk = self._file.read(size or self.chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf += chunk
+        return True
+
+    def _peek(self) -> str:
+        """Next non-whitespace character ('' at end of input) without consuming it."""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, chars: str) -> str:
+        char = self._peek()
+        if char == "" or char not in chars:
+            raise ValueError(f"{self.file_path}: expected one of {chars!r}, found {char or 'end of file'!r}")
+        self._pos += 1
+        return char
+
+    def _decode_value(self) -> Any:
+        """Decode the next complete value, reading more input until it parses."""
+        self._peek()
+        read_size = self.chunk_size
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill(read_size):
+                    raise
+                read_size *= 2
+                continue
+            # A number cut off by the chunk boundary may continue in the next chunk
+            if isinstance(value, (int, float)) and not self._eof and self._buf[end:end + 1] not in NUMBER_DELIMITERS:
+                if self._fill(read_size):
+                    continue
+            self._pos = end
+            return value
+
+    # ----- structure walking -----
+
+    def _peek_container_type(self) -> str:
+        char = self._peek()
+        if char == "{":
+            return "object"
+        if char == "[":
+            return "array"
+        return "scalar"
+
+    def _members(self) -> Iterator[Tuple[Union[str, int], Any]]:
+        """Yield the members of the container starting at the current position."""
+        for key in self._member_keys():
+            yield key, self._decode_value()
+
+    def _member_keys(self) -> Iterator[Union[str, int]]:
+        """
+        Walk a container, yielding each member's key (or index) with the position
+        left at the member's value; the consumer must consume that value.
+        """
+        opening = self._expect("{[")
+        closing = "}" if opening == "{" else "]"
+        index = 0
+        if self._peek() == closing:
+            self._pos += 1
+            return
+        while True:
+            if opening == "{":
+                key = self._decode_value()
+                if not isinstance(key, str):
+                    raise ValueError(f"{self.file_path}: object key must be a string")
+                self._expect(":")
+            else:
+                key = index
+            yield key
+            index += 1
+            if self._expect("," + closing) == closing:
+                return
+
+    def _stream_path(self, path: Tuple[Union[str, int], ...]) -> Iterator[Tuple[Union[str, int], Any]]:
+        """Descend to the container at path, skipping siblings, and stream its members."""
+        if self._peek() not in ("{", "["):
+            return
+        target, rest = path[0], path[1:]
+        for key in self._member_keys():
+            if key != target:
+                self._decode_value()
+                continue
+            self.container_type = self._peek_container_type()
+            if self.container_type == "scalar":
+                self._decode_value()
+            elif rest:
+                yield from self._stream_path(rest)
+            else:
+                yield from self._members()
+            # Nothing after the target is needed
+            return
+        self.container_type = None
+
+
+def iter_json_members(file_path: Union[str, Path], path: Sequence[Union[str, int]] = (),
+                      chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[Union[str, int], Any]]:
+    """
+    Stream the members of the JSON container at path in file_path.
+
+    Args:
+        file_path: JSON document
+        path: Keys/indices leading to a nested container (empty for the top level)
+        chunk_size: Initial read size in characters
+
+    Yields:
+        (key, value) for objects or (index, value) for arrays
+    """
+    with JSONMemberStream(file_path, path, chunk_size) as stream:
+        yield from stream
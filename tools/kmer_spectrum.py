@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+K-mer Spectrum - Genome-scale k-mer counting on 2-bit codes
+
+Counts every k-mer (k <= 31) of a whole genome. Bases are 2-bit codes (see
+nucleotide_codec), so a k-mer is an integer of 2k bits; the codes of all
+windows in a chunk are built with O(log k) shift-or passes over the chunk by
+doubling (the codes of length 2m windows are the length m codes of two
+neighbouring windows joined), and the reverse complement codes are built the
+same way, so canonical (strand-independent) k-mers are a minimum of two arrays.
+Windows containing N or other non-ACGT bytes are skipped.
+
+Each chunk's k-mers are counted by sort/unique and split by code range into
+partitions. Partition runs are buffered in memory and, once they exceed the
+memory limit, merged and spilled to disk; the final table is produced one
+partition at a time by merging all of that partition's runs in a single sort
+pass, so memory is bounded by the runs of the largest partition (more
+partitions lower it). Because partitions are code ranges the merged table comes out
+sorted, and it is stored as two arrays (k-mer codes, counts) in an NPZ file.
+
+Author: Dr. Mordin Solus (custom research persona of Claude Code)
+Date: 2025-09-02
+Version: 1.0.0
+
+Usage:
+    spectrum = count_kmers(PackedGenome("data/genomes/ecoli_NC_000913.3.pgen"), k=21)
+    spectrum.top(5), spectrum.count("ACGT" * 5 + "A")
+    spectrum.save(kmer_spectrum_path("data", "ecoli", 21))
+    spectrum_distances(spectrum, KmerSpectrum.load("data/kmer_spectrum_yeast_k21.npz"))
+"""
+
+import math
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from nucleotide_codec import BASES, N_CODE, Sequence, encode_bases, iter_sequence_chunks
+
+MAX_K = 31
+DEFAULT_K = 21
+
+# Bases per chunk; the doubling passes keep a few uint64 arrays of this length
+KMER_CHUNK_SIZE = 1 << 20
+
+# Bytes of buffered (k-mer, count) runs before they are spilled to disk
+DEFAULT_MEMORY_LIMIT = 256 << 20
+DEFAULT_PARTITIONS = 16
+
+
+def kmer_spectrum_path(directory: Union[str, Path], organism: str, k: int) -> Path:
+    """Spectrum file of an organism's genome analysis (kmer_spectrum_<organism>_k<k>.npz)."""
+    return Path(directory) / f"kmer_spectrum_{organism}_k{k}.npz"
+
+
+def encode_kmer(kmer: str) -> int:
+    """2-bit code of a k-mer string (first base most significant)."""
+    code = 0
+    for base in kmer.upper():
+        code = (code << 2) | BASES.index(base)
+    return code
+
+
+def decode_kmer(code: int, k: int) -> str:
+    """K-mer string of a 2-bit code."""
+    return "".join(BASES[(int(code) >> (2 * (k - 1 - i))) & 3] for i in range(k))
+
+
+def reverse_complement_code(code: int, k: int) -> int:
+    """2-bit code of the reverse complement of a k-mer code."""
+    code = int(code)
+    result = 0
+    for _ in range(k):
+        result = (result << 2) | (3 - (code & 3))
+        code >>= 2
+    return result
+
+
+def kmer_codes(codes: np.ndarray, k: int, canonical: bool = True) -> np.ndarray:
+    """
+    Codes of every k-mer window of a base code array (A=0, C=1, G=2, T=3, 4 for
+    anything else), skipping windows that contain a non-ACGT base.
+
+    Args:
+        codes: uint8 base codes
+        k: K-mer length (1-31)
+        canonical: Return min(k-mer, reverse complement) codes
+
+    Returns:
+        uint64 codes in window order
+    """
+    if not 1 <= k <= MAX_K:
+        raise ValueError(f"k must be between 1 and {MAX_K}")
+    n = codes.size - k + 1
+    if n <= 0:
+        return np.zeros(0, dtype=np.uint64)
+
+    invalid = codes >= N_CODE
+    bases = np.where(invalid, 0, codes).astype(np.uint64)
+    # Doubling: power_* hold codes of windows of length `power`, result_* of length `length`
+    power_forward, power_reverse = bases, 3 - bases
+    result_forward = result_reverse = None
+    power, length = 1, 0
+    while True:
+        if k & power:
+            if result_forward is None:
+                result_forward, result_reverse = power_forward, power_reverse
+            else:
+                m = codes.size - (length + power) + 1
+                result_forward = (result_forward[:m] << 2 * power) | power_forward[length:length + m]
+                result_reverse = result_reverse[:m] | (power_reverse[length:length + m] << 2 * length)
+            length += power
+        if 2 * power > k:
+            break
+        m = codes.size - 2 * power + 1
+        power_forward = (power_forward[:m] << 2 * power) | power_forward[power:power + m]
+        power_reverse = power_reverse[:m] | (power_reverse[power:power + m] << 2 * power)
+        power *= 2
+
+    result = np.minimum(result_forward, result_reverse) if canonical else result_forward
+    if invalid.any():
+        bad = np.zeros(codes.size + 1, dtype=np.int64)
+        np.cumsum(invalid, out=bad[1:])
+        result = result[bad[k:] - bad[:n] == 0]
+    return result
+
+
+def _merge_runs(runs: List[Tuple[np.ndarray, np.ndarray]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Sum counts of (sorted unique keys, counts) runs into one sorted unique run."""
+    runs = [run for run in runs if run[0].size]
+    if not runs:
+        return np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.uint64)
+    if len(runs) == 1:
+        return runs[0]
+    keys = np.concatenate([run[0] for run in runs])
+    counts = np.concatenate([run[1] for run in runs])
+    order = np.argsort(keys, kind='stable')
+    keys, counts = keys[order], counts[order]
+    starts = np.concatenate(([0], np.flatnonzero(keys[1:] != keys[:-1]) + 1))
+    return keys[starts], np.add.reduceat(counts, starts)
+
+
+class KmerSpectrum:
+    """
+    Sorted table of k-mer codes and their counts.
+
+    Attributes:
+        k: K-mer length
+        canonical: Whether k-mers were folded with their reverse complements
+        kmers: Sorted uint64 k-mer codes
+        counts: Counts per k-mer
+    """
+
+    def __init__(self, k: int, kmers: np.ndarray, counts: np.ndarray, canonical: bool = True):
+        self.k = k
+        self.canonical = canonical
+        self.kmers = kmers
+        self.counts = counts
+
+    def __len__(self) -> int:
+        return len(self.kmers)
+
+    def __repr__(self) -> str:
+        return f"KmerSpectrum(k={self.k}, distinct={len(self):,}, total={self.total:,})"
+
+    @property
+    def total(self) -> int:
+        """Number of k-mer occurrences counted."""
+        return int(self.counts.sum())
+
+    def count(self, kmer: str) -> int:
+        """Count of a k-mer (folded with its reverse complement for canonical spectra)."""
+        if len(kmer) != self.k:
+            raise ValueError(f"expected a {self.k}-mer")
+        code = encode_kmer(kmer)
+        if self.canonical:
+            code = min(code, reverse_complement_code(code, self.k))
+        index = int(np.searchsorted(self.kmers, np.uint64(code)))
+        return int(self.counts[index]) if index < len(self.kmers) and self.kmers[index] == code else 0
+
+    def top(self, n: int = 10) -> List[Tuple[str, int]]:
+        """Most frequent k-mers (ties in code order)."""
+        order = np.argsort(-self.counts.astype(np.int64), kind='stable')[:n]
+        return [(decode_kmer(self.kmers[i], self.k), int(self.counts[i])) for i in order]
+
+    def histogram(self) -> Dict[int, int]:
+        """Multiplicity -> number of distinct k-mers seen that many times."""
+        multiplicities, frequency = np.unique(self.counts, return_counts=True)
+        return dict(zip(multiplicities.tolist(), frequency.tolist()))
+
+    def entropy(self) -> float:
+        """Shannon entropy of the k-mer distribution in bits."""
+        if not len(self):
+            return 0.0
+        p = self.counts / self.counts.sum()
+        return float(-(p * np.log2(p)).sum())
+
+    def summary(self, top: int = 10) -> Dict:
+        """JSON-ready description of the spectrum."""
+        return {
+            'k': self.k,
+            'canonical': self.canonical,
+            'total_kmers': self.total,
+            'distinct_kmers': len(self),
+            'singleton_kmers': int((self.counts == 1).sum()),
+            'max_count': int(self.counts.max()) if len(self) else 0,
+            'shannon_entropy_bits': self.entropy(),
+            'top_kmers': [{'kmer': kmer, 'count': count} for kmer, count in self.top(top)]
+        }
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """Write the table to an NPZ file (counts in the narrowest unsigned type)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        counts = self.counts.astype(np.min_scalar_type(int(self.counts.max(initial=0))))
+        tmp_file = path.with_name(path.name + ".tmp")
+        with open(tmp_file, 'wb') as f:
+            np.savez_compressed(f, kmers=self.kmers, counts=counts, k=self.k, canonical=self.canonical)
+        tmp_file.replace(path)
+        return path
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'KmerSpectrum':
+        with np.load(path) as archive:
+            return cls(int(archive['k']), archive['kmers'], archive['counts'], bool(archive['canonical']))
+
+
+def count_kmers(sequence: Sequence, k: int = DEFAULT_K, canonical: bool = True,
+                memory_limit: int = DEFAULT_MEMORY_LIMIT, partitions: int = DEFAULT_PARTITIONS,
+                spill_dir: Optional[Union[str, Path]] = None,
+                chunk_size: int = KMER_CHUNK_SIZE) -> KmerSpectrum:
+    """
+    Count the k-mers of a sequence with bounded memory.
+
+    The sequence is treated as one string (records of a multi-record source are
+    joined), and windows containing non-ACGT bases are skipped.
+
+    Args:
+        sequence: Sequence as str, bytes-like, uint8 array or chunk source
+            (PackedGenome, GenomeReader)
+        k: K-mer length (1-31)
+        canonical: Fold each k-mer with its reverse complement
+        memory_limit: Bytes of buffered runs before spilling to disk
+        partitions: Number of code-range partitions (rounded up to a power of two)
+        spill_dir: Directory for spill files (default: system temporary directory)
+        chunk_size: Bases per chunk
+
+    Returns:
+        KmerSpectrum
+    """
+    if not 1 <= k <= MAX_K:
+        raise ValueError(f"k must be between 1 and {MAX_K}")
+    partition_bits = min(max(partitions - 1, 0).bit_length(), 2 * k)
+    shift = np.uint64(2 * k - partition_bits)
+    boundaries = (np.arange(1, 1 << partition_bits, dtype=np.uint64) << shift)
+
+    buffers: List[List[Tuple[np.ndarray, np.ndarray]]] = [[] for _ in range(1 << partition_bits)]
+    spilled: List[List[Path]] = [[] for _ in range(1 << partition_bits)]
+    buffered = 0
+
+    with tempfile.TemporaryDirectory(prefix="kmer_spill_", dir=spill_dir) as spill_path:
+
+        def spill():
+            nonlocal buffered
+            for p, runs in enumerate(buffers):
+                if runs:
+                    keys, counts = _merge_runs(runs)
+                    run_file = Path(spill_path) / f"part{p:04d}_{len(spilled[p]):06d}.npz"
+                    np.savez(run_file, keys=keys, counts=counts)
+                    spilled[p].append(run_file)
+                    runs.clear()
+            buffered = 0
+
+        tail = np.zeros(0, dtype=np.uint8)
+        for chunk in iter_sequence_chunks(sequence, chunk_size):
+            codes = np.concatenate((tail, encode_bases(chunk))) if tail.size else encode_bases(chunk)
+            keys, counts = np.unique(kmer_codes(codes, k, canonical), return_counts=True)
+            splits = np.searchsorted(keys, boundaries)
+            for p, (start, end) in enumerate(zip(np.concatenate(([0], splits)), np.concatenate((splits, [keys.size])))):
+                if end > start:
+                    buffers[p].append((keys[start:end], counts[start:end].astype(np.uint64)))
+            buffered += keys.nbytes * 2
+            # Windows starting in the last k - 1 bases continue into the next chunk
+            tail = codes[-(k - 1):] if k > 1 else codes[:0]
+            if buffered > memory_limit:
+                spill()
+
+        kmers, totals = [], []
+        for p in range(len(buffers)):
+            # All runs of a partition are merged in one concatenate + sort pass
+            runs = buffers[p]
+            buffers[p] = []
+            for run_file in spilled[p]:
+                with np.load(run_file) as run:
+                    runs.append((run['keys'], run['counts']))
+            keys, counts = _merge_runs(runs)
+            kmers.append(keys)
+            totals.append(counts)
+
+    return KmerSpectrum(k, np.concatenate(kmers), np.concatenate(totals), canonical)
+
+
+def spectrum_distances(a: KmerSpectrum, b: KmerSpectrum) -> Dict[str, float]:
+    """
+    Distances between two spectra of the same k.
+
+    Returns:
+        jaccard (shared distinct k-mers / union), mash_distance (the Mash
+        estimate of per-base divergence from the Jaccard index), bray_curtis
+        (count-weighted dissimilarity) and cosine_similarity of the count vectors
+    """
+    if a.k != b.k or a.canonical != b.canonical:
+        raise ValueError("spectra must have the same k and canonical setting")
+    _, index_a, index_b = np.intersect1d(a.kmers, b.kmers, assume_unique=True, return_indices=True)
+    shared = len(index_a)
+    union = len(a) + len(b) - shared
+    jaccard = shared / union if union else 0.0
+    mash = max(0.0, -math.log(2 * jaccard / (1 + jaccard)) / a.k) if jaccard > 0 else 1.0
+
+    counts_a = a.counts.astype(np.float64)
+    counts_b = b.counts.astype(np.float64)
+    shared_a, shared_b = counts_a[index_a], counts_b[index_b]
+    total = counts_a.sum() + counts_b.sum()
+    bray_curtis = 1 - 2 * np.minimum(shared_a, shared_b).sum() / total if total else 0.0
+    norms = np.sqrt((counts_a ** 2).sum() * (counts_b ** 2).sum())
+    cosine = float((shared_a * shared_b).sum() / norms) if norms else 0.0
+
+    return {
+        'k': a.k,
+        'shared_kmers': shared,
+        'jaccard': jaccard,
+        'mash_distance': mash,
+        'bray_curtis': float(bray_curtis),
+        'cosine_similarity': cosine
+    }
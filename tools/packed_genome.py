@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Packed Genome - 2-bit genome container with random access
+
+Stores a nucleotide sequence at 2 bits per base (A=0, C=1, G=2, T=3, four bases
+per byte, first base in the high bits). Anything else (N, IUPAC ambiguity codes,
+gaps) is packed as A and recorded in a run list of (start, end, byte) so slices
+decode exactly; lowercase soft-masking is folded to uppercase. Packed bases sit
+at fixed offsets and a per-block index points into the run list, so fetching any
+slice costs only the slice itself.
+
+The file is laid out to be memory-mapped and used in place:
+
+    header      magic, version, length, run count, block size, section offsets
+    packed      ceil(length / 4) bytes
+    runs        run_starts u64[n], run_ends u64[n], run_bytes u8[n]
+    blocks      index of the first run ending after each block start, u64[n_blocks + 1]
+    metadata    JSON (contigs and any caller-supplied fields)
+
+Opening a store maps the file and builds numpy views over its sections, so it
+opens instantly at any size; a 3 Gbp genome takes ~750 MB plus its N runs.
+
+Author: Dr. Mordin Solus (custom research persona of Claude Code)
+Date: 2025-09-02
+Version: 1.0.0
+
+Usage:
+    with PackedGenomeWriter("data/genomes/ecoli.pgen") as writer:
+        writer.begin_contig("NC_000913.3")
+        writer.write(sequence_bytes)
+
+    genome = PackedGenome("data/genomes/ecoli.pgen")
+    genome[1000:2000]            # str
+    genome.codes(0, 10**6)       # uint8 base codes (4 = N/ambiguous)
+    count_bases(genome)          # nucleotide_codec kernels accept the store directly
+"""
+
+import json
+import os
+import struct
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from nucleotide_codec import BASE_CODES, BASES, CHUNK_SIZE, N_CODE
+
+MAGIC = b"GLPG"
+FORMAT_VERSION = 1
+PACKED_SUFFIX = ".pgen"
+
+# Bases per run-index block
+BLOCK_SIZE = 1 << 16
+
+# magic, version, length, n_runs, block_size, packed/runs/blocks/metadata offsets, metadata length
+HEADER = struct.Struct("<4sI8Q")
+
+# base code -> ASCII, and byte -> uppercase byte
+_CODE_BYTES = np.frombuffer(BASES.encode() + b"N", dtype=np.uint8)
+_UPPER = np.frombuffer(bytes(range(256)).upper(), dtype=np.uint8)
+
+
+def packed_genome_path(genome_file: Union[str, Path]) -> Path:
+    """Packed store path for a genome file (same stem, .pgen suffix)."""
+    return Path(genome_file).with_suffix(PACKED_SUFFIX)
+
+
+def _align(offset: int, alignment: int = 8) -> int:
+    return (offset + alignment - 1) // alignment * alignment
+
+
+class PackedGenomeWriter:
+    """
+    Stream a sequence (optionally several contigs) into a packed genome file.
+
+    Data goes to a temporary file that replaces the target on close, so readers
+    never see a partial store.
+    """
+
+    def __init__(self, path: Union[str, Path], block_size: int = BLOCK_SIZE):
+        self.path = Path(path)
+        self.block_size = block_size
+        self.length = 0
+        self.contigs: List[Dict[str, Any]] = []
+        self._tmp_path = self.path.with_name(self.path.name + ".tmp")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self._tmp_path, "wb")
+        self._file.write(b"\0" * HEADER.size)
+        self._pending = np.zeros(0, dtype=np.uint8)
+        self._run_starts: List[int] = []
+        self._run_ends: List[int] = []
+        self._run_bytes: List[int] = []
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if self._closed:
+            return
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def begin_contig(self, name: str, **info):
+        """Start a new contig at the current position."""
+        self.contigs.append({'name': name, 'start': self.length, **info})
+
+    def write(self, chunk: Union[bytes, bytearray, memoryview, str]):
+        """Append sequence bytes (ASCII)."""
+        if isinstance(chunk, str):
+            chunk = chunk.encode('ascii', 'replace')
+        raw = np.frombuffer(chunk, dtype=np.uint8)
+        if raw.size == 0:
+            return
+        codes = BASE_CODES[raw]
+
+        ambiguous = np.flatnonzero(codes == N_CODE)
+        if ambiguous.size:
+            values = _UPPER[raw[ambiguous]]
+            # A run breaks where positions stop being consecutive or the byte changes
+            breaks = np.flatnonzero((np.diff(ambiguous) != 1) | (values[1:] != values[:-1])) + 1
+            starts = np.concatenate(([0], breaks))
+            ends = np.concatenate((breaks, [ambiguous.size]))
+            run_starts = (ambiguous[starts] + self.length).tolist()
+            run_ends = (ambiguous[ends - 1] + 1 + self.length).tolist()
+            run_bytes = values[starts].tolist()
+            # Continue the previous chunk's run across the boundary
+            if self._run_ends and self._run_ends[-1] == run_starts[0] and self._run_bytes[-1] == run_bytes[0]:
+                self._run_ends[-1] = run_ends[0]
+                run_starts, run_ends, run_bytes = run_starts[1:], run_ends[1:], run_bytes[1:]
+            self._run_starts += run_starts
+            self._run_ends += run_ends
+            self._run_bytes += run_bytes
+            codes[ambiguous] = 0
+
+        self.length += raw.size
+        codes = np.concatenate((self._pending, codes)) if self._pending.size else codes
+        whole = codes.size // 4 * 4
+        self._file.write(_pack(codes[:whole]).tobytes())
+        self._pending = codes[whole:].copy()
+
+    def close(self, metadata: Optional[Dict[str, Any]] = None) -> Path:
+        """Write the run list, block index and metadata and move the file into place."""
+        if self._pending.size:
+            self._file.write(_pack(np.concatenate((self._pending, np.zeros(4 - self._pending.size, np.uint8)))).tobytes())
+        packed_end = HEADER.size + (self.length + 3) // 4
+
+        runs_offset = _align(packed_end)
+        run_starts = np.array(self._run_starts, dtype="<u8")
+        run_ends = np.array(self._run_ends, dtype="<u8")
+        self._file.write(b"\0" * (runs_offset - packed_end))
+        self._file.write(run_starts.tobytes())
+        self._file.write(run_ends.tobytes())
+        self._file.write(np.array(self._run_bytes, dtype=np.uint8).tobytes())
+
+        blocks_offset = _align(runs_offset + 17 * run_starts.size)
+        n_blocks = (self.length + self.block_size - 1) // self.block_size
+        block_starts = np.arange(n_blocks + 1, dtype=np.uint64) * np.uint64(self.block_size)
+        block_runs = np.searchsorted(run_ends, block_starts, side="right").astype("<u8")
+        self._file.write(b"\0" * (blocks_offset - runs_offset - 17 * run_starts.size))
+        self._file.write(block_runs.tobytes())
+
+        contigs = [dict(contig, length=(self.contigs[i + 1]['start'] if i + 1 < len(self.contigs) else self.length)
+                        - contig['start'])
+                   for i, contig in enumerate(self.contigs)]
+        meta = json.dumps({**(metadata or {}), 'contigs': contigs}).encode()
+        meta_offset = blocks_offset + block_runs.nbytes
+        self._file.write(meta)
+
+        self._file.seek(0)
+        self._file.write(HEADER.pack(MAGIC, FORMAT_VERSION, self.length, run_starts.size, self.block_size,
+                                     HEADER.size, runs_offset, blocks_offset, meta_offset, len(meta)))
+        self._file.close()
+        self._closed = True
+        os.replace(self._tmp_path, self.path)
+        return self.path
+
+    def abort(self):
+        """Discard the partial file."""
+        self._file.close()
+        self._closed = True
+        self._tmp_path.unlink(missing_ok=True)
+
+
+def _pack(codes: np.ndarray) -> np.ndarray:
+    quads = codes.reshape(-1, 4)
+    return (quads[:, 0] << 6) | (quads[:, 1] << 4) | (quads[:, 2] << 2) | quads[:, 3]
+
+
+class PackedGenome:
+    """
+    Read-only, memory-mapped view of a packed genome file.
+
+    Attributes:
+        length: Total bases across all contigs
+        packed: uint8 view of the 2-bit packed bases
+        run_starts, run_ends, run_bytes: N/ambiguity runs (end exclusive)
+        metadata: Metadata stored with the genome, including 'contigs'
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._map = np.memmap(self.path, dtype=np.uint8, mode="r")
+        (magic, version, self.length, n_runs, self.block_size, packed_offset,
+         runs_offset, blocks_offset, meta_offset, meta_length) = HEADER.unpack(bytes(self._map[:HEADER.size]))
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{self.path} is not a packed genome (version {FORMAT_VERSION})")
+
+        self.packed = self._map[packed_offset:packed_offset + (self.length + 3) // 4]
+        self.run_starts = self._map[runs_offset:runs_offset + 8 * n_runs].view("<u8")
+        self.run_ends = self._map[runs_offset + 8 * n_runs:runs_offset + 16 * n_runs].view("<u8")
+        self.run_bytes = self._map[runs_offset + 16 * n_runs:runs_offset + 17 * n_runs]
+        n_blocks = (self.length + self.block_size - 1) // self.block_size
+        self.block_runs = self._map[blocks_offset:blocks_offset + 8 * (n_blocks + 1)].view("<u8")
+        self.metadata: Dict[str, Any] = json.loads(bytes(self._map[meta_offset:meta_offset + meta_length]))
+        self.contigs: List[Dict[str, Any]] = self.metadata.get('contigs', [])
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __repr__(self) -> str:
+        return f"PackedGenome('{self.path}', length={self.length})"
+
+    def __getitem__(self, key: Union[int, slice]) -> str:
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.length)
+            if step != 1:
+                raise ValueError("packed genome slices must be contiguous")
+            return self.fetch(start, stop).decode()
+        if key < 0:
+            key += self.length
+        if not 0 <= key < self.length:
+            raise IndexError("packed genome index out of range")
+        return self.fetch(key, key + 1).decode()
+
+    def close(self):
+        """Release the memory map (views taken from this store become invalid)."""
+        self._map._mmap.close()
+
+    def _runs_in(self, start: int, end: int) -> Iterator[Tuple[int, int, int]]:
+        """Runs overlapping [start, end), clipped and relative to start."""
+        index = int(self.block_runs[start // self.block_size])
+        while index < len(self.run_starts):
+            run_start = int(self.run_starts[index])
+            if run_start >= end:
+                break
+            run_end = int(self.run_ends[index])
+            if run_end > start:
+                yield max(run_start, start) - start, min(run_end, end) - start, int(self.run_bytes[index])
+            index += 1
+
+    def codes(self, start: int = 0, end: Optional[int] = None) -> np.ndarray:
+        """
+        Base codes for [start, end) as a uint8 array (A=0, C=1, G=2, T=3, 4 for N
+        and ambiguity codes), the representation the counting kernels work on.
+        """
+        end = self.length if end is None else min(end, self.length)
+        start = max(0, start)
+        if start >= end:
+            return np.zeros(0, dtype=np.uint8)
+        first = start // 4
+        packed = np.asarray(self.packed[first:(end + 3) // 4])
+        unpacked = np.empty(packed.size * 4, dtype=np.uint8)
+        unpacked[0::4] = packed >> 6
+        unpacked[1::4] = (packed >> 4) & 3
+        unpacked[2::4] = (packed >> 2) & 3
+        unpacked[3::4] = packed & 3
+        codes = unpacked[start - 4 * first:end - 4 * first]
+        for run_start, run_end, _ in self._runs_in(start, end):
+            codes[run_start:run_end] = N_CODE
+        return codes
+
+    def fetch(self, start: int = 0, end: Optional[int] = None) -> bytes:
+        """ASCII sequence for [start, end)."""
+        end = self.length if end is None else min(end, self.length)
+        start = max(0, start)
+        if start >= end:
+            return b""
+        sequence = _CODE_BYTES[self.codes(start, end)]
+        for run_start, run_end, value in self._runs_in(start, end):
+            sequence[run_start:run_end] = value
+        return sequence.tobytes()
+
+    def iter_chunks(self, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """Yield the sequence as consecutive ASCII chunks (the nucleotide_codec chunk protocol)."""
+        for start in range(0, self.length, chunk_size):
+            yield self.fetch(start, start + chunk_size)
+
+    def contig(self, name: str) -> Tuple[int, int]:
+        """(start, end) of a contig."""
+        for contig in self.contigs:
+            if contig['name'] == name:
+                return contig['start'], contig['start'] + contig['length']
+        raise KeyError(name)
+
+
+def pack_records(records: Iterable, path: Union[str, Path], metadata: Optional[Dict[str, Any]] = None,
+                 chunk_size: int = CHUNK_SIZE) -> Path:
+    """
+    Write Biopython SeqRecords to a packed genome file, one contig per record.
+
+    Args:
+        records: SeqRecord iterable
+        path: Output path
+        metadata: Extra fields stored with the genome
+        chunk_size: Bases converted per write
+
+    Returns:
+        Path of the written store
+    """
+    with PackedGenomeWriter(path) as writer:
+        for record in records:
+            writer.begin_contig(record.id, description=record.description)
+            for start in range(0, len(record.seq), chunk_size):
+                writer.write(bytes(record.seq[start:start + chunk_size]))
+        return writer.close(metadata)
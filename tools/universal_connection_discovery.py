@@ -363,7 +363,8 @@ class UniversalConnectionDiscoveryEngine:
     """Main engine for discovering universal connections across all scales."""
     
     def __init__(self):
-        self.resonance_api = UniversalResonanceAPI(auto_initialize=True)
+        # Load the knowledge graph in the background so construction returns immediately
+        self.resonance_api = UniversalResonanceAPI(auto_initialize=True, lazy=True)
         self.api_connector = MultiDomainAPIConnector()
         self.junk_dna_engine = JunkDNARevalationEngine(self.resonance_api)
         self.pattern_recognizer = None  # Will initialize after loading data
@@ -20,7 +20,7 @@ Core Vision:
 
 import json
 import numpy as np
-from typing import Dict, List, Set, Optional, Any, Union, Tuple
+from typing import Dict, Iterable, Iterator, List, Set, Optional, Any, Union, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 from abc import ABC, abstractmethod
@@ -28,6 +28,8 @@ import logging
 from datetime import datetime
 import uuid
 import math
+import re
+import difflib
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -183,6 +185,16 @@ class APIDataSource(ABC):
     def get_domain_specific_metadata(self, raw_data: Dict[str, Any]) -> Dict[str, Any]:
         """Extract domain-specific metadata."""
         pass
+        
+    def iter_resonance_entities(self, records: Iterable[Tuple[str, Any]]) -> Iterator[ResonanceEntity]:
+        """
+        Create entities from a stream of (key, value) records.
+        
+        The default collects the records into a dict for create_resonance_entities;
+        adapters whose records are independent override this to adapt one record at
+        a time, so memory stays bounded by the largest record.
+        """
+        yield from self.create_resonance_entities(dict(records))
 
 
 class UniversalAPIAdapter:
@@ -225,6 +237,153 @@ class UniversalAPIAdapter:
         return self.domain_mappers.get(domain, [])
 
 
+class DiseaseStateIndex:
+    """
+    Inverted index over entity disease states, built as entities are ingested.
+
+    Each (entity, disease state) pair is a row; its normal and disease frequencies
+    sit side by side in an (n, 2) float array so disruption percentages for any set
+    of rows are a single vectorized expression. Disease names are normalized
+    (lowercase, punctuation folded to spaces) and tokenized so lookups cost
+    O(matches) rather than a scan over every entity.
+    """
+    
+    def __init__(self):
+        self.entity_ids: List[str] = []          # row -> entity_id
+        self.entity_rows: Dict[str, List[int]] = {}  # entity_id -> rows
+        self.disease_names: List[str] = []       # row -> disease state key as ingested
+        self.disease_values: List[Any] = []      # row -> disease frequency as ingested
+        self.name_index: Dict[str, List[int]] = {}   # normalized name -> rows
+        self.token_index: Dict[str, Set[str]] = {}   # token -> normalized names
+        self._frequencies: List[Tuple[float, float]] = []
+        self._frequency_array: Optional[np.ndarray] = None
+        self._dead_rows = 0                          # rows of retracted entities not yet compacted away
+        
+    @staticmethod
+    def normalize(name: str) -> str:
+        """Normalize a disease name for matching (\"Chronic-Fatigue \" -> \"chronic fatigue\")."""
+        return " ".join(re.sub(r"[^0-9a-z]+", " ", str(name).lower()).split())
+        
+    def add_entity(self, entity: 'ResonanceEntity'):
+        """Index the disease states in an entity's domain metadata."""
+        disease_states = (entity.domain_metadata or {}).get("disease_states")
+        if not isinstance(disease_states, dict) or not disease_states:
+            return
+            
+        normal_freq = entity.frequency_signature.primary_frequency if entity.frequency_signature else math.nan
+        for disease, value in disease_states.items():
+            try:
+                disease_freq = float(value)
+            except (TypeError, ValueError):
+                disease_freq = math.nan
+                
+            row = len(self.entity_ids)
+            self.entity_ids.append(entity.entity_id)
+            self.entity_rows.setdefault(entity.entity_id, []).append(row)
+            self.disease_names.append(disease)
+            self.disease_values.append(value)
+            self._frequencies.append((normal_freq, disease_freq))
+            
+            normalized = self.normalize(disease)
+            self.name_index.setdefault(normalized, []).append(row)
+            for token in normalized.split():
+                self.token_index.setdefault(token, set()).add(normalized)
+                
+        self._frequency_array = None
+        
+    def remove_entities(self, entity_ids: Set[str]):
+        """
+        Drop retracted entities from the name index. Their rows stay in the arrays
+        (unreferenced) until they outnumber the live rows; the arrays are then
+        compacted, so repeated re-integration cannot grow the index without bound.
+        Row numbers are only stable between compactions.
+        """
+        dead_rows = {row for eid in entity_ids for row in self.entity_rows.pop(eid, [])}
+        if not dead_rows:
+            return
+        for name in {self.normalize(self.disease_names[row]) for row in dead_rows}:
+            rows = [row for row in self.name_index.get(name, []) if row not in dead_rows]
+            if rows:
+                self.name_index[name] = rows
+            else:
+                self.name_index.pop(name, None)
+                for token in name.split():
+                    names = self.token_index.get(token)
+                    if names is not None:
+                        names.discard(name)
+                        if not names:
+                            del self.token_index[token]
+                            
+        self._dead_rows += len(dead_rows)
+        if 2 * self._dead_rows > len(self.entity_ids):
+            self._compact()
+            
+    def _compact(self):
+        """Drop unreferenced rows and renumber the live ones, keeping ingestion order."""
+        live_rows = sorted(row for rows in self.entity_rows.values() for row in rows)
+        new_row = {row: i for i, row in enumerate(live_rows)}
+        self.entity_ids = [self.entity_ids[row] for row in live_rows]
+        self.disease_names = [self.disease_names[row] for row in live_rows]
+        self.disease_values = [self.disease_values[row] for row in live_rows]
+        self._frequencies = [self._frequencies[row] for row in live_rows]
+        self.entity_rows = {eid: [new_row[row] for row in rows] for eid, rows in self.entity_rows.items()}
+        self.name_index = {name: [new_row[row] for row in rows] for name, rows in self.name_index.items()}
+        self._frequency_array = None
+        self._dead_rows = 0
+        
+    @property
+    def frequencies(self) -> np.ndarray:
+        """(n, 2) array of [normal_frequency, disease_frequency] per row; NaN where unknown."""
+        if self._frequency_array is None:
+            self._frequency_array = np.array(self._frequencies, dtype=np.float64).reshape(-1, 2)
+        return self._frequency_array
+        
+    def lookup(self, disease_name: str, fuzzy: bool = False, cutoff: float = 0.8) -> List[int]:
+        """
+        Find rows for a disease name.
+        
+        Args:
+            disease_name: Disease or condition name (case and punctuation insensitive)
+            fuzzy: Also match names containing every query token (prefix matches
+                allowed) and close spellings
+            cutoff: Similarity cutoff for close spellings (0.0-1.0)
+            
+        Returns:
+            Row indices in ingestion order
+        """
+        normalized = self.normalize(disease_name)
+        if not normalized:
+            return []
+        if not fuzzy:
+            return list(self.name_index.get(normalized, []))
+            
+        names = {normalized} if normalized in self.name_index else set()
+        
+        # Names containing every query token, allowing partial final words
+        candidates = None
+        for token in normalized.split():
+            token_names = set()
+            for indexed_token in self.token_index:
+                if indexed_token.startswith(token):
+                    token_names |= self.token_index[indexed_token]
+            candidates = token_names if candidates is None else candidates & token_names
+        names |= candidates or set()
+        
+        # Misspellings
+        names.update(difflib.get_close_matches(normalized, self.name_index.keys(), n=5, cutoff=cutoff))
+        
+        return sorted(row for name in names for row in self.name_index.get(name, []))
+        
+    def disruption_percentages(self, rows: List[int]) -> np.ndarray:
+        """Vectorized |disease - normal| / normal * 100 for the given rows (NaN where undefined)."""
+        pairs = self.frequencies[np.asarray(rows, dtype=np.intp)]
+        normal, disease = pairs[:, 0], pairs[:, 1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            disruption = np.abs(disease - normal) / normal * 100.0
+        disruption[~np.isfinite(disruption)] = np.nan
+        return disruption
+
+
 @dataclass
 class FeedbackLoop:
     """Represents dynamic relationships between entities with frequency characteristics."""
@@ -267,6 +426,8 @@ class UniversalResonanceEngine:
         self.frequency_index: Dict[float, List[str]] = {}  # frequency -> entity_ids
         self.domain_index: Dict[ScientificDomain, List[str]] = {}  # domain -> entity_ids
         self.biofreq_index: Dict[str, List[str]] = {}  # biofreq_code -> entity_ids
+        self.disease_index = DiseaseStateIndex()  # disease state -> (entity, frequencies) rows
+        self.generation = 0  # bumped on every change so readers can invalidate caches
         
         self.api_adapter = UniversalAPIAdapter()
         
@@ -275,6 +436,7 @@ class UniversalResonanceEngine:
     def add_entity(self, entity: ResonanceEntity):
         """Add a ResonanceEntity to the knowledge graph."""
         self.entities[entity.entity_id] = entity
+        self.generation += 1
         
         # Update indices
         if entity.domain not in self.domain_index:
@@ -292,13 +454,63 @@ class UniversalResonanceEngine:
                 self.frequency_index[freq_key] = []
             self.frequency_index[freq_key].append(entity.entity_id)
             
+        self.disease_index.add_entity(entity)
+            
         logger.debug(f"Added entity: {entity.name} ({entity.domain.value})")
         
     def add_feedback_loop(self, loop: FeedbackLoop):
         """Add a feedback loop to the knowledge graph."""
         self.feedback_loops[loop.loop_id] = loop
+        self.generation += 1
         logger.debug(f"Added feedback loop: {loop.name} ({loop.biofreq_code})")
         
+    def remove_entities(self, entity_ids: List[str]) -> int:
+        """
+        Retract entities from the knowledge graph, its indices, feedback loops and
+        cross-domain connections.
+        
+        Returns:
+            Number of entities removed
+        """
+        removed = [self.entities.pop(eid) for eid in set(entity_ids) if eid in self.entities]
+        if not removed:
+            return 0
+        removed_ids = {entity.entity_id for entity in removed}
+        self.generation += 1
+        
+        def prune(index: Dict[Any, List[str]], keys: Set[Any]):
+            for key in keys:
+                remaining = [eid for eid in index.get(key, []) if eid not in removed_ids]
+                if remaining:
+                    index[key] = remaining
+                else:
+                    index.pop(key, None)
+                    
+        prune(self.domain_index, {e.domain for e in removed})
+        prune(self.biofreq_index, {e.biofreq_code for e in removed if e.biofreq_code})
+        prune(self.frequency_index, {round(e.frequency_signature.primary_frequency, 2)
+                                     for e in removed if e.frequency_signature})
+        self.disease_index.remove_entities(removed_ids)
+        
+        for loop in self.feedback_loops.values():
+            if any(e.entity_id in removed_ids for e in loop.entities):
+                loop.entities = [e for e in loop.entities if e.entity_id not in removed_ids]
+                loop.domains_involved = {e.domain for e in loop.entities}
+        for entity in self.entities.values():
+            if entity.cross_domain_connections:
+                entity.cross_domain_connections = [e for e in entity.cross_domain_connections
+                                                   if e.entity_id not in removed_ids]
+                
+        logger.debug(f"Removed {len(removed)} entities")
+        return len(removed)
+        
+    def remove_feedback_loops(self, loop_ids: List[str]) -> int:
+        """Retract feedback loops from the knowledge graph."""
+        removed = [self.feedback_loops.pop(lid) for lid in set(loop_ids) if lid in self.feedback_loops]
+        if removed:
+            self.generation += 1
+        return len(removed)
+        
     def find_entities_by_frequency(self, target_freq: float, tolerance: float = 0.02) -> List[ResonanceEntity]:
         """Find entities with frequencies within tolerance of target frequency."""
         matches = []
@@ -19,11 +19,13 @@ Date: September 1, 2025
 
 import json
 import numpy as np
-from pathlib import Path
 from typing import Dict, List, Tuple
 import hashlib
-from Bio import SeqIO
 from frequency_compression_engine import FrequencyCompressionEngine
+from genome_cache import GenomeCache
+
+ECOLI_ACCESSION = "NC_000913.3"
+
 
 class CompressionVerifier:
     """Verify compression/decompression integrity"""
@@ -307,19 +309,17 @@ class CompressionVerifier:
         print("🦠 Testing E. coli Genome Compression Integrity")
         print("=" * 45)
         
-        # Load E. coli genome
-        ecoli_file = "/home/kmr/LoomAgent/Stella/notebooks/BioFreqKnowledge/GnosisLoom/data/genomes/ecoli_NC_000913.3.gb"
+        # Load E. coli genome from the genome cache's packed store (no GenBank parsing)
+        ecoli_genome = GenomeCache().packed(ECOLI_ACCESSION)
         
-        if not Path(ecoli_file).exists():
+        if ecoli_genome is None:
             print("❌ E. coli genome file not found")
             return {'error': 'E. coli genome file not found'}
             
-        # Read genome sequence
+        # Read genome sequence (first record)
         sequence = ""
-        with open(ecoli_file, 'r') as f:
-            for record in SeqIO.parse(f, 'genbank'):
-                sequence = str(record.seq)
-                break
+        if ecoli_genome.contigs:
+            sequence = ecoli_genome[slice(*ecoli_genome.contig(ecoli_genome.contigs[0]['name']))]
                 
         if not sequence:
             print("❌ Could not read E. coli sequence")
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Window Tracks - Prefix-sum base composition for sliding windows
+
+One chunked pass over a sequence builds cumulative A, C, G, T and N counts;
+after that the composition of any window is the difference of two prefix
+lookups, so a whole track (every window of a given size and step) is a handful
+of array operations regardless of window size, and further scales or steps cost
+no further passes over the sequence. GC content, base-weighted primary
+frequency and GC/AT skew are derived from the window counts.
+
+The prefix counts are stored two-level to keep memory at 10 bytes per base:
+int64 totals at every 32 kb block boundary plus uint16 counts since the start
+of the block (counts within a block never exceed 32767).
+
+Windows that start and end on a fixed grid (tiling tracks, or overlapping
+windows whose size and step are multiples of a tile) do not need per-base
+prefixes: TileCountIndex counts each tile during the chunked pass and keeps
+only cumulative tile totals, so memory is O(tiles) whatever the genome size.
+
+Author: Dr. Mordin Solus (custom research persona of Claude Code)
+Date: 2025-09-02
+Version: 1.0.0
+
+Usage:
+    index = BaseCountIndex(genome_sequence)          # str, bytes, PackedGenome, GenomeReader
+    track = index.track(1000, 500, base_frequencies=DNA_BASE_FREQUENCIES)
+    track.gc_content, track.primary_frequency, track.gc_skew
+    coarse = index.track(100_000, partial=True)      # no second pass
+
+    tiles = TileCountIndex(genome_sequence, 500)     # same tracks on a 500 bp grid, O(tiles) memory
+    track = tiles.track(1000, 500, base_frequencies=DNA_BASE_FREQUENCIES)
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from nucleotide_codec import CHUNK_SIZE, Sequence, iter_sequence_chunks
+
+# Column order of every count array in this module
+SYMBOLS = "ACGTN"
+
+# Positions per prefix block; must keep within-block counts below 2**16
+BLOCK_SHIFT = 15
+BLOCK_SIZE = 1 << BLOCK_SHIFT
+
+
+def _build_symbol_codes() -> np.ndarray:
+    table = np.full(256, len(SYMBOLS), dtype=np.uint8)
+    for code, symbol in enumerate(SYMBOLS):
+        table[ord(symbol)] = code
+        table[ord(symbol.lower())] = code
+    return table
+
+
+# byte -> column in SYMBOLS (case-insensitive), len(SYMBOLS) for anything else
+SYMBOL_CODES = _build_symbol_codes()
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """numerator / denominator as floats, 0 where the denominator is 0."""
+    result = np.zeros(numerator.shape, dtype=np.float64)
+    np.divide(numerator, denominator, out=result, where=denominator > 0)
+    return result
+
+
+@dataclass
+class WindowTrack:
+    """Base composition of a set of windows"""
+    starts: np.ndarray
+    ends: np.ndarray
+    counts: np.ndarray  # (windows, 5) in SYMBOLS order
+    primary_frequency: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def count(self, symbol: str) -> np.ndarray:
+        """Counts of one of A, C, G, T, N per window."""
+        return self.counts[:, SYMBOLS.index(symbol.upper())]
+
+    @property
+    def total(self) -> np.ndarray:
+        """A, C, G, T and N per window (other characters are not counted)."""
+        return self.counts.sum(axis=1)
+
+    @property
+    def gc_content(self) -> np.ndarray:
+        return _ratio(self.count('G') + self.count('C'), self.total)
+
+    @property
+    def at_content(self) -> np.ndarray:
+        return _ratio(self.count('A') + self.count('T'), self.total)
+
+    @property
+    def gc_skew(self) -> np.ndarray:
+        """(G - C) / (G + C) per window."""
+        g, c = self.count('G'), self.count('C')
+        return _ratio(g - c, g + c)
+
+    @property
+    def at_skew(self) -> np.ndarray:
+        """(A - T) / (A + T) per window."""
+        a, t = self.count('A'), self.count('T')
+        return _ratio(a - t, a + t)
+
+    def to_dict(self) -> Dict[str, List]:
+        """Plain lists for JSON output."""
+        track = {
+            'starts': self.starts.tolist(),
+            'ends': self.ends.tolist(),
+            'gc_content': self.gc_content.tolist(),
+            'gc_skew': self.gc_skew.tolist(),
+            'at_skew': self.at_skew.tolist()
+        }
+        if self.primary_frequency is not None:
+            track['primary_frequency_hz'] = self.primary_frequency.tolist()
+        return track
+
+
+class _WindowIndex:
+    """Window bounds and tracks over a sequence; subclasses provide length and counts()."""
+
+    length = 0
+
+    def __len__(self) -> int:
+        return self.length
+
+    def counts(self, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    def window_bounds(self, window_size: int, step: Optional[int] = None,
+                      partial: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Start and end of every window of a given size and step.
+
+        Args:
+            window_size: Window length in bases
+            step: Distance between window starts (default: window_size, i.e. tiling)
+            partial: Include trailing windows cut short by the end of the sequence
+
+        Returns:
+            (starts, ends) int64 arrays
+        """
+        step = step or window_size
+        if window_size <= 0 or step <= 0:
+            raise ValueError("window size and step must be positive")
+        last_start = self.length if partial else self.length - window_size + 1
+        starts = np.arange(0, max(last_start, 0), step, dtype=np.int64)
+        return starts, np.minimum(starts + window_size, self.length)
+
+    def region_track(self, starts: np.ndarray, ends: np.ndarray,
+                     base_frequencies: Optional[Dict[str, float]] = None) -> WindowTrack:
+        """
+        Composition of explicit windows.
+
+        Args:
+            starts, ends: Window bounds
+            base_frequencies: Per-base weights (e.g. {'A': 4.32e14, ...}); when given,
+                primary_frequency is sum(count * weight) / sum(count) over those bases
+
+        Returns:
+            WindowTrack
+        """
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        counts = self.counts(starts, ends)
+        primary_frequency = None
+        if base_frequencies is not None:
+            weighted = np.zeros(len(starts))
+            total = np.zeros(len(starts), dtype=np.int64)
+            for base, frequency in base_frequencies.items():
+                column = counts[:, SYMBOLS.index(base.upper())]
+                weighted = weighted + column * frequency
+                total += column
+            primary_frequency = _ratio(weighted, total)
+        return WindowTrack(starts, ends, counts, primary_frequency)
+
+    def track(self, window_size: int, step: Optional[int] = None, partial: bool = False,
+              base_frequencies: Optional[Dict[str, float]] = None) -> WindowTrack:
+        """
+        Composition of every window of a given size and step (see window_bounds and
+        region_track).
+        """
+        starts, ends = self.window_bounds(window_size, step, partial)
+        return self.region_track(starts, ends, base_frequencies)
+
+
+def _symbol_codes(chunk: bytes, sequence: Sequence) -> np.ndarray:
+    if isinstance(sequence, str) and not chunk.isascii():
+        chunk = chunk.decode().encode('ascii', 'replace')
+    return SYMBOL_CODES[np.frombuffer(chunk, dtype=np.uint8)]
+
+
+class BaseCountIndex(_WindowIndex):
+    """
+    Cumulative A/C/G/T/N counts over a sequence, built in one chunked pass.
+
+    Answers any window, at 10 bytes per base; use TileCountIndex when windows
+    fall on a fixed grid.
+
+    Args:
+        sequence: Sequence as str, bytes-like, uint8 array or chunk source
+            (PackedGenome, GenomeReader)
+        chunk_size: Bytes per chunk while building
+    """
+
+    def __init__(self, sequence: Sequence, chunk_size: int = CHUNK_SIZE):
+        local_parts = []
+        block_totals = []
+        pending = np.zeros(0, dtype=np.uint8)
+        length = 0
+        for chunk in iter_sequence_chunks(sequence, chunk_size):
+            codes = _symbol_codes(chunk, sequence)
+            length += codes.size
+            codes = np.concatenate((pending, codes)) if pending.size else codes
+            whole = codes.size // BLOCK_SIZE * BLOCK_SIZE
+            if whole:
+                local, totals = self._prefix_blocks(codes[:whole].reshape(-1, BLOCK_SIZE))
+                local_parts.append(local.reshape(len(SYMBOLS), -1))
+                block_totals.append(totals)
+            pending = codes[whole:]
+
+        # The last block also holds the position just past the end, so it has room for
+        # up to BLOCK_SIZE - 1 pending codes plus that position
+        last = np.full((1, pending.size + 1), len(SYMBOLS), dtype=np.uint8)
+        last[0, :pending.size] = pending
+        local, totals = self._prefix_blocks(last)
+        local_parts.append(local.reshape(len(SYMBOLS), -1))
+
+        self.length = length
+        self.local = np.concatenate(local_parts, axis=1) if len(local_parts) > 1 else local_parts[0]
+        block_totals = np.concatenate(block_totals) if block_totals else np.zeros((0, len(SYMBOLS)), np.int64)
+        self.checkpoints = np.zeros((len(SYMBOLS), len(block_totals) + 1), dtype=np.int64)
+        np.cumsum(block_totals.T, axis=1, out=self.checkpoints[:, 1:])
+
+    @staticmethod
+    def _prefix_blocks(blocks: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Within-block exclusive prefix counts (5, blocks, width) and block totals (blocks, 5)."""
+        local = np.empty((len(SYMBOLS),) + blocks.shape, dtype=np.uint16)
+        totals = np.empty((blocks.shape[0], len(SYMBOLS)), dtype=np.int64)
+        for code in range(len(SYMBOLS)):
+            hits = blocks == code
+            np.cumsum(hits, axis=1, dtype=np.uint16, out=local[code])
+            totals[:, code] = local[code][:, -1]
+            local[code] -= hits
+        return local, totals
+
+    def __repr__(self) -> str:
+        return f"BaseCountIndex(length={self.length})"
+
+    def counts_before(self, positions: np.ndarray) -> np.ndarray:
+        """Counts of each symbol in [0, position), shape (positions, 5)."""
+        positions = np.asarray(positions, dtype=np.int64)
+        if positions.size and (positions.min() < 0 or positions.max() > self.length):
+            raise IndexError("window position outside the sequence")
+        return (self.checkpoints[:, positions >> BLOCK_SHIFT] + self.local[:, positions]).T
+
+    def counts(self, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """Counts of each symbol in every window [start, end), shape (windows, 5)."""
+        return self.counts_before(ends) - self.counts_before(starts)
+
+
+class TileCountIndex(_WindowIndex):
+    """
+    A/C/G/T/N counts per fixed-size tile, built in one chunked pass.
+
+    Only cumulative tile totals are kept (40 bytes per tile), so windows must start
+    on a tile boundary and end on one or at the end of the sequence; tracks whose
+    window size and step are multiples of tile_size always do.
+
+    Args:
+        sequence: Sequence as str, bytes-like, uint8 array or chunk source
+            (PackedGenome, GenomeReader)
+        tile_size: Tile length in bases
+        chunk_size: Bytes per chunk while building
+    """
+
+    def __init__(self, sequence: Sequence, tile_size: int, chunk_size: int = CHUNK_SIZE):
+        if tile_size <= 0:
+            raise ValueError("tile size must be positive")
+        tile_totals = []
+        pending = np.zeros(0, dtype=np.uint8)
+        length = 0
+        for chunk in iter_sequence_chunks(sequence, chunk_size):
+            codes = _symbol_codes(chunk, sequence)
+            length += codes.size
+            codes = np.concatenate((pending, codes)) if pending.size else codes
+            whole = codes.size // tile_size * tile_size
+            if whole:
+                tile_totals.append(self._count_tiles(codes[:whole].reshape(-1, tile_size)))
+            pending = codes[whole:]
+        if pending.size:
+            tile_totals.append(self._count_tiles(pending.reshape(1, -1)))
+
+        self.tile_size = tile_size
+        self.length = length
+        tile_totals = np.concatenate(tile_totals) if tile_totals else np.zeros((0, len(SYMBOLS)), np.int64)
+        self.cumulative = np.zeros((len(tile_totals) + 1, len(SYMBOLS)), dtype=np.int64)
+        np.cumsum(tile_totals, axis=0, out=self.cumulative[1:])
+
+    @staticmethod
+    def _count_tiles(tiles: np.ndarray) -> np.ndarray:
+        """Symbol counts per tile, shape (tiles, 5)."""
+        totals = np.empty((tiles.shape[0], len(SYMBOLS)), dtype=np.int64)
+        for code in range(len(SYMBOLS)):
+            np.sum(tiles == code, axis=1, out=totals[:, code])
+        return totals
+
+    def __repr__(self) -> str:
+        return f"TileCountIndex(length={self.length}, tile_size={self.tile_size})"
+
+    def counts(self, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """Counts of each symbol in every window [start, end), shape (windows, 5)."""
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        if starts.size and (starts.min() < 0 or ends.max() > self.length or (ends < starts).any()):
+            raise IndexError("window position outside the sequence")
+        if (starts % self.tile_size).any() or ((ends % self.tile_size != 0) & (ends != self.length)).any():
+            raise ValueError(f"windows must start and end on multiples of {self.tile_size} (or at the end)")
+        end_tiles = -(-ends // self.tile_size)
+        return self.cumulative[end_tiles] - self.cumulative[starts // self.tile_size]